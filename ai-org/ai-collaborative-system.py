@@ -4,15 +4,40 @@ AI Collaborative Development System
 Claude Code内で動作し、複数のAIエージェントの役割を演じながら協調的に開発を進めるシステム
 """
 
+import argparse
 import json
 import os
+import random
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
 import logging
+import sys
+import time
 from pathlib import Path
 
+_AI_ORG_DIR = str(Path(__file__).resolve().parent)
+if _AI_ORG_DIR not in sys.path:
+    sys.path.insert(0, _AI_ORG_DIR)
+
+from core.admission import AdmissionController, ThrottledBackend
+from core.backends import AgentBackend, AgentRequest, artifact_path
+from core.context import ContextBuilder
+from core.events import (FILE_WRITTEN, TASK_COMPLETED, TASK_CREATED, TASK_FAILED, TASK_STARTED,
+                         EventStream, events_file)
+from core.history import DurationHistory, critical_paths, estimate_eta, history_file
+from core.logconfig import ensure_logging
+from core.metrics import MetricsRegistry, MetricsServer
+from core.personas import PersonaRegistry
+from core.project_inspector import RepositoryAnalysis, RepositoryInspector, analysis_dir, compose_team, select_roles
+from core.queries import build_project_status, print_project_monitor, read_project_index, read_project_tasks
+from core.response_cache import CachingBackend, ResponseCache
+from core.retry import RetryPolicy, load_retry_policies
+from core.tracing import Tracer
+from core.workers import WorkerContext, WorkerPool, load_pool_config
+from core.workflow import WorkflowRegistry
+
 class TaskStatus(Enum):
     PENDING = "pending"
     IN_PROGRESS = "in_progress"
@@ -46,12 +71,68 @@ class AICollaborativeSystem:
     Claude Code内で動作する協調型開発システム
     単一のClaude Codeインスタンスが複数のエージェントの役割を演じる
     """
-    def __init__(self, workspace_dir: str = "."):
+    def __init__(self, workspace_dir: str = ".", workflows_file: Optional[str] = None,
+                 worker_instances: Optional[Dict[str, int]] = None,
+                 backend: Optional[AgentBackend] = None,
+                 admission: Optional[AdmissionController] = None,
+                 response_cache: Optional[ResponseCache] = None,
+                 use_response_cache: bool = True,
+                 tracer: Optional[Tracer] = None,
+                 metrics: Optional[MetricsRegistry] = None,
+                 retry_policies: Optional[Dict[str, RetryPolicy]] = None,
+                 default_retry_policy: Optional[RetryPolicy] = None,
+                 durations: Optional[DurationHistory] = None,
+                 events: Optional[EventStream] = None):
         self.workspace_dir = Path(workspace_dir)
         self.tasks: List[Task] = []
+        self._tasks_by_id: Dict[str, Task] = {}
         self.projects: Dict[str, Dict] = {}
         self.current_role: Optional[AgentRole] = None
         
+        # フェーズ単位の計測（既定は無効。AI_ORG_TRACE=trace.json で有効化）
+        self.tracer = tracer or Tracer(enabled=bool(os.environ.get("AI_ORG_TRACE")))
+        
+        # 監視用メトリクス（常時収集。serve_metrics() で Prometheus 形式で公開）
+        self.metrics = metrics or MetricsRegistry()
+        self._active_pool: Optional[WorkerPool] = None
+        self._init_metrics()
+        
+        # 役割ごとのワーカー数（organization.json の worker_pools を引数で上書き可能）
+        self.default_worker_instances, self.worker_instances = load_pool_config()
+        self.worker_instances.update(worker_instances or {})
+        
+        # 役割ごとの再試行ポリシー（organization.json の retry を引数で上書き可能）
+        self.default_retry_policy, self.retry_policies = load_retry_policies()
+        if default_retry_policy is not None:
+            self.default_retry_policy = default_retry_policy
+        self.retry_policies.update(retry_policies or {})
+        self._retry_rng = random.Random()
+        self.sleep = time.sleep
+        
+        # 役割・タスク種別ごとの所要時間の履歴（実行順序と完了予測に使う。実行をまたいで保存）
+        self.durations = durations or DurationHistory(history_file(str(self.workspace_dir)))
+        
+        # タスクのライフサイクルイベント（subscribe() で購読。logs/events.jsonl に追記され再生できる）
+        self.events = events or EventStream(events_file(str(self.workspace_dir)))
+        
+        # エージェントバックエンド（未指定時は組み込みのロールハンドラで生成）
+        # バックエンド呼び出しは全てアドミッション制御（同時実行数・レート制限）を通す
+        self.admission = admission
+        self.response_cache = None
+        self.backend = None
+        if backend is not None:
+            self.admission = admission or AdmissionController.from_config()
+            self.backend = ThrottledBackend(backend, self.admission)
+            # キャッシュヒット時はアドミッション制御を通らずに即座に返す
+            if use_response_cache:
+                self.response_cache = response_cache or ResponseCache(
+                    self.workspace_dir / "cache" / "responses.sqlite3"
+                )
+                self.backend = CachingBackend(self.backend, self.response_cache, self._persona_hash)
+        
+        # プロジェクトタイプ別ワークフロー（config/workflows.json）
+        self.workflows = WorkflowRegistry(workflows_file, known_roles=[r.value for r in AgentRole])
+        
         # エージェントの能力定義
         self.agent_capabilities = {
             AgentRole.CEO: ["strategic_planning", "requirements_analysis", "project_coordination"],
@@ -62,61 +143,121 @@ class AICollaborativeSystem:
             AgentRole.QA: ["test_automation", "quality_assurance", "bug_detection"]
         }
         
-        # ロギング設定
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - [%(levelname)s] %(message)s'
+        # ペルソナ定義（personas/*.yaml）と能力定義から構築したルーティング用インデックス
+        self.personas = PersonaRegistry(
+            extra_capabilities={role.value: caps for role, caps in self.agent_capabilities.items()}
         )
         
+        # プロンプト組み立て（役割ごとの固定プレフィックス + 上流成果物の差分）
+        self.context_builder = ContextBuilder(self.personas)
+        
+        # ロギング設定（キュー経由で整形・出力はバックグラウンドスレッド。未設定の場合のみ）
+        ensure_logging()
+        
         self._ensure_directories()
     
+    def _init_metrics(self):
+        """タスク関連のメトリクスを登録"""
+        self._task_transitions = self.metrics.counter(
+            "ai_org_task_transitions_total", "Task state transitions by role and new status", ["role", "status"])
+        self._task_duration = self.metrics.histogram(
+            "ai_org_task_duration_seconds", "Task execution time by role and outcome", ["role", "status"])
+        self._tasks_in_progress = self.metrics.gauge(
+            "ai_org_tasks_in_progress", "Tasks currently executing by role", ["role"])
+        self._task_retries = self.metrics.counter(
+            "ai_org_task_retries_total", "Task attempts retried after a failure by role", ["role"])
+        self._bytes_written = self.metrics.counter(
+            "ai_org_artifact_bytes_written_total", "Bytes of generated artifacts written by role", ["role"])
+        queue_depth = self.metrics.gauge(
+            "ai_org_queue_depth", "Tasks queued in the worker pool by role", ["role"])
+        # キューの深さは収集時にワーカープールから読む（ホットパスでは更新しない）
+        queue_depth.set_function(lambda: {
+            (role,): depth for role, depth in (self._active_pool.queue_depths() if self._active_pool else {}).items()
+        })
+    
+    def serve_metrics(self, port: int = 9108, host: str = "127.0.0.1") -> MetricsServer:
+        """メトリクスのHTTPエンドポイント（/metrics）を起動"""
+        server = MetricsServer([self.metrics], host=host, port=port).start()
+        logging.info(f"📈 Serving metrics on http://{server.address[0]}:{server.address[1]}/metrics")
+        return server
+    
     def _ensure_directories(self):
         """必要なディレクトリを作成"""
         dirs = [
             self.workspace_dir / "workspace" / "projects",
             self.workspace_dir / "communication" / "tasks",
             self.workspace_dir / "communication" / "reports",
+            self.workspace_dir / "communication" / "projects",
             self.workspace_dir / "logs"
         ]
         for dir_path in dirs:
             dir_path.mkdir(parents=True, exist_ok=True)
     
-    def create_project(self, project_name: str, project_type: str = "web-app") -> List[Task]:
-        """プロジェクトを作成してタスクを生成"""
+    def create_project(self, project_name: str, project_type: str = "web-app",
+                       roles: Optional[List[str]] = None) -> List[Task]:
+        """プロジェクトを作成してタスクを生成（roles を指定するとその役割のタスクだけ）"""
         logging.info(f"🚀 Creating project: {project_name} (type: {project_type})")
         
-        workflow_tasks = []
-        
-        if project_type == "web-app":
-            # Web アプリケーションのワークフロー
-            tasks_config = [
-                (AgentRole.CEO, "Product Vision & Requirements", "Define product vision, user stories, and functional requirements", 1),
-                (AgentRole.CTO, "Technical Architecture", "Design system architecture, select tech stack, and create technical specifications", 2),
-                (AgentRole.FRONTEND, "Frontend Development", "Implement React components, UI/UX, and responsive design", 3),
-                (AgentRole.BACKEND, "Backend Development", "Implement REST API, database models, and business logic", 3),
-                (AgentRole.DEVOPS, "Infrastructure Setup", "Setup Docker containers, CI/CD pipeline, and deployment configuration", 4),
-                (AgentRole.QA, "Testing & Quality", "Implement unit tests, integration tests, and E2E test automation", 5)
-            ]
-        else:
-            tasks_config = []
+        # コンパイル済みプランをインスタンス化（未定義のタイプは WorkflowError）
+        with self.tracer.span("create_project", project=project_name, project_type=project_type):
+            return self._create_project(project_name, project_type, roles)
+    
+    def analyze_repository(self, repo_path: str, use_cache: bool = True) -> RepositoryAnalysis:
+        """ローカルリポジトリを解析し、定義済みワークフローからプロジェクトタイプとチーム構成を選ぶ"""
+        with self.tracer.span("analyze_repository", path=repo_path) as span:
+            analysis = RepositoryInspector(cache_dir=analysis_dir(str(self.workspace_dir))).analyze(repo_path, use_cache)
+            compose_team(analysis, self.workflows)
+            span.set(files=analysis.files, cached=analysis.cached, project_type=analysis.project_type)
+        logging.info(f"🔍 Analyzed {analysis.path}: {analysis.files} files, {analysis.loc} LOC "
+                     f"({', '.join(analysis.primary_languages()) or 'no sources'}) in {analysis.elapsed_seconds:.2f}s"
+                     f"{' [cached]' if analysis.cached else ''}")
+        return analysis
+    
+    def create_project_from_repository(self, project_name: str, repo_path: str,
+                                       project_type: Optional[str] = None) -> List[Task]:
+        """リポジトリの解析結果からプロジェクトタイプとチームを決めてプロジェクトを作成"""
+        analysis = self.analyze_repository(repo_path)
+        if project_type and project_type != analysis.project_type:
+            # タイプを指定された場合は、そのワークフローで役割だけ選び直す
+            analysis.project_type = project_type
+            analysis.roles = select_roles(analysis, [s.role for s in self.workflows.get_plan(project_type).steps])
+        tasks = self.create_project(project_name, analysis.project_type, analysis.roles)
+        self.projects[project_name]['repository'] = {
+            'path': analysis.path,
+            'tree_hash': analysis.tree_hash,
+            'languages': analysis.primary_languages(),
+            'frameworks': analysis.frameworks
+        }
+        self._save_project_index(project_name)
+        return tasks
+    
+    def _create_project(self, project_name: str, project_type: str, roles: Optional[List[str]] = None) -> List[Task]:
+        plan = self.workflows.get_plan(project_type)
+        if roles is not None:
+            plan = plan.with_roles(roles)
+        now = datetime.now()
+        task_ids = plan.instantiate_ids(f"task_{int(now.timestamp())}_{project_name}")
         
-        # タスクを作成
-        for role, title, description, priority in tasks_config:
+        workflow_tasks = []
+        for task_id, step in zip(task_ids, plan.steps):
             task = Task(
-                id=f"task_{int(datetime.now().timestamp())}_{role.value}",
-                title=title,
-                description=description,
-                assigned_to=role,
+                id=task_id,
+                title=step.title,
+                description=step.description,
+                assigned_to=AgentRole(step.role),
                 project=project_name,
                 status=TaskStatus.PENDING,
-                priority=priority,
-                dependencies=[],
-                created_at=datetime.now(),
-                updated_at=datetime.now()
+                priority=step.priority,
+                dependencies=[task_ids[i] for i in step.dependency_indices],
+                created_at=now,
+                updated_at=now
             )
             workflow_tasks.append(task)
             self.tasks.append(task)
+            self._tasks_by_id[task.id] = task
             self._save_task(task)
+            self.events.emit(TASK_CREATED, task.project, task.id, step.role, title=task.title,
+                             project_type=project_type, dependencies=task.dependencies)
         
         # プロジェクト情報を保存
         self.projects[project_name] = {
@@ -124,74 +265,303 @@ class AICollaborativeSystem:
             'created_at': datetime.now().isoformat(),
             'tasks': [t.id for t in workflow_tasks]
         }
+        self._save_project_index(project_name)
         
         return workflow_tasks
     
+    def _save_project_index(self, project_name: str):
+        """プロジェクト情報を保存（CLI の status などがタスクファイルを走査せずに読めるように）"""
+        index_file = self.workspace_dir / "communication" / "projects" / f"{project_name}.json"
+        with open(index_file, 'w') as f:
+            json.dump({'name': project_name, **self.projects[project_name]}, f, indent=2)
+    
+    def load_project(self, project_name: str) -> List[Task]:
+        """保存済みのプロジェクトとタスクを読み込む（別プロセスで作成したプロジェクトの実行用）"""
+        records = read_project_tasks(str(self.workspace_dir), project_name)
+        if not records:
+            raise KeyError(f"Unknown project: {project_name}")
+        
+        loaded = []
+        for record in records:
+            if record['id'] in self._tasks_by_id:
+                loaded.append(self._tasks_by_id[record['id']])
+                continue
+            task = self.task_from_record(record)
+            # 中断された実行中タスクは未実行に戻す
+            if task.status == TaskStatus.IN_PROGRESS:
+                task.status = TaskStatus.PENDING
+            self.tasks.append(task)
+            self._tasks_by_id[task.id] = task
+            loaded.append(task)
+        
+        index = read_project_index(str(self.workspace_dir), project_name) or {}
+        self.projects[project_name] = {
+            'type': index.get('type', ''),
+            'created_at': index.get('created_at', ''),
+            'tasks': [t.id for t in loaded]
+        }
+        return loaded
+    
+    @staticmethod
+    def task_from_record(record: Dict[str, Any]) -> Task:
+        """保存形式（タスクファイルの JSON）からタスクを復元"""
+        return Task(
+            id=record['id'],
+            title=record['title'],
+            description=record['description'],
+            assigned_to=AgentRole(record['assigned_to']),
+            project=record['project'],
+            status=TaskStatus(record['status']),
+            priority=record['priority'],
+            dependencies=record.get('dependencies') or [],
+            created_at=datetime.fromisoformat(record['created_at']),
+            updated_at=datetime.fromisoformat(record['updated_at']),
+            result=record.get('result')
+        )
+    
+    @staticmethod
+    def task_record(task: Task) -> Dict[str, Any]:
+        """タスクの保存形式"""
+        return {
+            'id': task.id,
+            'title': task.title,
+            'description': task.description,
+            'assigned_to': task.assigned_to.value,
+            'project': task.project,
+            'status': task.status.value,
+            'priority': task.priority,
+            'dependencies': task.dependencies or [],
+            'created_at': task.created_at.isoformat(),
+            'updated_at': task.updated_at.isoformat(),
+            'result': task.result
+        }
+    
     def _save_task(self, task: Task):
         """タスクをファイルに保存"""
         task_file = self.workspace_dir / "communication" / "tasks" / f"{task.id}.json"
-        with open(task_file, 'w') as f:
-            json.dump({
-                'id': task.id,
-                'title': task.title,
-                'description': task.description,
-                'assigned_to': task.assigned_to.value,
-                'project': task.project,
-                'status': task.status.value,
-                'priority': task.priority,
-                'dependencies': task.dependencies or [],
-                'created_at': task.created_at.isoformat(),
-                'updated_at': task.updated_at.isoformat(),
-                'result': task.result
-            }, f, indent=2)
+        with self.tracer.span("save_task", project=task.project, role=task.assigned_to.value, task_id=task.id), \
+                open(task_file, 'w') as f:
+            # タスクは状態が変わるたびに保存されるため、保存回数が状態遷移数になる
+            self._task_transitions.labels(task.assigned_to.value, task.status.value).inc()
+            json.dump(self.task_record(task), f, indent=2)
     
     def switch_role(self, role: AgentRole):
         """エージェントの役割を切り替え"""
         self.current_role = role
-        logging.info(f"🎭 Switching to role: {role.value}")
+        logging.info(f"🎭 Switching to role: {role.value}", extra={'event': 'role_switch', 'role': role.value})
+    
+    def route_task(self, description: str, executable_only: bool = True) -> Optional[str]:
+        """タスク記述に最も適合するエージェントを選択"""
+        candidates = [r.value for r in AgentRole] if executable_only else None
+        return self.personas.best_agent(description, candidates)
     
     def get_pending_tasks(self, role: AgentRole) -> List[Task]:
         """特定の役割の保留中タスクを取得"""
         return [t for t in self.tasks 
                 if t.assigned_to == role and t.status == TaskStatus.PENDING]
     
-    def execute_task(self, task: Task):
+    def execute_task(self, task: Task, worker: Optional[WorkerContext] = None) -> bool:
         """タスクを実行（実際のコード生成と実装）"""
-        self.switch_role(task.assigned_to)
-        
-        logging.info(f"📋 {self.current_role.value} starting task: {task.title}")
+        if worker is None:
+            self.switch_role(task.assigned_to)
+            agent = task.assigned_to.value
+        else:
+            # 並列実行時はグローバルな current_role ではなくワーカー単位で役割を保持
+            worker.current_role = task.assigned_to.value
+            agent = worker.worker_id
+            if worker.role != task.assigned_to.value:
+                agent += f" (as {task.assigned_to.value})"
+        
+        role = task.assigned_to.value
+        tags = {'project': task.project, 'role': role, 'task_id': task.id}
+        in_progress = self._tasks_in_progress.labels(role)
+        in_progress.inc()
+        started = time.perf_counter()
+        try:
+            with self.tracer.span("execute_task", worker=agent, **tags) as span:
+                self._run_task(task, agent, tags)
+                span.set(status=task.status.value)
+        finally:
+            in_progress.dec()
+        elapsed = time.perf_counter() - started
+        self._task_duration.labels(role, task.status.value).observe(elapsed)
+        if task.status == TaskStatus.COMPLETED:
+            self.durations.record(role, task.title, elapsed)
+        return task.status == TaskStatus.COMPLETED
+    
+    def _run_task(self, task: Task, agent: str, tags: Dict[str, str]):
+        """タスク実行の本体（フェーズごとにスパンを記録）"""
+        logging.info(f"📋 {agent} starting task: {task.title}", extra={'event': 'task_started', **tags})
         task.status = TaskStatus.IN_PROGRESS
         task.updated_at = datetime.now()
         self._save_task(task)
+        self.events.emit(TASK_STARTED, task.project, task.id, tags['role'], title=task.title, worker=agent)
         
         # プロジェクトディレクトリを作成
         project_dir = self.workspace_dir / "workspace" / "projects" / task.project
-        project_dir.mkdir(parents=True, exist_ok=True)
+        with self.tracer.span("mkdir", **tags):
+            project_dir.mkdir(parents=True, exist_ok=True)
         
-        # 役割に応じたアクションを実行
-        try:
-            if task.assigned_to == AgentRole.CEO:
-                self._execute_ceo_task(task, project_dir)
-            elif task.assigned_to == AgentRole.CTO:
-                self._execute_cto_task(task, project_dir)
-            elif task.assigned_to == AgentRole.FRONTEND:
-                self._execute_frontend_task(task, project_dir)
-            elif task.assigned_to == AgentRole.BACKEND:
-                self._execute_backend_task(task, project_dir)
-            elif task.assigned_to == AgentRole.DEVOPS:
-                self._execute_devops_task(task, project_dir)
-            elif task.assigned_to == AgentRole.QA:
-                self._execute_qa_task(task, project_dir)
-            
+        # 役割に応じたアクションを実行（失敗時は役割の再試行ポリシーに従って再実行）
+        files, attempt, error = self._generate_with_retry(
+            task, project_dir, agent, tags, lambda files: self._store_artifacts(project_dir, files, tags)
+        )
+        self._finish_task(task, agent, tags, files, attempt, error)
+    
+    def _generate_with_retry(self, task: Task, project_dir: Path, agent: str, tags: Dict[str, str],
+                             deliver: Callable[[Dict[str, str]], None]) -> Tuple[Optional[Dict[str, str]], int, Optional[Exception]]:
+        """成果物を生成して deliver に渡す（成果物, 試行回数, 最後の例外）。再試行し尽くすと成果物は None"""
+        policy = self.retry_policy(task.assigned_to.value)
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                with self.tracer.span("generate", attempt=attempt, **tags):
+                    files = self._generate(task, project_dir)
+                deliver(files)
+                return files, attempt, None
+            except Exception as e:
+                if not policy.should_retry(attempt, e):
+                    return None, attempt, e
+                delay = policy.delay(attempt, self._retry_rng)
+                self._task_retries.labels(tags['role']).inc()
+                logging.warning(f"🔁 {agent} retrying task: {task.title} in {delay:.2f}s "
+                                f"(attempt {attempt}/{policy.max_attempts}) - {str(e)}",
+                                extra={'event': 'task_retry', 'attempt': attempt, **tags})
+                self.sleep(delay)
+    
+    def _finish_task(self, task: Task, agent: str, tags: Dict[str, str], files: Optional[Dict[str, str]],
+                     attempt: int, error: Optional[Exception]):
+        """実行結果をタスクに反映して保存（所要時間は実行開始時の updated_at から計る）"""
+        now = datetime.now()
+        if error is None:
+            task.result = {'created_files': list(files)}
+            if attempt > 1:
+                task.result['attempts'] = attempt
             task.status = TaskStatus.COMPLETED
-            logging.info(f"✅ {self.current_role.value} completed task: {task.title}")
-        except Exception as e:
+            logging.info(f"✅ {agent} completed task: {task.title}", extra={'event': 'task_completed', **tags})
+        else:
             task.status = TaskStatus.FAILED
-            task.result = {'error': str(e)}
-            logging.error(f"❌ {self.current_role.value} failed task: {task.title} - {str(e)}")
-        
+            task.result = {'error': str(error), 'attempts': attempt}
+            logging.error(f"❌ {agent} failed task: {task.title} - {str(error)}", extra={'event': 'task_failed', **tags})
+        task.result['duration'] = round((now - task.updated_at).total_seconds(), 3)
+        task.updated_at = now
+        self._save_task(task)
+        self.events.emit(TASK_COMPLETED if error is None else TASK_FAILED, task.project, task.id, tags['role'],
+                         title=task.title, worker=agent, **task.result)
+    
+    def _store_artifacts(self, project_dir: Path, files: Dict[str, str], tags: Dict[str, str]):
+        """成果物を書き込んでメトリクスに記録"""
+        with self.tracer.span("write_artifacts", files=len(files), **tags):
+            sizes = self._write_artifacts(project_dir, files)
+        self._bytes_written.labels(tags['role']).inc(sum(sizes.values()))
+        for relative_path, size in sizes.items():
+            self.events.emit(FILE_WRITTEN, tags['project'], tags['task_id'], tags['role'], path=relative_path, bytes=size)
+    
+    def retry_policy(self, role: str) -> RetryPolicy:
+        """役割の再試行ポリシー"""
+        return self.retry_policies.get(role, self.default_retry_policy)
+    
+    def _generate(self, task: Task, project_dir: Path) -> Dict[str, str]:
+        """役割のハンドラ（またはバックエンド）で成果物を生成"""
+        if self.backend is not None:
+            return self._execute_with_backend(task, project_dir)
+        elif task.assigned_to == AgentRole.CEO:
+            return self._execute_ceo_task(task)
+        elif task.assigned_to == AgentRole.CTO:
+            return self._execute_cto_task(task)
+        elif task.assigned_to == AgentRole.FRONTEND:
+            return self._execute_frontend_task(task)
+        elif task.assigned_to == AgentRole.BACKEND:
+            return self._execute_backend_task(task)
+        elif task.assigned_to == AgentRole.DEVOPS:
+            return self._execute_devops_task(task)
+        elif task.assigned_to == AgentRole.QA:
+            return self._execute_qa_task(task)
+    
+    def _write_artifacts(self, project_dir: Path, files: Dict[str, str]) -> Dict[str, int]:
+        """生成された成果物をプロジェクトディレクトリに書き込み（ファイルごとのバイト数を返す）"""
+        # 1つでも外を指すパスがあれば何も書き込まない（バックエンドやキャッシュの応答は信用しない）
+        paths = {relative_path: artifact_path(project_dir, relative_path) for relative_path in files}
+        sizes = {}
+        for relative_path, content in files.items():
+            file_path = paths[relative_path]
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            data = content.encode('utf-8')
+            with open(file_path, 'wb') as f:
+                f.write(data)
+            sizes[relative_path] = len(data)
+        return sizes
+    
+    def _upstream_artifacts(self, task: Task) -> List[str]:
+        """依存タスク（推移的）が生成したファイル一覧（上流から順に）"""
+        seen = set()
+        upstream = []
+        stack = list(task.dependencies or [])
+        while stack:
+            dep = self._tasks_by_id.get(stack.pop())
+            if dep is None or dep.id in seen:
+                continue
+            seen.add(dep.id)
+            upstream.append(dep)
+            stack.extend(dep.dependencies or [])
+        
+        artifacts = []
+        for dep in sorted(upstream, key=lambda t: t.priority):
+            if dep.status == TaskStatus.COMPLETED and dep.result:
+                artifacts.extend(dep.result.get('created_files', []))
+        return artifacts
+    
+    def _build_prompt(self, task: Task, project_dir: Path, incremental: bool = False):
+        """バックエンドに送るプロンプトを組み立て（固定プレフィックスはシステムプロンプトとして分離）"""
+        task_text = f"Project: {task.project}\nTask: {task.title}\n{task.description}\n"
+        return self.context_builder.build(
+            task.project,
+            task.assigned_to.value,
+            project_dir,
+            task_text,
+            self._upstream_artifacts(task),
+            incremental=incremental
+        )
+    
+    def _persona_hash(self, role: str) -> str:
+        """ペルソナ定義の内容ハッシュ（変更されるとキャッシュキーが変わる）"""
+        persona = self.personas.get(role)
+        return persona.content_hash if persona else ""
+    
+    def _execute_with_backend(self, task: Task, project_dir: Path) -> Dict[str, str]:
+        """バックエンド経由でタスクを実行し、成果物を返す"""
+        # セッションを保持できるバックエンドには送信済みの成果物を再送しない
+        incremental = self.backend.supports_sessions
+        context = self._build_prompt(task, project_dir, incremental=incremental)
+        response = self.backend.complete(AgentRequest(
+            role=task.assigned_to.value,
+            project=task.project,
+            task_id=task.id,
+            title=task.title,
+            description=task.description,
+            prompt=context.body,
+            priority=task.priority,
+            system_prompt=context.prefix,
+            session=context.session if incremental else None,
+            metadata={'prefix_hash': context.prefix_hash, 'context_files': context.included}
+        ))
+        # 応答を受け取れた場合だけ送信済みにする（失敗時は次の試行で同じ成果物を再送する）
+        self.context_builder.commit(context)
+        if response.files:
+            return dict(response.files)
+        return {f"docs/agents/{task.assigned_to.value}.md": response.text}
+    
+    def _block_task(self, task: Task, failed_dependency: str):
+        """依存タスクの失敗で実行できないタスクを失敗扱いにする"""
+        task.status = TaskStatus.FAILED
+        task.result = {'error': f"Dependency failed: {failed_dependency}", 'blocked_by': failed_dependency}
         task.updated_at = datetime.now()
         self._save_task(task)
+        self.events.emit(TASK_FAILED, task.project, task.id, task.assigned_to.value, title=task.title, **task.result)
+        logging.warning(f"⛔ Skipped task: {task.title} (dependency failed: {failed_dependency})",
+                        extra={'event': 'task_blocked', 'project': task.project, 'role': task.assigned_to.value,
+                               'task_id': task.id, 'blocked_by': failed_dependency})
     
     def _show_progress_header(self, project_name: str, total_tasks: int):
         """プロジェクト進捗ヘッダーを表示"""
@@ -219,6 +589,13 @@ class AICollaborativeSystem:
         if task.result and 'created_files' in task.result:
             print(f"📁 Created {len(task.result['created_files'])} files")
     
+    def _show_worker_completion(self, worker: WorkerContext, task: Task):
+        """ワーカーのタスク完了状態を表示（ロギング経由なので出力待ちでワーカーを止めない）"""
+        status_icon = "✅" if task.status == TaskStatus.COMPLETED else "❌"
+        logging.info(f"{status_icon} [{worker.worker_id}] {task.project}: {task.title}",
+                     extra={'event': 'task_progress', 'worker': worker.worker_id, 'project': task.project,
+                            'task_id': task.id, 'status': task.status.value})
+    
     def _show_project_completion(self, project_name: str):
         """プロジェクト完了状態を表示"""
         project_tasks = [t for t in self.tasks if t.project == project_name]
@@ -234,60 +611,29 @@ class AICollaborativeSystem:
     def get_project_status(self, project_name: str) -> Dict[str, Any]:
         """プロジェクトのステータスを取得"""
         project_tasks = [t for t in self.tasks if t.project == project_name]
-        
-        status_count = {status: 0 for status in TaskStatus}
-        for task in project_tasks:
-            status_count[task.status] += 1
-        
-        completed_tasks = [t for t in project_tasks if t.status == TaskStatus.COMPLETED]
-        
-        return {
-            'project': project_name,
-            'total_tasks': len(project_tasks),
-            'completed_tasks': len(completed_tasks),
-            'success_rate': (len(completed_tasks) / len(project_tasks) * 100) if project_tasks else 0,
-            'status_breakdown': {s.value: c for s, c in status_count.items()},
-            'tasks': [
-                {
-                    'id': t.id,
-                    'title': t.title,
-                    'assigned_to': t.assigned_to.value,
-                    'status': t.status.value,
-                    'priority': t.priority,
-                    'created_files': t.result.get('created_files', []) if t.result else []
-                }
-                for t in project_tasks
-            ]
-        }
+        status = build_project_status(project_name, [
+            {
+                'id': t.id,
+                'title': t.title,
+                'assigned_to': t.assigned_to.value,
+                'status': t.status.value,
+                'priority': t.priority,
+                'created_files': t.result.get('created_files', []) if t.result else []
+            }
+            for t in project_tasks
+        ])
+        status['eta'] = estimate_eta([self.task_record(t) for t in project_tasks], self.durations)
+        return status
     
     def monitor_project(self, project_name: str):
         """プロジェクトの現在状態をモニタリング表示"""
-        status = self.get_project_status(project_name)
-        
-        print("\n" + "="*60)
-        print(f"📊 PROJECT MONITOR: {project_name}")
-        print("="*60)
-        print(f"Progress: {status['success_rate']:.0f}% ({status['completed_tasks']}/{status['total_tasks']} tasks)")
-        print(f"\nStatus Breakdown:")
-        for status_type, count in status['status_breakdown'].items():
-            if count > 0:
-                icon = {"completed": "✅", "in_progress": "🔄", "pending": "⏳", "failed": "❌"}.get(status_type, "❓")
-                print(f"  {icon} {status_type}: {count}")
-        
-        print(f"\nTask Details:")
-        for task in status['tasks']:
-            status_icon = {"completed": "✅", "in_progress": "🔄", "pending": "⏳", "failed": "❌"}.get(task['status'], "❓")
-            print(f"  {status_icon} [{task['assigned_to']}] {task['title']}")
-            if task['created_files']:
-                print(f"     📁 Files: {', '.join(task['created_files'])}")
-        print("="*60 + "\n")
+        print_project_monitor(self.get_project_status(project_name))
     
-    def _execute_ceo_task(self, task: Task, project_dir: Path):
+    def _execute_ceo_task(self, task: Task) -> Dict[str, str]:
         """CEOタスクを実行"""
-        # 要件定義書を作成
-        docs_dir = project_dir / "docs"
-        docs_dir.mkdir(exist_ok=True)
+        files: Dict[str, str] = {}
         
+        # 要件定義書を作成
         requirements_content = """# ToDo Application Requirements
 
 ## Vision
@@ -315,15 +661,13 @@ A modern, user-friendly task management application that helps users organize th
 - Security: Input validation and XSS protection
 """
         
-        with open(docs_dir / "requirements.md", 'w') as f:
-            f.write(requirements_content)
+        files['docs/requirements.md'] = requirements_content
         
-        task.result = {'created_files': ['docs/requirements.md']}
+        return files
     
-    def _execute_cto_task(self, task: Task, project_dir: Path):
+    def _execute_cto_task(self, task: Task) -> Dict[str, str]:
         """CTOタスクを実行"""
-        docs_dir = project_dir / "docs"
-        docs_dir.mkdir(exist_ok=True)
+        files: Dict[str, str] = {}
         
         architecture_content = """# Technical Architecture
 
@@ -366,21 +710,15 @@ todo-app/
 - DELETE /api/todos/:id - Delete todo
 """
         
-        with open(docs_dir / "architecture.md", 'w') as f:
-            f.write(architecture_content)
+        files['docs/architecture.md'] = architecture_content
         
-        task.result = {'created_files': ['docs/architecture.md']}
+        return files
     
-    def _execute_frontend_task(self, task: Task, project_dir: Path):
+    def _execute_frontend_task(self, task: Task) -> Dict[str, str]:
         """Frontendタスクを実行"""
-        # Reactプロジェクト構造を作成
-        src_dir = project_dir / "src"
-        src_dir.mkdir(exist_ok=True)
+        files: Dict[str, str] = {}
         
         # TypeScript型定義
-        types_dir = src_dir / "types"
-        types_dir.mkdir(exist_ok=True)
-        
         todo_type_content = """export interface Todo {
   id: string;
   title: string;
@@ -393,8 +731,7 @@ todo-app/
 export type FilterType = 'all' | 'active' | 'completed';
 """
         
-        with open(types_dir / "todo.ts", 'w') as f:
-            f.write(todo_type_content)
+        files['src/types/todo.ts'] = todo_type_content
         
         # メインAppコンポーネント
         app_content = """import React, { useState, useEffect } from 'react';
@@ -480,12 +817,7 @@ function App() {
 export default App;
 """
         
-        with open(src_dir / "App.tsx", 'w') as f:
-            f.write(app_content)
-        
-        # コンポーネントディレクトリ
-        components_dir = src_dir / "components"
-        components_dir.mkdir(exist_ok=True)
+        files['src/App.tsx'] = app_content
         
         # AddTodoコンポーネント
         add_todo_content = """import React, { useState } from 'react';
@@ -531,23 +863,15 @@ const AddTodo: React.FC<AddTodoProps> = ({ onAdd }) => {
 export default AddTodo;
 """
         
-        with open(components_dir / "AddTodo.tsx", 'w') as f:
-            f.write(add_todo_content)
+        files['src/components/AddTodo.tsx'] = add_todo_content
         
-        task.result = {
-            'created_files': [
-                'src/types/todo.ts',
-                'src/App.tsx',
-                'src/components/AddTodo.tsx'
-            ]
-        }
+        return files
     
-    def _execute_backend_task(self, task: Task, project_dir: Path):
+    def _execute_backend_task(self, task: Task) -> Dict[str, str]:
         """Backendタスクを実行"""
-        # APIサーバーのセットアップ
-        backend_dir = project_dir / "backend"
-        backend_dir.mkdir(exist_ok=True)
+        files: Dict[str, str] = {}
         
+        # APIサーバーのセットアップ
         server_content = """const express = require('express');
 const cors = require('cors');
 const { v4: uuidv4 } = require('uuid');
@@ -627,8 +951,7 @@ app.listen(PORT, () => {
 });
 """
         
-        with open(backend_dir / "server.js", 'w') as f:
-            f.write(server_content)
+        files['backend/server.js'] = server_content
         
         # package.json
         package_json = {
@@ -650,18 +973,14 @@ app.listen(PORT, () => {
             }
         }
         
-        with open(backend_dir / "package.json", 'w') as f:
-            json.dump(package_json, f, indent=2)
+        files['backend/package.json'] = json.dumps(package_json, indent=2)
         
-        task.result = {
-            'created_files': [
-                'backend/server.js',
-                'backend/package.json'
-            ]
-        }
+        return files
     
-    def _execute_devops_task(self, task: Task, project_dir: Path):
+    def _execute_devops_task(self, task: Task) -> Dict[str, str]:
         """DevOpsタスクを実行"""
+        files: Dict[str, str] = {}
+        
         # Dockerファイルを作成
         dockerfile_content = """# Frontend Dockerfile
 FROM node:18-alpine as build
@@ -682,8 +1001,7 @@ EXPOSE 80
 CMD ["nginx", "-g", "daemon off;"]
 """
         
-        with open(project_dir / "Dockerfile", 'w') as f:
-            f.write(dockerfile_content)
+        files['Dockerfile'] = dockerfile_content
         
         # docker-compose.yml
         docker_compose_content = """version: '3.8'
@@ -724,13 +1042,9 @@ volumes:
   postgres_data:
 """
         
-        with open(project_dir / "docker-compose.yml", 'w') as f:
-            f.write(docker_compose_content)
+        files['docker-compose.yml'] = docker_compose_content
         
         # GitHub Actions CI/CD
-        github_dir = project_dir / ".github" / "workflows"
-        github_dir.mkdir(parents=True, exist_ok=True)
-        
         ci_content = """name: CI/CD Pipeline
 
 on:
@@ -776,22 +1090,13 @@ jobs:
         vercel-project-id: ${{ secrets.PROJECT_ID}}
 """
         
-        with open(github_dir / "ci-cd.yml", 'w') as f:
-            f.write(ci_content)
+        files['.github/workflows/ci-cd.yml'] = ci_content
         
-        task.result = {
-            'created_files': [
-                'Dockerfile',
-                'docker-compose.yml',
-                '.github/workflows/ci-cd.yml'
-            ]
-        }
+        return files
     
-    def _execute_qa_task(self, task: Task, project_dir: Path):
+    def _execute_qa_task(self, task: Task) -> Dict[str, str]:
         """QAタスクを実行"""
-        # テストディレクトリを作成
-        tests_dir = project_dir / "tests"
-        tests_dir.mkdir(exist_ok=True)
+        files: Dict[str, str] = {}
         
         # Jestの設定
         jest_config = {
@@ -803,8 +1108,7 @@ jobs:
             }
         }
         
-        with open(project_dir / "jest.config.json", 'w') as f:
-            json.dump(jest_config, f, indent=2)
+        files['jest.config.json'] = json.dumps(jest_config, indent=2)
         
         # テストセットアップ
         setup_content = """import '@testing-library/jest-dom';
@@ -819,8 +1123,7 @@ const localStorageMock = {
 global.localStorage = localStorageMock as any;
 """
         
-        with open(tests_dir / "setup.ts", 'w') as f:
-            f.write(setup_content)
+        files['tests/setup.ts'] = setup_content
         
         # Appコンポーネントのテスト
         app_test_content = """import React from 'react';
@@ -899,13 +1202,9 @@ describe('Todo App', () => {
 });
 """
         
-        with open(tests_dir / "App.test.tsx", 'w') as f:
-            f.write(app_test_content)
+        files['tests/App.test.tsx'] = app_test_content
         
         # E2Eテスト (Cypress)
-        e2e_dir = project_dir / "cypress" / "e2e"
-        e2e_dir.mkdir(parents=True, exist_ok=True)
-        
         e2e_test_content = """describe('Todo App E2E', () => {
   beforeEach(() => {
     cy.visit('http://localhost:3000');
@@ -950,20 +1249,16 @@ describe('Todo App', () => {
 });
 """
         
-        with open(e2e_dir / "todo-app.cy.ts", 'w') as f:
-            f.write(e2e_test_content)
+        files['cypress/e2e/todo-app.cy.ts'] = e2e_test_content
         
-        task.result = {
-            'created_files': [
-                'jest.config.json',
-                'tests/setup.ts',
-                'tests/App.test.tsx',
-                'cypress/e2e/todo-app.cy.ts'
-            ]
-        }
+        return files
     
-    def execute_project(self, project_name: str, show_progress: bool = True):
-        """プロジェクトの全タスクを順次実行"""
+    def execute_project(self, project_name: str, show_progress: bool = True, parallel: bool = False):
+        """プロジェクトの全タスクを順次実行（parallel=True でワーカープール実行）"""
+        if parallel:
+            self.execute_projects([project_name], show_progress=show_progress)
+            return
+        
         project_tasks = [t for t in self.tasks if t.project == project_name]
         
         # 優先度順にソート
@@ -977,6 +1272,11 @@ describe('Todo App', () => {
         
         for i, task in enumerate(project_tasks):
             if task.status == TaskStatus.PENDING:
+                # 依存タスクが失敗していれば実行せず、失敗を下流に閉じ込める
+                failed_dependency = self._failed_dependency(task)
+                if failed_dependency is not None:
+                    self._block_task(task, failed_dependency)
+                    continue
                 if show_progress:
                     self._show_task_progress(i + 1, len(project_tasks), task)
                 self.execute_task(task)
@@ -985,44 +1285,161 @@ describe('Todo App', () => {
         
         # プロジェクトサマリーを生成
         self._generate_project_summary(project_name)
+        self.context_builder.reset(project_name)
+        self.durations.save()
         
         if show_progress:
             self._show_project_completion(project_name)
     
+    def _failed_dependency(self, task: Task) -> Optional[str]:
+        """失敗している依存タスクのID（なければ None）"""
+        for dep_id in task.dependencies or []:
+            dep = self._tasks_by_id.get(dep_id)
+            if dep is not None and dep.status == TaskStatus.FAILED:
+                return dep_id
+        return None
+    
+    def rerun_failed(self, project_name: str, show_progress: bool = True, parallel: bool = False) -> List[Task]:
+        """失敗したタスクとその下流のタスクだけを未実行に戻して再実行（成功済みの上流はそのまま）"""
+        project_tasks = [t for t in self.tasks if t.project == project_name]
+        dependents: Dict[str, List[Task]] = {}
+        for task in project_tasks:
+            for dep_id in task.dependencies or []:
+                dependents.setdefault(dep_id, []).append(task)
+        
+        reset: Dict[str, Task] = {}
+        stack = [t for t in project_tasks if t.status == TaskStatus.FAILED]
+        while stack:
+            task = stack.pop()
+            if task.id in reset:
+                continue
+            reset[task.id] = task
+            stack.extend(dependents.get(task.id, []))
+        
+        if not reset:
+            logging.info(f"✨ No failed tasks to re-run in project: {project_name}")
+            return []
+        
+        now = datetime.now()
+        for task in reset.values():
+            task.status = TaskStatus.PENDING
+            task.result = None
+            task.updated_at = now
+            self._save_task(task)
+        logging.info(f"🔁 Re-running {len(reset)} failed/downstream tasks in project: {project_name}")
+        
+        self.execute_project(project_name, show_progress=show_progress, parallel=parallel)
+        return list(reset.values())
+    
+    def execute_projects(self, project_names: List[str], show_progress: bool = True,
+                         execute_task: Optional[Callable[[Task, WorkerContext], bool]] = None,
+                         worker_instances: Optional[Dict[str, int]] = None) -> Dict[str, int]:
+        """
+        複数プロジェクトのタスクを役割別ワーカープールで並列実行
+        execute_task / worker_instances で実行方法と同時実行数を差し替え可能（分散実行のコーディネーターなど）
+        """
+        execute_task = execute_task or self.execute_task
+        names = set(project_names)
+        project_tasks = [t for t in self.tasks if t.project in names]
+        pending = [t for t in project_tasks if t.status == TaskStatus.PENDING]
+        failed = [t.id for t in project_tasks if t.status == TaskStatus.FAILED]
+        
+        logging.info(f"🚀 Starting parallel execution: {', '.join(project_names)}")
+        logging.info(f"📋 Pending tasks: {len(pending)}")
+        
+        if show_progress:
+            for project_name in project_names:
+                self._show_progress_header(project_name, len([t for t in project_tasks if t.project == project_name]))
+        
+        def execute(task: Task, worker: WorkerContext) -> bool:
+            succeeded = execute_task(task, worker)
+            if show_progress:
+                self._show_worker_completion(worker, task)
+            return succeeded
+        
+        # 履歴の見積もりで下流まで含めた残り時間が最も長いタスクから始める（同じなら静的な優先度順）
+        remaining = self.critical_paths(pending)
+        pool = WorkerPool(
+            execute,
+            role_of=lambda t: t.assigned_to.value,
+            priority_of=lambda t: (-remaining[t.id], t.priority),
+            instances=self.worker_instances if worker_instances is None else worker_instances,
+            default_instances=self.default_worker_instances,
+            on_blocked=self._block_task
+        )
+        self._active_pool = pool
+        try:
+            stats = pool.run(pending, failed=failed)
+        finally:
+            self._active_pool = None
+        logging.info(f"👷 Workers: {stats['workers']}, completed: {stats['completed']}, "
+                     f"failed: {stats['failed']}, blocked: {stats['blocked']}, stolen: {stats['stolen']}")
+        
+        for project_name in project_names:
+            self._generate_project_summary(project_name)
+            self.context_builder.reset(project_name)
+            if show_progress:
+                self._show_project_completion(project_name)
+        self.durations.save()
+        
+        return stats
+    
+    def critical_paths(self, tasks: List[Task]) -> Dict[str, float]:
+        """各タスクから最後までの見積もり所要時間（対象タスク間の依存関係のみ考慮）"""
+        return critical_paths(
+            {t.id: t.dependencies or [] for t in tasks},
+            {t.id: self.durations.estimate(t.assigned_to.value, t.title) for t in tasks}
+        )
+    
     def _generate_project_summary(self, project_name: str):
         """プロジェクトのサマリーレポートを生成"""
         project_tasks = [t for t in self.tasks if t.project == project_name]
         completed_tasks = [t for t in project_tasks if t.status == TaskStatus.COMPLETED]
         
-        summary = f"""# Project Summary: {project_name}
+        success_rate = (len(completed_tasks) / len(project_tasks) * 100) if project_tasks else 0
+        
+        report_file = self.workspace_dir / "communication" / "reports" / f"{project_name}_summary.md"
+        with open(report_file, 'w') as f:
+            f.write(f"""# Project Summary: {project_name}
 
 ## Status Overview
 - Total Tasks: {len(project_tasks)}
 - Completed: {len(completed_tasks)}
-- Success Rate: {(len(completed_tasks) / len(project_tasks) * 100):.1f}%
+- Success Rate: {success_rate:.1f}%
 
 ## Completed Tasks
-"""
-        
-        for task in completed_tasks:
-            summary += f"\n### {task.assigned_to.value}: {task.title}\n"
-            if task.result and 'created_files' in task.result:
-                summary += "Created files:\n"
-                for file in task.result['created_files']:
-                    summary += f"- {file}\n"
-        
-        summary += f"\n## Project Location\n`workspace/projects/{project_name}/`\n"
-        
-        report_file = self.workspace_dir / "communication" / "reports" / f"{project_name}_summary.md"
-        with open(report_file, 'w') as f:
-            f.write(summary)
+""")
+            for task in completed_tasks:
+                f.write(f"\n### {task.assigned_to.value}: {task.title}\n")
+                if task.result and 'created_files' in task.result:
+                    f.write("Created files:\n")
+                    f.writelines(f"- {file}\n" for file in task.result['created_files'])
+            
+            f.write(f"\n## Project Location\n`workspace/projects/{project_name}/`\n")
         
         logging.info(f"📊 Project summary saved to: {report_file}")
 
-def main():
+def main(argv: Optional[List[str]] = None):
     """デモ実行"""
-    system = AICollaborativeSystem()
+    from core.profiling import add_profile_arguments, run_profiled
+    
+    parser = argparse.ArgumentParser(description="AI Collaborative Development System")
+    add_profile_arguments(parser)
+    args = parser.parse_args(argv)
+    
+    # プロファイル時は役割別の集計のためにトレースも有効にする
+    tracer = Tracer(enabled=True) if args.profile or os.environ.get("AI_ORG_TRACE") else None
+    system = AICollaborativeSystem(tracer=tracer)
+    run_profiled(args, lambda: run_demo(system), tracer=system.tracer)
     
+    trace_file = os.environ.get("AI_ORG_TRACE")
+    if trace_file:
+        system.tracer.export_chrome_trace(trace_file)
+        system.tracer.print_summary()
+        print(f"🔍 Trace saved to: {trace_file}")
+
+def run_demo(system: AICollaborativeSystem):
+    """ToDoアプリのデモプロジェクトを作成・実行"""
     # ToDoアプリプロジェクトを作成
     project_name = "todo-app"
     tasks = system.create_project(project_name, "web-app")
@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+AI Organization CLI
+create / execute / status / report / analyze / events / monitor / send / inbox をまとめたコマンド
+
+status / events / monitor / inbox はワークスペースのファイルを直接読むだけなので、
+システム本体（ワークフロー・ペルソナ・バックエンドなど）は読み込まない。
+重いモジュールは必要なサブコマンドの中でだけ読み込む。
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional
+
+_AI_ORG_DIR = str(Path(__file__).resolve().parent)
+if _AI_ORG_DIR not in sys.path:
+    sys.path.insert(0, _AI_ORG_DIR)
+
+from core import queries
+
+def _load_system(args, **options):
+    """AICollaborativeSystem を読み込んで生成（status / monitor / inbox 以外）"""
+    from core.logconfig import ensure_logging
+    from core.scripts import load_script
+
+    ensure_logging()
+    module = load_script("ai_collaborative_system")
+    return module, module.AICollaborativeSystem(workspace_dir=args.workspace, **options)
+
+def cmd_create(args) -> int:
+    _, system = _load_system(args)
+    if args.from_repo:
+        try:
+            tasks = system.create_project_from_repository(args.project, args.from_repo, args.type)
+        except NotADirectoryError as e:
+            print(f"❌ {e}", file=sys.stderr)
+            return 1
+    else:
+        tasks = system.create_project(args.project, args.type or "web-app")
+    print(f"✅ Created project '{args.project}' with {len(tasks)} tasks")
+    for task in tasks:
+        print(f"  - {task.assigned_to.value}: {task.title}")
+    if args.execute:
+        system.execute_project(args.project, show_progress=not args.quiet, parallel=args.parallel)
+    return 0
+
+def cmd_execute(args) -> int:
+    _, system = _load_system(args)
+    try:
+        system.load_project(args.project)
+    except KeyError:
+        print(f"❌ Unknown project: {args.project}", file=sys.stderr)
+        return 1
+    if args.rerun_failed:
+        system.rerun_failed(args.project, show_progress=not args.quiet, parallel=args.parallel)
+    else:
+        system.execute_project(args.project, show_progress=not args.quiet, parallel=args.parallel)
+    status = system.get_project_status(args.project)
+    return 0 if status['status_breakdown']['failed'] == 0 else 1
+
+def cmd_coordinator(args) -> int:
+    from core.distributed import Coordinator
+
+    _, system = _load_system(args)
+    for name in args.projects:
+        try:
+            system.load_project(name)
+        except KeyError:
+            print(f"❌ Unknown project: {name}", file=sys.stderr)
+            return 1
+    with Coordinator(system, host=args.host, port=args.port, lease_ttl=args.lease_ttl, slots=args.slots) as coordinator:
+        stats = coordinator.run(args.projects, show_progress=not args.quiet)
+    return 0 if stats['failed'] == 0 and stats['blocked'] == 0 else 1
+
+def cmd_worker(args) -> int:
+    from core.distributed import run_worker
+
+    options = {}
+    if args.simulate:
+        from core.simulation import SimulatedBackend
+        options = {'backend': SimulatedBackend(seed=args.seed), 'use_response_cache': False}
+    _, system = _load_system(args, **options)
+    roles = args.roles.split(",") if args.roles else None
+    stats = run_worker(system, host=args.host, port=args.port, roles=roles, concurrency=args.concurrency,
+                       name=args.name, connect_timeout=args.connect_timeout)
+    print(f"👷 Worker finished: {stats['completed']} completed, {stats['failed']} failed, {stats['expired']} expired")
+    return 0
+
+def cmd_status(args) -> int:
+    names = [args.project] if args.project else queries.list_projects(args.workspace)
+    history = queries.DurationHistory(queries.history_file(args.workspace))
+    statuses = []
+    for name in names:
+        status = queries.read_project_status(args.workspace, name, history)
+        if status is None:
+            print(f"❌ Unknown project: {name}", file=sys.stderr)
+            return 1
+        statuses.append(status)
+
+    if args.json:
+        print(json.dumps(statuses[0] if args.project else statuses, indent=2, ensure_ascii=False))
+        return 0
+    if not statuses:
+        print("📭 No projects")
+        return 0
+    for status in statuses:
+        breakdown = ", ".join(f"{k} {v}" for k, v in status['status_breakdown'].items() if v)
+        eta = status['eta']
+        remaining = f", ETA {queries.format_duration(eta['eta_seconds'])}" if eta['estimated_completion'] else ""
+        print(f"📊 {status['project']}: {status['success_rate']:.0f}% "
+              f"({status['completed_tasks']}/{status['total_tasks']} tasks; {breakdown}){remaining}")
+    return 0
+
+def cmd_report(args) -> int:
+    from core import reports
+
+    argv = ["--workspace", args.workspace, "--format", args.format]
+    if args.output_dir:
+        argv += ["--output-dir", args.output_dir]
+    return reports.main(argv)
+
+EVENT_ICONS = {
+    "task_created": "🆕", "task_started": "🔄", "task_completed": "✅", "task_failed": "❌", "file_written": "💾"
+}
+
+def cmd_events(args) -> int:
+    from core import events
+
+    path = events.events_file(args.workspace)
+    types = args.type.split(",") if args.type else None
+    stream = events.follow(path, since=args.since, types=types, poll=args.interval) if args.follow \
+        else events.replay(path, since=args.since, types=types)
+    try:
+        for event in stream:
+            if args.project and event.project != args.project:
+                continue
+            if args.json:
+                print(event.to_json(), flush=True)
+                continue
+            detail = event.data.get('path') or event.data.get('title', '')
+            if event.data.get('error'):
+                detail += f" - {event.data['error']}"
+            print(f"{event.timestamp} #{event.seq} {EVENT_ICONS.get(event.type, '•')} {event.type:<14} "
+                  f"{event.project or '-'} {event.role or '-'}: {detail}", flush=True)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+def cmd_analyze(args) -> int:
+    from core import project_inspector
+
+    argv = [args.path, "--workspace", args.workspace]
+    if args.no_cache:
+        argv.append("--no-cache")
+    if args.json:
+        argv.append("--json")
+    return project_inspector.main(argv)
+
+def cmd_monitor(args) -> int:
+    while True:
+        status = queries.read_project_status(args.workspace, args.project)
+        if status is None:
+            print(f"❌ Unknown project: {args.project}", file=sys.stderr)
+            return 1
+        queries.print_project_monitor(status)
+        breakdown = status['status_breakdown']
+        if not args.interval or breakdown['pending'] + breakdown['in_progress'] == 0:
+            return 0
+        time.sleep(args.interval)
+
+def cmd_send(args) -> int:
+    from core.mailbox import MailboxFullError
+    from core.scripts import load_script
+
+    try:
+        content = json.loads(args.content)
+    except json.JSONDecodeError as e:
+        print(f"❌ --content is not valid JSON: {e}", file=sys.stderr)
+        return 2
+    bus = load_script("message_bus").AIMessageBus(args.workspace, verbose=False)
+    try:
+        message_id = bus.send_message(args.sender, args.recipient, args.type, content,
+                                      block=False if args.no_wait else None, timeout=args.timeout)
+    except MailboxFullError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    print(f"📨 {args.sender} → {args.recipient}: {args.type} ({message_id})")
+    return 0
+
+def cmd_inbox(args) -> int:
+    messages = queries.read_inbox(queries.messages_dir(args.workspace), args.agent)
+    if args.json:
+        print(json.dumps(messages, indent=2, ensure_ascii=False))
+    elif not messages:
+        print(f"📭 No pending messages for {args.agent}")
+    else:
+        print(f"📬 {len(messages)} pending message(s) for {args.agent}")
+        for message in messages:
+            print(f"  [{message['timestamp']}] {message['from']} → {message['type']}: "
+                  f"{json.dumps(message['content'], ensure_ascii=False)}")
+    if args.ack and messages:
+        # 受信確認（メールボックスから削除）のときだけバスを読み込む
+        from core.scripts import load_script
+
+        bus = load_script("message_bus").AIMessageBus(args.workspace, verbose=False)
+        acked = sum(bus.ack_message(args.agent, message['id']) for message in messages)
+        print(f"🗑️  Acknowledged {acked} message(s)", file=sys.stderr if args.json else sys.stdout)
+    return 0
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="AI Organization CLI")
+    parser.add_argument("--workspace", default=".", help="ワークスペースディレクトリ")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    create = subparsers.add_parser("create", help="create a project from a workflow")
+    create.add_argument("project")
+    create.add_argument("--type", help="workflow / project type (default: web-app, or detected with --from-repo)")
+    create.add_argument("--from-repo", metavar="PATH",
+                        help="analyze a local checkout and pick the project type and team from it")
+    create.add_argument("--execute", action="store_true", help="execute the project right after creating it")
+    create.set_defaults(func=cmd_create)
+
+    execute = subparsers.add_parser("execute", help="execute the pending tasks of a project")
+    execute.add_argument("project")
+    execute.add_argument("--rerun-failed", action="store_true", help="re-run failed tasks and their downstream tasks")
+    execute.set_defaults(func=cmd_execute)
+
+    for sub in (create, execute):
+        sub.add_argument("--parallel", action="store_true", help="run independent tasks in parallel")
+        sub.add_argument("--quiet", action="store_true", help="hide the progress display")
+
+    coordinator = subparsers.add_parser("coordinator", help="serve the pending tasks of projects to remote workers")
+    coordinator.add_argument("projects", nargs="+")
+    coordinator.add_argument("--lease-ttl", type=float, default=30.0,
+                             help="seconds a lease lives without a heartbeat before the task is handed out again")
+    coordinator.add_argument("--slots", type=int, default=16, help="tasks leased at the same time per role")
+    coordinator.add_argument("--quiet", action="store_true", help="hide the progress display")
+    coordinator.set_defaults(func=cmd_coordinator)
+
+    worker = subparsers.add_parser("worker", help="execute tasks leased from a coordinator")
+    worker.add_argument("--roles", help="comma separated roles this worker accepts (default: all)")
+    worker.add_argument("--concurrency", type=int, default=1, help="tasks executed at the same time")
+    worker.add_argument("--name", help="worker name shown on the coordinator (default: host:pid)")
+    worker.add_argument("--connect-timeout", type=float, default=10.0,
+                        help="seconds to keep retrying while the coordinator is not up yet")
+    worker.add_argument("--simulate", action="store_true", help="use the simulated backend instead of the role handlers")
+    worker.add_argument("--seed", type=int, default=0, help="seed of the simulated backend")
+    worker.set_defaults(func=cmd_worker)
+
+    for sub in (coordinator, worker):
+        sub.add_argument("--host", default="127.0.0.1")
+        sub.add_argument("--port", type=int, default=9109)
+
+    status = subparsers.add_parser("status", help="show project progress (all projects if omitted)")
+    status.add_argument("project", nargs="?")
+    status.add_argument("--json", action="store_true")
+    status.set_defaults(func=cmd_status)
+
+    report = subparsers.add_parser("report", help="write the portfolio report (updates only changed projects)")
+    report.add_argument("--format", default="md,json,csv", help="comma separated formats (md,json,csv)")
+    report.add_argument("--output-dir", help="output directory (default: communication/reports)")
+    report.set_defaults(func=cmd_report)
+
+    analyze = subparsers.add_parser("analyze", help="analyze a local checkout (languages, frameworks, LOC, project type)")
+    analyze.add_argument("path")
+    analyze.add_argument("--no-cache", action="store_true", help="ignore and do not update the analysis cache")
+    analyze.add_argument("--json", action="store_true")
+    analyze.set_defaults(func=cmd_analyze)
+
+    events = subparsers.add_parser("events", help="print the task event log (replay, or follow with --follow)")
+    events.add_argument("--since", type=int, default=0, help="only events after this sequence number")
+    events.add_argument("--type", help="comma separated event types (task_created,task_started,...)")
+    events.add_argument("--project", help="only events of this project")
+    events.add_argument("--follow", action="store_true", help="keep printing new events")
+    events.add_argument("--interval", type=float, default=0.5, help="poll interval for --follow")
+    events.add_argument("--json", action="store_true", help="print events as JSON lines")
+    events.set_defaults(func=cmd_events)
+
+    monitor = subparsers.add_parser("monitor", help="show the project monitor")
+    monitor.add_argument("project")
+    monitor.add_argument("--interval", type=float, default=0,
+                         help="refresh every N seconds until no task is pending or in progress")
+    monitor.set_defaults(func=cmd_monitor)
+
+    send = subparsers.add_parser("send", help="send a message on the bus")
+    send.add_argument("sender")
+    send.add_argument("recipient")
+    send.add_argument("type")
+    send.add_argument("--content", default="{}", help="message content as JSON")
+    send.add_argument("--timeout", type=float, help="seconds to wait for a full mailbox (default: mailbox config)")
+    send.add_argument("--no-wait", action="store_true", help="fail immediately if the mailbox is full")
+    send.set_defaults(func=cmd_send)
+
+    inbox = subparsers.add_parser("inbox", help="list pending messages for an agent")
+    inbox.add_argument("agent")
+    inbox.add_argument("--json", action="store_true")
+    inbox.add_argument("--ack", action="store_true", help="remove the listed messages from the mailbox")
+    inbox.set_defaults(func=cmd_inbox)
+    return parser
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,27 +4,88 @@ AI Organization Message Bus
 AIエージェント間の通信を管理
 """
 
+import argparse
+import itertools
 import json
+import logging
+import threading
 import time
 import os
+import sys
 from datetime import datetime
-from typing import Dict, List, Any
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows（プロセス間のロックなし）
+    fcntl = None
+
+_AI_ORG_DIR = str(Path(__file__).resolve().parent.parent)
+if _AI_ORG_DIR not in sys.path:
+    sys.path.insert(0, _AI_ORG_DIR)
+
+from core.logconfig import ensure_logging
+from core.mailbox import MailboxFullError, MailboxQuota, load_mailbox_quotas
+from core.metrics import MetricsRegistry
+from core.queries import read_inbox
+
+logger = logging.getLogger("ai_org.bus")
+
+# 同一ミリ秒内のメッセージIDの衝突（ファイルの上書き）を防ぐ連番
+_sequence = itertools.count()
 
 class AIMessageBus:
-    def __init__(self, workspace_dir: str = "."):
+    # 満杯のメールボックスを待つ間、他プロセスによる受信確認（ファイル削除）を確認する間隔
+    poll_interval = 0.1
+    
+    def __init__(self, workspace_dir: str = ".", verbose: bool = True, metrics: Optional[MetricsRegistry] = None,
+                 quotas: Optional[Dict[str, MailboxQuota]] = None, default_quota: Optional[MailboxQuota] = None):
         self.workspace_dir = workspace_dir
+        self.verbose = verbose
         self.messages_dir = f"{workspace_dir}/communication/messages"
         self.ensure_directories()
+        
+        # エージェントごとのメールボックス容量（organization.json の mailboxes を引数で上書き可能）
+        self.default_quota, self.quotas = load_mailbox_quotas()
+        if default_quota is not None:
+            self.default_quota = default_quota
+        self.quotas.update(quotas or {})
+        # 使用量 [件数, バイト数]。容量のあるメールボックスは送信のたびにディレクトリから数え直す
+        self._cond = threading.Condition()
+        self._usage: Dict[str, List[int]] = {}
+        
+        # 監視用メトリクス（システムと同じレジストリを渡すとまとめて公開できる）
+        self.metrics = metrics or MetricsRegistry()
+        self._messages_sent = self.metrics.counter(
+            "ai_org_bus_messages_sent_total", "Messages sent by recipient and type", ["to", "type"])
+        self._bytes_sent = self.metrics.counter(
+            "ai_org_bus_bytes_written_total", "Bytes of message files written")
+        backlog = self.metrics.gauge(
+            "ai_org_bus_backlog", "Pending messages per agent", ["agent"])
+        backlog.set_function(self.backlog)
+        backlog_bytes = self.metrics.gauge(
+            "ai_org_bus_backlog_bytes", "Bytes of pending messages per agent (mailboxes used by this process)", ["agent"])
+        backlog_bytes.set_function(lambda: {(agent,): usage['bytes'] for agent, usage in self.mailbox_usage().items()})
+        self._rejected = self.metrics.counter(
+            "ai_org_bus_messages_rejected_total", "Messages rejected because the mailbox was full", ["to"])
+        self._blocked_seconds = self.metrics.counter(
+            "ai_org_bus_send_blocked_seconds_total", "Time senders spent waiting for a full mailbox", ["to"])
     
     def ensure_directories(self):
         os.makedirs(self.messages_dir, exist_ok=True)
         os.makedirs(f"{self.workspace_dir}/communication/tasks", exist_ok=True)
         os.makedirs(f"{self.workspace_dir}/communication/reports", exist_ok=True)
     
-    def send_message(self, from_ai: str, to_ai: str, message_type: str, content: Dict[str, Any]):
-        """AIエージェント間でメッセージを送信"""
+    def send_message(self, from_ai: str, to_ai: str, message_type: str, content: Dict[str, Any],
+                     block: Optional[bool] = None, timeout: Optional[float] = None):
+        """
+        AIエージェント間でメッセージを送信
+        宛先のメールボックスが満杯なら、容量設定（または block / timeout 引数）に従って空くまで待つか
+        MailboxFullError を送出する
+        """
         message = {
-            "id": f"{int(time.time() * 1000)}",
+            "id": f"{int(time.time() * 1000)}-{os.getpid()}-{next(_sequence)}",
             "timestamp": datetime.now().isoformat(),
             "from": from_ai,
             "to": to_ai,
@@ -34,44 +95,191 @@ class AIMessageBus:
         }
         
         filename = f"{self.messages_dir}/{to_ai}_{message['id']}.json"
-        with open(filename, 'w') as f:
-            json.dump(message, f, indent=2)
+        data = json.dumps(message, indent=2).encode('utf-8')
+        quota = self.quota(to_ai)
+        if quota.unlimited:
+            # 容量の確認が要らないので書き込みはロックの外で行い、使用量は初回に数えた値から加算するだけ
+            with self._cond:
+                if to_ai not in self._usage:
+                    self._scan(to_ai)
+            self._write(filename, data)
+            with self._cond:
+                usage = self._usage[to_ai]
+                usage[0] += 1
+                usage[1] += len(data)
+        else:
+            with self._cond:
+                # 空きの確認と書き込みを、他のバス・プロセスの送信と直列化する
+                lock = self._lock_messages()
+                try:
+                    usage = self._reserve(to_ai, quota, len(data), block, timeout, lock)
+                    self._write(filename, data)
+                finally:
+                    self._unlock_messages(lock)
+                usage[0] += 1
+                usage[1] += len(data)
+        self._messages_sent.labels(to_ai, message_type).inc()
+        self._bytes_sent.inc(len(data))
         
-        print(f"📨 Message sent: {from_ai} -> {to_ai} ({message_type})")
+        if self.verbose:
+            # 送信ごとのログは AI_ORG_LOG_SAMPLE=message_sent=0.01 などで間引ける
+            logger.info(f"📨 Message sent: {from_ai} -> {to_ai} ({message_type})",
+                        extra={'event': 'message_sent', 'from': from_ai, 'to': to_ai,
+                               'type': message_type, 'message_id': message['id']})
         return message["id"]
     
     def get_messages(self, ai_name: str) -> List[Dict[str, Any]]:
         """指定されたAIの未読メッセージを取得"""
-        messages = []
-        for filename in os.listdir(self.messages_dir):
-            if filename.startswith(f"{ai_name}_") and filename.endswith('.json'):
-                with open(f"{self.messages_dir}/{filename}", 'r') as f:
-                    message = json.load(f)
-                    if message["status"] == "pending":
-                        messages.append(message)
-        
-        return sorted(messages, key=lambda x: x["timestamp"])
+        return read_inbox(self.messages_dir, ai_name)
+    
+    def ack_message(self, ai_name: str, message_id: str) -> bool:
+        """処理済みのメッセージを削除してメールボックスを空ける（既に削除済みなら False）"""
+        path = f"{self.messages_dir}/{ai_name}_{message_id}.json"
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+        except FileNotFoundError:
+            return False
+        with self._cond:
+            usage = self._usage.get(ai_name)
+            if usage is not None:
+                usage[0] = max(usage[0] - 1, 0)
+                usage[1] = max(usage[1] - size, 0)
+            self._cond.notify_all()
+        return True
+    
+    def quota(self, ai_name: str) -> MailboxQuota:
+        """エージェントのメールボックス容量"""
+        return self.quotas.get(ai_name, self.default_quota)
+    
+    def mailbox_usage(self) -> Dict[str, Dict[str, Any]]:
+        """このバスが送信したエージェントごとの使用量と容量"""
+        with self._cond:
+            usage = {agent: list(values) for agent, values in self._usage.items()}
+        return {
+            agent: {'messages': messages, 'bytes': size,
+                    'max_messages': self.quota(agent).max_messages, 'max_bytes': self.quota(agent).max_bytes}
+            for agent, (messages, size) in usage.items()
+        }
+    
+    def _scan(self, ai_name: str) -> List[int]:
+        """ディスク上のメッセージから使用量を数え直す（ロック保持中に呼ぶ）"""
+        messages = size = 0
+        prefix = f"{ai_name}_"
+        with os.scandir(self.messages_dir) as entries:
+            for entry in entries:
+                # エージェント名に "_" を含む別の宛先（ai_x と ai_x_y など）を区別する
+                if entry.name.startswith(prefix) and entry.name.endswith('.json') \
+                        and entry.name.rsplit('_', 1)[0] == ai_name:
+                    try:
+                        size += entry.stat().st_size
+                    except FileNotFoundError:
+                        continue
+                    messages += 1
+        self._usage[ai_name] = [messages, size]
+        return self._usage[ai_name]
+    
+    @staticmethod
+    def _write(filename: str, data: bytes):
+        with open(filename, 'wb') as f:
+            f.write(data)
+    
+    def _lock_messages(self) -> Optional[int]:
+        """メッセージディレクトリの排他ロック（プロセス間。fcntl がなければ None）"""
+        if fcntl is None:
+            return None
+        fd = os.open(self.messages_dir, os.O_RDONLY)
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        return fd
+    
+    @staticmethod
+    def _unlock_messages(fd: Optional[int]):
+        if fd is not None:
+            # close でロックも解放される
+            os.close(fd)
+    
+    def _reserve(self, to_ai: str, quota: MailboxQuota, size: int, block: Optional[bool],
+                 timeout: Optional[float], lock: Optional[int]) -> List[int]:
+        """
+        ディスクから数え直してメールボックスの空きを確認（満杯なら待つか MailboxFullError）
+        self._cond とディレクトリのロックを保持して呼ぶ。待つ間はディレクトリのロックを手放す
+        """
+        block = quota.on_full == "block" if block is None else block
+        timeout = quota.timeout if timeout is None else timeout
+        usage = self._scan(to_ai)
+        if quota.too_large(size):
+            self._rejected.labels(to_ai).inc()
+            raise MailboxFullError(to_ai, usage[0], usage[1], f"message of {size} bytes exceeds max_bytes")
+        started = time.monotonic()
+        blocked = False
+        while not quota.fits(usage[0], usage[1], size):
+            blocked = True
+            waited = time.monotonic() - started
+            if not block or (timeout is not None and waited >= timeout):
+                self._rejected.labels(to_ai).inc()
+                if block:
+                    self._blocked_seconds.labels(to_ai).inc(waited)
+                raise MailboxFullError(to_ai, usage[0], usage[1],
+                                       f"timed out after {waited:.1f}s" if block else "rejected")
+            wait = self.poll_interval if timeout is None else min(self.poll_interval, timeout - waited)
+            # 他プロセスの受信確認（ファイル削除）を待つ
+            if lock is not None:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+            self._cond.wait(wait)
+            if lock is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            usage = self._scan(to_ai)
+        if blocked:
+            self._blocked_seconds.labels(to_ai).inc(time.monotonic() - started)
+        return usage
+    
+    def backlog(self) -> Dict[tuple, int]:
+        """エージェントごとの未処理メッセージ数（メッセージファイル数。収集時に数える）"""
+        counts: Dict[tuple, int] = {}
+        with os.scandir(self.messages_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith('.json'):
+                    agent = entry.name.rsplit('_', 1)[0]
+                    counts[(agent,)] = counts.get((agent,), 0) + 1
+        return counts
+
+def _demo(workspace_dir: str = "."):
+    """CEO -> CTO へのメッセージ例"""
+    bus = AIMessageBus(workspace_dir)
+    
+    try:
+        bus.send_message(
+            "ai-ceo",
+            "ai-cto",
+            "project_request",
+            {
+                "project": "Next-Gen E-commerce Platform",
+                "priority": "high",
+                "deadline": "2025-07-01",
+                "requirements": [
+                    "Microservices architecture",
+                    "Real-time features",
+                    "AI-powered recommendations",
+                    "Global scalability"
+                ]
+            },
+            # デモは満杯のメールボックスを待たずに終える
+            block=False
+        )
+    except MailboxFullError as e:
+        print(f"❌ {e}")
+        return
+    
+    print("🎉 Communication system initialized!")
 
 if __name__ == "__main__":
     # テスト用
-    bus = AIMessageBus()
-    
-    # CEO -> CTO へのメッセージ例
-    bus.send_message(
-        "ai-ceo", 
-        "ai-cto", 
-        "project_request",
-        {
-            "project": "Next-Gen E-commerce Platform",
-            "priority": "high",
-            "deadline": "2025-07-01",
-            "requirements": [
-                "Microservices architecture",
-                "Real-time features",
-                "AI-powered recommendations",
-                "Global scalability"
-            ]
-        }
-    )
+    from core.profiling import add_profile_arguments, run_profiled
     
-    print("🎉 Communication system initialized!")
+    parser = argparse.ArgumentParser(description="AI Organization Message Bus")
+    parser.add_argument("--workspace", default=".", help="ワークスペースディレクトリ")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    
+    ensure_logging()
+    run_profiled(args, lambda: _demo(args.workspace))
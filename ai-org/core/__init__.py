@@ -0,0 +1,4 @@
+"""
+AI Organization Core
+各スクリプト（ai-collaborative-system.py など）が共有する基盤モジュール群
+"""
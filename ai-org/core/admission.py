@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+AI Organization Admission Controller
+バックエンド呼び出しの同時実行数（全体・役割別）とトークンバケットによるレート制限、優先度付き待ち行列
+"""
+
+import bisect
+import itertools
+import json
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+from core.backends import AgentBackend, AgentRequest, AgentResponse, RateLimitError
+
+DEFAULT_ORGANIZATION_FILE = Path(__file__).resolve().parent.parent / "config" / "organization.json"
+
+class AdmissionTimeout(Exception):
+    """待ち時間内に実行枠を確保できなかった"""
+
+class TokenBucket:
+    """トークンバケット（rate は1秒あたりの補充量、capacity はバースト上限）"""
+    def __init__(self, rate: float, capacity: float, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self.tokens = capacity
+        self.updated = clock()
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """amount を消費できるまでの秒数（0なら即時）"""
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def consume(self, amount: float):
+        """消費（負の値は返却。実使用量との差分調整で残量が負になることもある）"""
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens - min(amount, self.capacity))
+
+@dataclass
+class Ticket:
+    role: str
+    priority: int
+    tokens: int
+    seq: int
+    waited: float = 0.0
+    used_tokens: Optional[int] = None
+
+class AdmissionController:
+    """
+    バックエンド呼び出しの中央アドミッション制御
+    priority は小さいほど優先（タスクの priority と同じ向き）
+    """
+    def __init__(self, max_concurrency: int = 8, role_concurrency: Optional[Dict[str, int]] = None,
+                 default_role_concurrency: Optional[int] = None,
+                 requests_per_minute: Optional[float] = None, tokens_per_minute: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.max_concurrency = max_concurrency
+        self.role_concurrency = dict(role_concurrency or {})
+        self.default_role_concurrency = default_role_concurrency
+        self.clock = clock
+        self.request_bucket = (
+            TokenBucket(requests_per_minute / 60.0, max(requests_per_minute / 60.0, 1.0), clock)
+            if requests_per_minute else None
+        )
+        self.token_bucket = (
+            TokenBucket(tokens_per_minute / 60.0, tokens_per_minute, clock)
+            if tokens_per_minute else None
+        )
+
+        self._cond = threading.Condition()
+        self._seq = itertools.count()
+        self._waiters = []  # (priority, seq, ticket) の昇順リスト
+        self._active = 0
+        self._active_by_role: Dict[str, int] = {}
+        self._paused_until = 0.0
+        self.admitted = 0
+        self.total_wait = 0.0
+
+    @classmethod
+    def from_config(cls, organization_file: Optional[str] = None) -> "AdmissionController":
+        """organization.json の admission 設定から生成"""
+        path = Path(organization_file) if organization_file else DEFAULT_ORGANIZATION_FILE
+        try:
+            with open(path, 'r') as f:
+                config = json.load(f).get("admission", {})
+        except FileNotFoundError:
+            config = {}
+        return cls(
+            max_concurrency=config.get("max_concurrency", 8),
+            role_concurrency=config.get("role_concurrency"),
+            default_role_concurrency=config.get("default_role_concurrency"),
+            requests_per_minute=config.get("requests_per_minute"),
+            tokens_per_minute=config.get("tokens_per_minute")
+        )
+
+    def _role_limit(self, role: str) -> Optional[int]:
+        return self.role_concurrency.get(role, self.default_role_concurrency)
+
+    def _has_slot(self, ticket: Ticket) -> bool:
+        if self._active >= self.max_concurrency:
+            return False
+        limit = self._role_limit(ticket.role)
+        return limit is None or self._active_by_role.get(ticket.role, 0) < limit
+
+    def _rate_wait(self, ticket: Ticket) -> float:
+        wait = max(self._paused_until - self.clock(), 0.0)
+        if self.request_bucket is not None:
+            wait = max(wait, self.request_bucket.wait_time(1))
+        if self.token_bucket is not None:
+            wait = max(wait, self.token_bucket.wait_time(ticket.tokens))
+        return wait
+
+    def acquire(self, role: str, priority: int = 0, tokens: int = 0, timeout: Optional[float] = None) -> Ticket:
+        """実行枠を確保（確保できるまでブロック）"""
+        ticket = Ticket(role=role, priority=priority, tokens=tokens, seq=next(self._seq))
+        entry = (priority, ticket.seq, ticket)
+        started = self.clock()
+        deadline = started + timeout if timeout is not None else None
+
+        with self._cond:
+            bisect.insort(self._waiters, entry)
+            try:
+                while True:
+                    wait = None
+                    if self._has_slot(ticket) and not self._blocked_by_higher_priority(ticket):
+                        wait = self._rate_wait(ticket)
+                        if wait <= 0:
+                            break
+                    if deadline is not None:
+                        remaining = deadline - self.clock()
+                        if remaining <= 0:
+                            raise AdmissionTimeout(f"Admission timed out for role {role}")
+                        wait = remaining if wait is None else min(wait, remaining)
+                    self._cond.wait(wait)
+            finally:
+                self._waiters.remove(entry)
+                # タイムアウトで抜けた場合も、この待ち手に譲っていた後続の待ち手を起こす
+                self._cond.notify_all()
+
+            # 実行枠とレートを消費
+            if self.request_bucket is not None:
+                self.request_bucket.consume(1)
+            if self.token_bucket is not None:
+                self.token_bucket.consume(tokens)
+            self._active += 1
+            self._active_by_role[role] = self._active_by_role.get(role, 0) + 1
+            ticket.waited = self.clock() - started
+            self.admitted += 1
+            self.total_wait += ticket.waited
+        return ticket
+
+    def _blocked_by_higher_priority(self, ticket: Ticket) -> bool:
+        """先に並んでいる待ち手で、同時実行枠が空いているものがいれば譲る（飢餓防止）"""
+        for _, _, other in self._waiters:
+            if other is ticket:
+                return False
+            if self._has_slot(other):
+                return True
+        return False
+
+    def release(self, ticket: Ticket, used_tokens: Optional[int] = None):
+        """実行枠を返却し、実際の使用トークン数との差分をバケットに反映"""
+        with self._cond:
+            self._active -= 1
+            self._active_by_role[ticket.role] -= 1
+            if used_tokens is not None and self.token_bucket is not None:
+                self.token_bucket.consume(used_tokens - ticket.tokens)
+            ticket.used_tokens = used_tokens
+            self._cond.notify_all()
+
+    def pause(self, seconds: float):
+        """バックエンドからのレート制限通知を受けて全体の受付を一時停止"""
+        with self._cond:
+            self._paused_until = max(self._paused_until, self.clock() + seconds)
+            self._cond.notify_all()
+
+    @contextmanager
+    def admit(self, role: str, priority: int = 0, tokens: int = 0, timeout: Optional[float] = None):
+        """with 文で実行枠を確保・返却"""
+        ticket = self.acquire(role, priority, tokens, timeout)
+        try:
+            yield ticket
+        finally:
+            self.release(ticket, ticket.used_tokens)
+
+    def stats(self) -> Dict:
+        """現在の状態"""
+        with self._cond:
+            return {
+                "active": self._active,
+                "active_by_role": {r: n for r, n in self._active_by_role.items() if n},
+                "waiting": len(self._waiters),
+                "admitted": self.admitted,
+                "average_wait": self.total_wait / self.admitted if self.admitted else 0.0
+            }
+
+class ThrottledBackend(AgentBackend):
+    """アドミッション制御を通してバックエンドを呼び出すラッパー"""
+    def __init__(self, backend: AgentBackend, controller: AdmissionController, max_retries: int = 3):
+        self.backend = backend
+        self.controller = controller
+        self.max_retries = max_retries
+        self.name = f"throttled({backend.name})"
+        self.supports_sessions = backend.supports_sessions
+        self.retries = 0
+
+    def complete(self, request: AgentRequest) -> AgentResponse:
+        attempt = 0
+        while True:
+            with self.controller.admit(request.role, request.priority, request.estimated_tokens()) as ticket:
+                try:
+                    response = self.backend.complete(request)
+                except RateLimitError as e:
+                    # 個別に再試行せず全体を止めることで再試行の嵐を防ぐ
+                    ticket.used_tokens = 0
+                    self.controller.pause(e.retry_after)
+                    attempt += 1
+                    self.retries += 1
+                    if attempt > self.max_retries:
+                        raise
+                    continue
+                ticket.used_tokens = response.total_tokens
+                return response
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+AI Organization Agent Backends
+エージェントのタスク実行を担うバックエンド（ローカルスタブ / Claude Code SDK）
+"""
+
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+@dataclass
+class AgentRequest:
+    role: str
+    project: str
+    task_id: str
+    title: str
+    description: str
+    prompt: str
+    priority: int = 0
+    max_tokens: int = 4096
+    system_prompt: str = ""
+    session: Optional[str] = None
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+    def estimated_tokens(self) -> int:
+        """入力（4文字≒1トークン）と出力上限から見積もったトークン数"""
+        return (len(self.system_prompt) + len(self.prompt) + 3) // 4 + self.max_tokens
+
+@dataclass
+class AgentResponse:
+    text: str = ""
+    files: Dict[str, str] = field(default_factory=dict)
+    input_tokens: int = 0
+    output_tokens: int = 0
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def total_tokens(self) -> int:
+        return self.input_tokens + self.output_tokens
+
+class BackendError(Exception):
+    """バックエンド呼び出しの失敗"""
+
+class RateLimitError(BackendError):
+    """バックエンド側のレート制限（retry_after 秒後に再試行可能）"""
+    def __init__(self, message: str, retry_after: float = 1.0):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+class ArtifactPathError(ValueError):
+    """成果物のパスがプロジェクトディレクトリの外を指している"""
+
+def artifact_path(root: Path, relative_path: str) -> Path:
+    """成果物の書き込み先（../ や絶対パスでプロジェクトディレクトリ外を指すものは拒否）"""
+    base = Path(root).resolve()
+    path = (base / relative_path).resolve()
+    if path == base or base not in path.parents:
+        raise ArtifactPathError(f"Path escapes the project directory: {relative_path}")
+    return path
+
+class AgentBackend:
+    """バックエンドの基底クラス"""
+    name = "base"
+    # True のバックエンドは同じ session の過去のやり取りを保持するため、差分のみのプロンプトで良い
+    supports_sessions = False
+
+    def complete(self, request: AgentRequest) -> AgentResponse:
+        raise NotImplementedError
+
+class StubBackend(AgentBackend):
+    """
+    ネットワーク不要のローカルスタブ
+    実APIと同様の同時実行数・レート制限を持ち、超過時は RateLimitError を送出する
+    """
+    name = "stub"
+
+    def __init__(self, latency: float = 0.0, max_concurrency: Optional[int] = None,
+                 requests_per_minute: Optional[float] = None):
+        self.latency = latency
+        self.max_concurrency = max_concurrency
+        self.requests_per_minute = requests_per_minute
+        self._lock = threading.Lock()
+        self._active = 0
+        self._request_times = []
+        self.calls = 0
+        self.rejected = 0
+        self.peak_concurrency = 0
+
+    def complete(self, request: AgentRequest) -> AgentResponse:
+        now = time.monotonic()
+        with self._lock:
+            if self.requests_per_minute is not None:
+                self._request_times = [t for t in self._request_times if now - t < 60.0]
+                if len(self._request_times) >= self.requests_per_minute:
+                    self.rejected += 1
+                    raise RateLimitError("Request rate limit exceeded", retry_after=60.0 - (now - self._request_times[0]))
+            if self.max_concurrency is not None and self._active >= self.max_concurrency:
+                self.rejected += 1
+                raise RateLimitError("Too many concurrent requests", retry_after=self.latency or 0.1)
+            self._active += 1
+            self._request_times.append(now)
+            self.calls += 1
+            self.peak_concurrency = max(self.peak_concurrency, self._active)
+        try:
+            if self.latency:
+                time.sleep(self.latency)
+            text = f"# {request.title}\n\n{request.description}\n"
+            return AgentResponse(
+                text=text,
+                files={f"docs/agents/{request.role}.md": text},
+                input_tokens=(len(request.prompt) + 3) // 4,
+                output_tokens=(len(text) + 3) // 4
+            )
+        finally:
+            with self._lock:
+                self._active -= 1
+
+class ClaudeCodeBackend(AgentBackend):
+    """claude-code-sdk によるバックエンド（SDKは初回呼び出し時に読み込む）"""
+    name = "claude-code"
+    supports_sessions = True
+
+    def __init__(self, system_prompt: Optional[str] = None, max_turns: int = 1, cwd: Optional[str] = None):
+        self.system_prompt = system_prompt
+        self.max_turns = max_turns
+        self.cwd = cwd
+        self._sessions: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def complete(self, request: AgentRequest) -> AgentResponse:
+        try:
+            import anyio
+            from claude_code_sdk import AssistantMessage, ClaudeCodeOptions, ResultMessage, TextBlock, query
+        except ImportError as e:
+            raise BackendError("claude-code-sdk is not installed (pip install claude-code-sdk)") from e
+
+        with self._lock:
+            resume = self._sessions.get(request.session) if request.session else None
+        options = ClaudeCodeOptions(
+            system_prompt=request.system_prompt or self.system_prompt,
+            max_turns=self.max_turns,
+            cwd=self.cwd,
+            resume=resume
+        )
+        texts = []
+        usage: Dict[str, Any] = {}
+        session_ids = []
+
+        async def run():
+            async for message in query(prompt=request.prompt, options=options):
+                if isinstance(message, AssistantMessage):
+                    texts.extend(block.text for block in message.content if isinstance(block, TextBlock))
+                elif isinstance(message, ResultMessage):
+                    usage.update(message.usage or {})
+                    session_ids.append(message.session_id)
+
+        anyio.run(run)
+        if request.session and session_ids:
+            with self._lock:
+                self._sessions[request.session] = session_ids[-1]
+        return AgentResponse(
+            text="\n".join(texts),
+            input_tokens=int(usage.get("input_tokens", 0)),
+            output_tokens=int(usage.get("output_tokens", 0))
+        )
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+AI Organization Benchmarks
+メッセージバス・プロジェクト作成/実行・ステータス取得・タスク保存のベンチマーク（結果はJSON、比較モードで劣化を検出）
+
+    cd ai-org
+    python3 -m core.benchmark run --sizes 10,1000,100000 --output before.json
+    python3 -m core.benchmark compare before.json after.json --threshold 0.1
+"""
+
+import argparse
+import json
+import logging
+import math
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+if __package__ in (None, ""):
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.loadtest import percentile
+from core.mailbox import MailboxQuota
+from core.scripts import load_script
+
+DEFAULT_SIZES = (10, 1000, 100000)
+# 全タスク数に比例して遅くなる処理は、全件ではなく一部のプロジェクトを計測する
+EXECUTE_SAMPLE_PROJECTS = 20
+STATUS_SAMPLE_CALLS = 200
+GET_MESSAGES_REPEATS = 3
+
+def _system(workspace: Path):
+    acs = load_script("ai_collaborative_system")
+    return acs.AICollaborativeSystem(str(workspace))
+
+def _create_projects(system, tasks: int, project_type: str = "web-app") -> List[str]:
+    """tasks 件以上のタスクになるようプロジェクトを作成"""
+    steps = len(system.workflows.get_plan(project_type).steps)
+    names = [f"bench-{i:06d}" for i in range(max(1, math.ceil(tasks / steps)))]
+    for name in names:
+        system.create_project(name, project_type)
+    return names
+
+def _timed(fn: Callable[[], object]) -> float:
+    started = time.perf_counter()
+    fn()
+    return time.perf_counter() - started
+
+def _bus(workspace: Path):
+    # 受信確認せずに size 件を積むため、送信先のメールボックスは容量を無制限にする（既定の容量では満杯で待ち続ける）
+    return load_script("message_bus").AIMessageBus(str(workspace), verbose=False,
+                                                   quotas={"ai-cto": MailboxQuota()})
+
+def bench_bus_send(workspace: Path, size: int) -> Tuple[List[float], int]:
+    """send_message を size 回"""
+    bus = _bus(workspace)
+    content = {"project": "bench", "priority": "high"}
+    latencies = [_timed(lambda: bus.send_message("ai-ceo", "ai-cto", "project_request", content))
+                 for _ in range(size)]
+    return latencies, size
+
+def bench_bus_get(workspace: Path, size: int) -> Tuple[List[float], int]:
+    """size 件の受信箱に対する get_messages（1回あたりの件数を処理量とする）"""
+    bus = _bus(workspace)
+    content = {"project": "bench"}
+    for _ in range(size):
+        bus.send_message("ai-ceo", "ai-cto", "project_request", content)
+    latencies = [_timed(lambda: bus.get_messages("ai-cto")) for _ in range(GET_MESSAGES_REPEATS)]
+    return latencies, size * GET_MESSAGES_REPEATS
+
+def bench_create_project(workspace: Path, size: int) -> Tuple[List[float], int]:
+    """size 件のタスクになるまで create_project（レイテンシはプロジェクト単位）"""
+    system = _system(workspace)
+    steps = len(system.workflows.get_plan("web-app").steps)
+    latencies = [_timed(lambda i=i: system.create_project(f"bench-{i:06d}", "web-app"))
+                 for i in range(max(1, math.ceil(size / steps)))]
+    return latencies, len(system.tasks)
+
+def bench_execute_project(workspace: Path, size: int) -> Tuple[List[float], int]:
+    """size 件のタスクを保持した状態で execute_project（一部のプロジェクトを計測）"""
+    system = _system(workspace)
+    names = _create_projects(system, size)
+    sample = names[:EXECUTE_SAMPLE_PROJECTS]
+    latencies = [_timed(lambda name=name: system.execute_project(name, show_progress=False)) for name in sample]
+    executed = sum(1 for t in system.tasks if t.project in set(sample))
+    return latencies, executed
+
+def bench_get_project_status(workspace: Path, size: int) -> Tuple[List[float], int]:
+    """size 件のタスクを保持した状態で get_project_status"""
+    system = _system(workspace)
+    names = _create_projects(system, size)
+    calls = [names[i % len(names)] for i in range(STATUS_SAMPLE_CALLS)]
+    latencies = [_timed(lambda name=name: system.get_project_status(name)) for name in calls]
+    return latencies, len(calls)
+
+def bench_save_task(workspace: Path, size: int) -> Tuple[List[float], int]:
+    """size 件のタスクを _save_task"""
+    system = _system(workspace)
+    _create_projects(system, size)
+    tasks = system.tasks[:size]
+    latencies = [_timed(lambda task=task: system._save_task(task)) for task in tasks]
+    return latencies, len(tasks)
+
+BENCHMARKS: Dict[str, Callable[[Path, int], Tuple[List[float], int]]] = {
+    "bus_send": bench_bus_send,
+    "bus_get": bench_bus_get,
+    "create_project": bench_create_project,
+    "execute_project": bench_execute_project,
+    "get_project_status": bench_get_project_status,
+    "save_task": bench_save_task,
+}
+
+def run_benchmark(name: str, size: int, measure_memory: bool = True) -> Dict:
+    """ベンチマーク1件を一時ワークスペースで実行"""
+    workspace = Path(tempfile.mkdtemp(prefix=f"ai-org-bench-{name}-"))
+    previous_disable = logging.root.manager.disable
+    logging.disable(logging.CRITICAL)
+    if measure_memory:
+        tracemalloc.start()
+    try:
+        started = time.perf_counter()
+        latencies, operations = BENCHMARKS[name](workspace, size)
+        elapsed = time.perf_counter() - started
+        peak = tracemalloc.get_traced_memory()[1] if measure_memory else None
+    finally:
+        if measure_memory:
+            tracemalloc.stop()
+        logging.disable(previous_disable)
+        shutil.rmtree(workspace, ignore_errors=True)
+
+    measured = sum(latencies)
+    latencies.sort()
+    return {
+        "benchmark": name,
+        "size": size,
+        "operations": operations,
+        "seconds": elapsed,
+        # 準備（データ投入）を除いた計測区間のスループット
+        "throughput": operations / measured if measured > 0 else 0.0,
+        "latency": {
+            "p50": percentile(latencies, 50),
+            "p95": percentile(latencies, 95),
+            "p99": percentile(latencies, 99),
+            "max": latencies[-1] if latencies else 0.0
+        },
+        "peak_memory": peak
+    }
+
+def run_suite(sizes=DEFAULT_SIZES, names: Optional[List[str]] = None, measure_memory: bool = True,
+              verbose: bool = True) -> Dict:
+    """指定サイズ・ベンチマークを全て実行"""
+    results = []
+    for name in names or list(BENCHMARKS):
+        for size in sizes:
+            result = run_benchmark(name, size, measure_memory)
+            results.append(result)
+            if verbose:
+                _print_result(result)
+    return {
+        "meta": {
+            "created_at": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "sizes": list(sizes),
+            "memory": measure_memory
+        },
+        "results": results
+    }
+
+def compare(baseline: Dict, current: Dict, threshold: float = 0.1) -> List[Dict]:
+    """
+    2つの結果を比較
+    スループット低下・p95増加・メモリ増加が threshold（比率）を超えたものを regression とする
+    """
+    base = {(r["benchmark"], r["size"]): r for r in baseline["results"]}
+    rows = []
+    for result in current["results"]:
+        key = (result["benchmark"], result["size"])
+        if key not in base:
+            continue
+        old = base[key]
+        changes = {
+            "throughput": _ratio(result["throughput"], old["throughput"]),
+            "p95": _ratio(result["latency"]["p95"], old["latency"]["p95"]),
+            "peak_memory": _ratio(result.get("peak_memory"), old.get("peak_memory"))
+        }
+        regressions = []
+        if changes["throughput"] is not None and changes["throughput"] < -threshold:
+            regressions.append("throughput")
+        for metric in ("p95", "peak_memory"):
+            if changes[metric] is not None and changes[metric] > threshold:
+                regressions.append(metric)
+        improved = changes["throughput"] is not None and changes["throughput"] > threshold
+        rows.append({
+            "benchmark": key[0],
+            "size": key[1],
+            "changes": changes,
+            "regressions": regressions,
+            "improved": improved and not regressions
+        })
+    return rows
+
+def _ratio(new: Optional[float], old: Optional[float]) -> Optional[float]:
+    if new is None or old is None or old == 0:
+        return None
+    return new / old - 1.0
+
+def _print_result(result: Dict):
+    latency = result["latency"]
+    memory = f", peak {result['peak_memory'] / 1024 / 1024:.1f} MiB" if result["peak_memory"] is not None else ""
+    print(f"⏱️  {result['benchmark']:<20} {result['size']:>7}: {result['throughput']:>10.1f} ops/s, "
+          f"p50 {latency['p50'] * 1000:.2f}ms, p95 {latency['p95'] * 1000:.2f}ms, "
+          f"p99 {latency['p99'] * 1000:.2f}ms{memory}")
+
+def _print_comparison(rows: List[Dict], threshold: float):
+    def fmt(value: Optional[float]) -> str:
+        return "    n/a" if value is None else f"{value * 100:+6.1f}%"
+
+    print("\n" + "="*60)
+    print(f"📊 BENCHMARK COMPARISON (threshold {threshold * 100:.0f}%)")
+    print("="*60)
+    for row in rows:
+        icon = "❌" if row["regressions"] else ("🚀" if row["improved"] else "✅")
+        changes = row["changes"]
+        print(f"{icon} {row['benchmark']:<20} {row['size']:>7}: throughput {fmt(changes['throughput'])}, "
+              f"p95 {fmt(changes['p95'])}, memory {fmt(changes['peak_memory'])}")
+    regressions = [row for row in rows if row["regressions"]]
+    print("="*60)
+    print(f"{'❌' if regressions else '✅'} Regressions: {len(regressions)}/{len(rows)}\n")
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks for the orchestration hot paths")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="run the benchmark suite")
+    run.add_argument("--sizes", default=",".join(str(s) for s in DEFAULT_SIZES),
+                     help="comma separated task/message counts")
+    run.add_argument("--only", help=f"comma separated benchmarks ({', '.join(BENCHMARKS)})")
+    run.add_argument("--no-memory", action="store_true", help="skip tracemalloc (faster, no peak memory)")
+    run.add_argument("--output", help="write results to this JSON file")
+
+    cmp = commands.add_parser("compare", help="compare two result files")
+    cmp.add_argument("baseline")
+    cmp.add_argument("current")
+    cmp.add_argument("--threshold", type=float, default=0.1, help="relative change treated as a regression")
+
+    args = parser.parse_args(argv)
+    if args.command == "run":
+        names = args.only.split(",") if args.only else None
+        unknown = [n for n in names or [] if n not in BENCHMARKS]
+        if unknown:
+            parser.error(f"unknown benchmarks: {', '.join(unknown)}")
+        sizes = [int(s) for s in args.sizes.split(",")]
+        results = run_suite(sizes, names, measure_memory=not args.no_memory)
+        if args.output:
+            with open(args.output, 'w') as f:
+                json.dump(results, f, indent=2)
+            print(f"💾 Results saved to: {args.output}")
+        return 0
+
+    with open(args.baseline, 'r') as f:
+        baseline = json.load(f)
+    with open(args.current, 'r') as f:
+        current = json.load(f)
+    if baseline["meta"].get("memory") != current["meta"].get("memory"):
+        # tracemalloc の有無で所要時間が大きく変わるため、同じ条件の結果同士で比較する
+        print("⚠️  Results were recorded with different memory settings; timings are not comparable")
+    rows = compare(baseline, current, args.threshold)
+    _print_comparison(rows, args.threshold)
+    return 1 if any(row["regressions"] for row in rows) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+AI Organization Context Builder
+エージェントへのプロンプトを「固定プレフィックス（ペルソナ・組織ミッション）」と「上流成果物の差分」で組み立てる
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from core.personas import DEFAULT_ORGANIZATION_FILE, PersonaRegistry
+
+TRUNCATION_MARKER = "\n... (truncated)\n"
+ARTIFACTS_HEADER = "## Upstream artifacts\n"
+MAX_CACHED_SECTIONS = 4096
+
+@dataclass
+class PromptContext:
+    session: str
+    prefix: str
+    prefix_hash: str
+    body: str
+    included: List[str] = field(default_factory=list)
+    summarized: List[str] = field(default_factory=list)
+    skipped: List[str] = field(default_factory=list)
+    # 送信が成功したら commit() で送信済みとして記録する成果物（パス -> (mtime_ns, size)）
+    pending: Dict[str, Tuple[int, int]] = field(default_factory=dict)
+
+    @property
+    def size(self) -> int:
+        return len(self.prefix) + len(self.body)
+
+def summarize(text: str, limit: int) -> str:
+    """見出しと各セクション冒頭を残して limit 文字以内に要約（足りなければ切り詰め）"""
+    if len(text) <= limit:
+        return text
+    kept = []
+    total = 0
+    budget = max(limit - len(TRUNCATION_MARKER), 0)
+    lines = text.splitlines()
+    for i, line in enumerate(lines):
+        # 見出し行と、見出し直後の1行を優先的に残す
+        is_heading = line.lstrip().startswith("#")
+        after_heading = i > 0 and lines[i - 1].lstrip().startswith("#")
+        if not (is_heading or after_heading):
+            continue
+        if total + len(line) + 1 > budget:
+            break
+        kept.append(line)
+        total += len(line) + 1
+    if not kept:
+        return text[:budget] + TRUNCATION_MARKER
+    return "\n".join(kept) + TRUNCATION_MARKER
+
+class ContextBuilder:
+    """
+    役割ごとのプレフィックスと、(プロジェクト, 役割) ごとに送信済みの成果物を記録して差分だけを追加する
+    成果物の読み込み・要約は (パス, mtime, サイズ) 単位でキャッシュする
+    """
+    def __init__(self, personas: PersonaRegistry, organization_file: Optional[str] = None,
+                 max_chars: int = 24000, artifact_max_chars: int = 6000):
+        self.personas = personas
+        self.organization_file = Path(organization_file) if organization_file else DEFAULT_ORGANIZATION_FILE
+        self.max_chars = max_chars
+        self.artifact_max_chars = artifact_max_chars
+
+        self._lock = threading.Lock()
+        self._prefixes: Dict[Tuple[str, str, str], Tuple[str, str]] = {}
+        self._sections: "OrderedDict[Tuple[str, int, int, int], str]" = OrderedDict()
+        self._sessions: Dict[str, Dict[str, Tuple[int, int]]] = {}
+        self._mission: Optional[Tuple[Tuple[int, int], str, str]] = None
+
+    def _organization(self) -> Tuple[str, str]:
+        """組織名とミッション（organization.json 更新時のみ再読み込み）"""
+        try:
+            stat = os.stat(self.organization_file)
+        except FileNotFoundError:
+            return "", ""
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if self._mission is None or self._mission[0] != signature:
+            with open(self.organization_file, 'r') as f:
+                config = json.load(f)
+            self._mission = (signature, config.get("name", ""), config.get("mission", ""))
+        return self._mission[1], self._mission[2]
+
+    def prefix(self, role: str) -> Tuple[str, str]:
+        """役割の固定プレフィックスとそのハッシュ（ペルソナ・組織定義が変わらない限り再利用）"""
+        persona = self.personas.get(role)
+        name, mission = self._organization()
+        key = (role, persona.content_hash if persona else "", mission)
+        cached = self._prefixes.get(key)
+        if cached is not None:
+            return cached
+
+        lines = [f"You are {persona.name if persona else role}, a member of {name or 'the AI organization'}."]
+        if mission:
+            lines.append(f"Organization mission: {mission}")
+        if persona:
+            if persona.role:
+                lines.append(f"Role: {persona.role}")
+            for label, values in (("Expertise", persona.expertise),
+                                  ("Responsibilities", persona.responsibilities),
+                                  ("Specialties", persona.specialties)):
+                if values:
+                    lines.append(f"{label}: {', '.join(values)}")
+            style = persona.data.get("communication_style")
+            if style:
+                lines.append(f"Communication style: {style}")
+        text = "\n".join(lines) + "\n"
+        result = (text, hashlib.sha256(text.encode("utf-8")).hexdigest()[:16])
+        with self._lock:
+            self._prefixes[key] = result
+        return result
+
+    def _section(self, project_dir: Path, relative_path: str, signature: Tuple[int, int], limit: int) -> str:
+        """成果物1件分のセクション（要約済み）を取得"""
+        key = (str(project_dir / relative_path), signature[0], signature[1], limit)
+        section = self._sections.get(key)
+        if section is None:
+            with open(project_dir / relative_path, 'r', errors='replace') as f:
+                content = f.read()
+            header = f"### {relative_path}\n"
+            section = f"{header}{summarize(content, limit - len(header) - 1)}\n"
+            with self._lock:
+                self._sections[key] = section
+                if len(self._sections) > MAX_CACHED_SECTIONS:
+                    self._sections.popitem(last=False)
+        return section
+
+    def build(self, project: str, role: str, project_dir: Path, task_text: str,
+              artifacts: Iterable[str], incremental: bool = False) -> PromptContext:
+        """
+        プロンプトを組み立てる
+        incremental=True では同じ (プロジェクト, 役割) に送信済みの成果物を省き、新規・更新分のみを含める
+        含めた成果物は送信成功後に commit() するまで送信済みにならない（失敗・再試行時に上流の文脈を失わない）
+        """
+        session = f"{project}/{role}"
+        prefix, prefix_hash = self.prefix(role)
+        context = PromptContext(session=session, prefix=prefix, prefix_hash=prefix_hash, body="")
+
+        with self._lock:
+            sent = dict(self._sessions.get(session, {})) if incremental else {}
+
+        budget = self.max_chars - len(prefix) - len(task_text) - len(ARTIFACTS_HEADER) - 1
+        sections = []
+        for relative_path in artifacts:
+            try:
+                stat = os.stat(project_dir / relative_path)
+            except FileNotFoundError:
+                continue
+            signature = (stat.st_mtime_ns, stat.st_size)
+            if sent.get(relative_path) == signature:
+                continue
+
+            limit = min(self.artifact_max_chars, budget)
+            if limit <= len(relative_path) + len(TRUNCATION_MARKER) + 16:
+                context.skipped.append(relative_path)
+                continue
+            section = self._section(project_dir, relative_path, signature, limit)
+            if stat.st_size > limit:
+                context.summarized.append(relative_path)
+            sections.append(section)
+            budget -= len(section)
+            if incremental:
+                context.pending[relative_path] = signature
+            context.included.append(relative_path)
+
+        if sections:
+            context.body = ARTIFACTS_HEADER + "".join(sections) + "\n" + task_text
+        else:
+            context.body = task_text
+        return context
+
+    def commit(self, context: PromptContext):
+        """送信に成功したプロンプトの成果物を送信済みとして記録"""
+        if not context.pending:
+            return
+        with self._lock:
+            self._sessions.setdefault(context.session, {}).update(context.pending)
+
+    def reset(self, project: Optional[str] = None):
+        """送信済み記録を破棄（project 指定時はそのプロジェクトのみ）"""
+        with self._lock:
+            if project is None:
+                self._sessions.clear()
+            else:
+                for session in [s for s in self._sessions if s.startswith(f"{project}/")]:
+                    del self._sessions[session]
@@ -0,0 +1,521 @@
+#!/usr/bin/env python3
+"""
+AI Organization Distributed Execution
+コーディネーター（タスク状態を保持し、実行可能なタスクをリース付きで配布）と
+リモートワーカー（ロールハンドラを実行し、成果物を逐次送り返す）
+
+プロトコルは TCP 上の JSON Lines（1行1メッセージ、ワーカーからの要求に1行で応答）:
+    hello     {"op": "hello", "worker": 名前, "roles": [役割...] | null}    -> welcome
+    lease     {"op": "lease", "wait": 秒}                                  -> task / idle / shutdown
+    heartbeat {"op": "heartbeat", "lease": ID}                             -> ok / expired
+    fetch     {"op": "fetch", "lease": ID, "path": 上流成果物のパス}         -> file / error
+    artifact  {"op": "artifact", "lease": ID, "path": パス, "content": 内容} -> ok / expired / error
+    complete  {"op": "complete", "lease": ID, "attempts": 回数}             -> ok / expired
+    fail      {"op": "fail", "lease": ID, "error": 内容, "attempts": 回数}   -> ok / expired
+リースはハートビートで延長され、期限切れや接続断のタスクは未実行に戻して再配布する
+"""
+
+import heapq
+import itertools
+import json
+import logging
+import os
+import socket
+import socketserver
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+from core.backends import artifact_path
+from core.events import TASK_STARTED
+from core.retry import NonRetryableError
+
+logger = logging.getLogger("ai_org.distributed")
+
+DEFAULT_PORT = 9109
+
+class LeaseExpired(NonRetryableError):
+    """リースが期限切れ（タスクは別のワーカーに再配布済み）"""
+
+class RemoteTaskError(Exception):
+    """リモートワーカーで失敗したタスクのエラー"""
+
+def _set_status(task, status: str):
+    """タスクの状態を変更（システムがスクリプトとして実行されていても同じ Enum になるよう、現在の状態の型から生成）"""
+    task.status = type(task.status)(status)
+    task.updated_at = datetime.now()
+
+@dataclass
+class _Assignment:
+    """配布中のタスク（リースの期限切れをまたいで保持）"""
+    task: Any
+    done: threading.Event = field(default_factory=threading.Event)
+    deliveries: int = 0
+    worker: Optional[str] = None
+
+@dataclass
+class _Lease:
+    id: str
+    assignment: _Assignment
+    connection: "_Connection"
+    expires: float
+    granted: float = 0.0
+    files: List[str] = field(default_factory=list)
+
+@dataclass
+class _Connection:
+    """ワーカーとの接続ごとの状態"""
+    worker: str = "unknown"
+    roles: Optional[Set[str]] = None
+    leases: Set[str] = field(default_factory=set)
+
+class Coordinator:
+    """
+    AICollaborativeSystem のタスク状態を保持し、リモートワーカーに実行させる
+    依存関係・失敗の下流への伝播は execute_projects のワーカープールをそのまま使い、
+    プールのスロット（役割ごとに slots 個）がリモートワーカーへの配布を待つ
+    """
+    def __init__(self, system, host: str = "127.0.0.1", port: int = DEFAULT_PORT, lease_ttl: float = 30.0,
+                 max_deliveries: int = 3, slots: int = 16, clock=time.monotonic):
+        self.system = system
+        self.lease_ttl = lease_ttl
+        self.max_deliveries = max_deliveries
+        self.slots = slots
+        self.clock = clock
+
+        self._cond = threading.Condition()
+        self._offers: Dict[str, List] = {}
+        self._leases: Dict[str, _Lease] = {}
+        self._seq = itertools.count()
+        self._lease_ids = itertools.count(1)
+        self._finished = False
+        self._closed = False
+
+        metrics = system.metrics
+        self._leases_granted = metrics.counter(
+            "ai_org_leases_granted_total", "Task leases handed to remote workers by role", ["role"])
+        self._leases_expired = metrics.counter(
+            "ai_org_leases_expired_total", "Task leases that expired or were dropped by role", ["role"])
+        self._workers_connected = metrics.gauge(
+            "ai_org_remote_workers", "Remote workers currently connected")
+
+        coordinator = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                connection = _Connection()
+                coordinator._workers_connected.inc()
+                try:
+                    for line in self.rfile:
+                        reply = coordinator.handle(json.loads(line), connection)
+                        self.wfile.write(json.dumps(reply).encode("utf-8") + b"\n")
+                        self.wfile.flush()
+                except (ConnectionError, json.JSONDecodeError) as e:
+                    logger.warning(f"⚠️ Worker connection error: {connection.worker} - {str(e)}")
+                finally:
+                    coordinator._workers_connected.dec()
+                    coordinator._release(connection, "connection closed")
+
+        class Server(socketserver.ThreadingTCPServer):
+            allow_reuse_address = True
+            daemon_threads = True
+
+        self._server = Server((host, port), Handler)
+        self._threads: List[threading.Thread] = []
+
+    @property
+    def address(self):
+        return self._server.server_address[:2]
+
+    def start(self) -> "Coordinator":
+        """接続の受け付けとリース期限の監視を開始"""
+        for target, name in ((self._server.serve_forever, "coordinator"), (self._reap_loop, "lease-reaper")):
+            thread = threading.Thread(target=target, name=name, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        logger.info(f"🛰️ Coordinator listening on {self.address[0]}:{self.address[1]}")
+        return self
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._server.shutdown()
+        self._server.server_close()
+        for thread in self._threads:
+            thread.join()
+
+    def __enter__(self) -> "Coordinator":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def run(self, project_names: List[str], show_progress: bool = True) -> Dict[str, int]:
+        """プロジェクトの未実行タスクをリモートワーカーで実行して完了まで待つ"""
+        with self._cond:
+            self._finished = False
+        try:
+            return self.system.execute_projects(
+                project_names, show_progress=show_progress, execute_task=self._dispatch,
+                worker_instances={role: self.slots for role in self._roles()}
+            )
+        finally:
+            with self._cond:
+                self._finished = True
+                self._cond.notify_all()
+
+    def _roles(self) -> List[str]:
+        return sorted({task.assigned_to.value for task in self.system.tasks})
+
+    def _dispatch(self, task, slot) -> bool:
+        """タスクを配布待ちに入れ、リモートワーカーが完了（または失敗）させるまで待つ（プールのスロットで実行）"""
+        role = task.assigned_to.value
+        assignment = _Assignment(task)
+        started = time.perf_counter()
+        with self.system.tracer.span("execute_task", project=task.project, role=role, task_id=task.id) as span:
+            with self._cond:
+                self._offer(assignment)
+            assignment.done.wait()
+            span.set(status=task.status.value, worker=assignment.worker)
+        self.system._task_duration.labels(role, task.status.value).observe(time.perf_counter() - started)
+        return task.status.value == "completed"
+
+    def _offer(self, assignment: _Assignment):
+        """配布待ちに追加（ロック保持中に呼ぶ）"""
+        task = assignment.task
+        queue = self._offers.setdefault(task.assigned_to.value, [])
+        heapq.heappush(queue, (task.priority, next(self._seq), assignment))
+        self._cond.notify_all()
+
+    def _take(self, roles: Optional[Set[str]]) -> Optional[_Assignment]:
+        """担当できる役割のうち最も優先度の高いタスクを取り出す（ロック保持中に呼ぶ）"""
+        best = None
+        for role, queue in self._offers.items():
+            if queue and (roles is None or role in roles) and (best is None or queue[0] < self._offers[best][0]):
+                best = role
+        return heapq.heappop(self._offers[best])[2] if best is not None else None
+
+    def handle(self, message: Dict[str, Any], connection: _Connection) -> Dict[str, Any]:
+        """ワーカーからの要求を処理して応答を返す"""
+        op = message.get("op")
+        try:
+            if op == "hello":
+                connection.worker = message.get("worker") or connection.worker
+                roles = message.get("roles")
+                connection.roles = set(roles) if roles else None
+                logger.info(f"🤝 Worker connected: {connection.worker}",
+                            extra={'event': 'worker_connected', 'worker': connection.worker, 'roles': roles})
+                return {"op": "welcome", "lease_ttl": self.lease_ttl}
+            if op == "lease":
+                return self._lease(connection, min(float(message.get("wait", 5.0)), 30.0))
+            if op == "heartbeat":
+                with self._cond:
+                    lease = self._leases.get(message["lease"])
+                    if lease is None:
+                        return {"op": "expired"}
+                    lease.expires = self.clock() + self.lease_ttl
+                return {"op": "ok"}
+            if op == "fetch":
+                lease = self._leases.get(message["lease"])
+                if lease is None:
+                    return {"op": "expired"}
+                path = artifact_path(self._project_dir(lease.assignment.task), message["path"])
+                return {"op": "file", "path": message["path"], "content": path.read_text(encoding="utf-8")}
+            if op == "artifact":
+                return self._artifact(message)
+            if op in ("complete", "fail"):
+                return self._finish(message, connection, op == "complete")
+        except (KeyError, ValueError, OSError) as e:
+            return {"op": "error", "error": f"{type(e).__name__}: {str(e)}"}
+        return {"op": "error", "error": f"Unknown op: {op}"}
+
+    def _project_dir(self, task) -> Path:
+        return self.system.workspace_dir / "workspace" / "projects" / task.project
+
+    def _lease(self, connection: _Connection, wait: float) -> Dict[str, Any]:
+        deadline = self.clock() + wait
+        with self._cond:
+            while True:
+                if self._closed:
+                    return {"op": "shutdown"}
+                assignment = self._take(connection.roles)
+                if assignment is not None:
+                    break
+                if self._finished:
+                    return {"op": "shutdown"}
+                remaining = deadline - self.clock()
+                if remaining <= 0:
+                    return {"op": "idle"}
+                self._cond.wait(remaining)
+
+            lease = _Lease(id=f"{os.getpid()}-{next(self._lease_ids)}", assignment=assignment,
+                           connection=connection, expires=self.clock() + self.lease_ttl, granted=self.clock())
+            self._leases[lease.id] = lease
+            connection.leases.add(lease.id)
+            assignment.deliveries += 1
+            assignment.worker = connection.worker
+
+        task = assignment.task
+        _set_status(task, "in_progress")
+        self.system._save_task(task)
+        self.system.events.emit(TASK_STARTED, task.project, task.id, task.assigned_to.value, title=task.title,
+                                worker=connection.worker, lease=lease.id)
+        self._leases_granted.labels(task.assigned_to.value).inc()
+        logger.info(f"📤 Leased task to {connection.worker}: {task.title}",
+                    extra={'event': 'task_leased', 'worker': connection.worker, 'project': task.project,
+                           'role': task.assigned_to.value, 'task_id': task.id, 'lease': lease.id})
+        upstream = self._upstream(task)
+        return {
+            "op": "task",
+            "lease": lease.id,
+            "lease_ttl": self.lease_ttl,
+            "task": self.system.task_record(task),
+            "upstream": [self.system.task_record(t) for t in upstream]
+        }
+
+    def _upstream(self, task) -> List[Any]:
+        """依存タスク（推移的）。ワーカー側のプロンプト組み立てに使う"""
+        tasks_by_id = self.system._tasks_by_id
+        seen = set()
+        upstream = []
+        stack = list(task.dependencies or [])
+        while stack:
+            dep = tasks_by_id.get(stack.pop())
+            if dep is None or dep.id in seen:
+                continue
+            seen.add(dep.id)
+            upstream.append(dep)
+            stack.extend(dep.dependencies or [])
+        return upstream
+
+    def _artifact(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        """成果物を受け取った順に書き込む（全体をメモリに溜めない）"""
+        lease = self._leases.get(message["lease"])
+        if lease is None:
+            return {"op": "expired"}
+        task = lease.assignment.task
+        # パスの検証は _store_artifacts（_write_artifacts）で行う
+        self.system._store_artifacts(self._project_dir(task), {message["path"]: message["content"]},
+                                     {'project': task.project, 'role': task.assigned_to.value, 'task_id': task.id})
+        lease.files.append(message["path"])
+        return {"op": "ok"}
+
+    def _finish(self, message: Dict[str, Any], connection: _Connection, succeeded: bool) -> Dict[str, Any]:
+        with self._cond:
+            lease = self._leases.pop(message["lease"], None)
+            if lease is None:
+                return {"op": "expired"}
+            connection.leases.discard(lease.id)
+        task = lease.assignment.task
+        tags = {'project': task.project, 'role': task.assigned_to.value, 'task_id': task.id}
+        files = dict.fromkeys(lease.files) if succeeded else None
+        error = None if succeeded else RemoteTaskError(message.get("error", "unknown error"))
+        self.system._finish_task(task, connection.worker, tags, files, int(message.get("attempts", 1)), error)
+        if succeeded:
+            # 待ち時間を含まないリースから完了までの時間を履歴に記録する
+            self.system.durations.record(task.assigned_to.value, task.title, self.clock() - lease.granted)
+        lease.assignment.done.set()
+        return {"op": "ok"}
+
+    def _expire(self, lease: _Lease, reason: str):
+        """期限切れのリースを回収し、タスクを再配布（回数の上限を超えたら失敗）"""
+        assignment = lease.assignment
+        task = assignment.task
+        self._leases_expired.labels(task.assigned_to.value).inc()
+        logger.warning(f"⌛ Lease {reason}: {task.title} (worker {lease.connection.worker}, "
+                       f"delivery {assignment.deliveries}/{self.max_deliveries})",
+                       extra={'event': 'lease_expired', 'worker': lease.connection.worker, 'project': task.project,
+                              'role': task.assigned_to.value, 'task_id': task.id, 'lease': lease.id})
+        if assignment.deliveries >= self.max_deliveries:
+            tags = {'project': task.project, 'role': task.assigned_to.value, 'task_id': task.id}
+            error = RemoteTaskError(f"Lease {reason} {assignment.deliveries} times (last worker: {lease.connection.worker})")
+            self.system._finish_task(task, lease.connection.worker, tags, None, assignment.deliveries, error)
+            assignment.done.set()
+            return
+        _set_status(task, "pending")
+        self.system._save_task(task)
+        with self._cond:
+            self._offer(assignment)
+
+    def _release(self, connection: _Connection, reason: str):
+        """接続が切れたワーカーのリースを即座に回収"""
+        with self._cond:
+            leases = [self._leases.pop(lease_id) for lease_id in connection.leases if lease_id in self._leases]
+            connection.leases.clear()
+        for lease in leases:
+            self._expire(lease, reason)
+
+    def reap(self) -> int:
+        """期限切れのリースを回収してタスクを再配布（回収した件数）"""
+        with self._cond:
+            now = self.clock()
+            expired = [lease for lease in self._leases.values() if lease.expires <= now]
+            for lease in expired:
+                del self._leases[lease.id]
+                lease.connection.leases.discard(lease.id)
+        for lease in expired:
+            self._expire(lease, "expired")
+        return len(expired)
+
+    def _reap_loop(self):
+        interval = max(self.lease_ttl / 4, 0.01)
+        while True:
+            with self._cond:
+                if self._closed:
+                    return
+                self._cond.wait(interval)
+            self.reap()
+
+class _Channel:
+    """コーディネーターとの接続（要求と応答の組をロックで直列化。ハートビートと成果物送信が同じ接続を使う）"""
+    def __init__(self, host: str, port: int, connect_timeout: float):
+        deadline = time.monotonic() + connect_timeout
+        while True:
+            try:
+                self._socket = socket.create_connection((host, port))
+                break
+            except OSError:
+                # コーディネーターより先に起動したワーカーは待つ
+                if time.monotonic() >= deadline:
+                    raise
+                time.sleep(0.1)
+        self._file = self._socket.makefile("rwb")
+        self._lock = threading.Lock()
+
+    def request(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            self._file.write(json.dumps(message).encode("utf-8") + b"\n")
+            self._file.flush()
+            line = self._file.readline()
+        if not line:
+            raise ConnectionError("Coordinator closed the connection")
+        return json.loads(line)
+
+    def close(self):
+        self._file.close()
+        self._socket.close()
+
+class RemoteWorker:
+    """コーディネーターからタスクを借りてロールハンドラ（またはバックエンド）で実行する"""
+    def __init__(self, system, host: str = "127.0.0.1", port: int = DEFAULT_PORT, roles: Optional[List[str]] = None,
+                 name: Optional[str] = None, poll: float = 5.0, connect_timeout: float = 10.0):
+        self.system = system
+        self.host = host
+        self.port = port
+        self.roles = roles
+        self.name = name or f"{socket.gethostname()}:{os.getpid()}"
+        self.poll = poll
+        self.connect_timeout = connect_timeout
+        self.stats = {"completed": 0, "failed": 0, "expired": 0}
+
+    def run(self) -> Dict[str, int]:
+        """shutdown を受け取る（または接続が切れる）までタスクを実行"""
+        channel = _Channel(self.host, self.port, self.connect_timeout)
+        try:
+            channel.request({"op": "hello", "worker": self.name, "roles": self.roles})
+            while True:
+                reply = channel.request({"op": "lease", "wait": self.poll})
+                if reply["op"] == "shutdown":
+                    break
+                if reply["op"] == "task":
+                    self._execute(channel, reply)
+        except ConnectionError as e:
+            logger.warning(f"⚠️ {self.name} lost the coordinator: {str(e)}")
+        finally:
+            channel.close()
+        logger.info(f"👋 {self.name} finished: {self.stats['completed']} completed, "
+                    f"{self.stats['failed']} failed, {self.stats['expired']} expired")
+        return self.stats
+
+    def _execute(self, channel: _Channel, reply: Dict[str, Any]):
+        system = self.system
+        lease_id = reply["lease"]
+        task = system.task_from_record(reply["task"])
+        # 上流タスクの状態と成果物一覧はプロンプトの組み立て（_upstream_artifacts）に使う
+        for record in reply["upstream"]:
+            upstream = system.task_from_record(record)
+            system._tasks_by_id[upstream.id] = upstream
+        system._tasks_by_id[task.id] = task
+
+        project_dir = system.workspace_dir / "workspace" / "projects" / task.project
+        project_dir.mkdir(parents=True, exist_ok=True)
+        tags = {'project': task.project, 'role': task.assigned_to.value, 'task_id': task.id}
+
+        stop = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(channel, lease_id, reply["lease_ttl"] / 3, stop),
+                                     name=f"{self.name}-heartbeat", daemon=True)
+        heartbeat.start()
+        try:
+            # 組み込みのロールハンドラはファイルを読まないため、上流成果物はバックエンド使用時のみ取得
+            if system.backend is not None:
+                self._fetch_upstream(channel, lease_id, project_dir, system._upstream_artifacts(task))
+
+            def deliver(files: Dict[str, str]):
+                for relative_path, content in files.items():
+                    try:
+                        answer = channel.request({"op": "artifact", "lease": lease_id, "path": relative_path,
+                                                  "content": content})
+                    except ConnectionError as e:
+                        # 接続が切れた時点でコーディネーターはリースを回収している
+                        raise LeaseExpired(str(e))
+                    if answer["op"] == "expired":
+                        raise LeaseExpired(f"Lease {lease_id} expired")
+                    if answer["op"] == "error":
+                        raise NonRetryableError(answer["error"])
+
+            files, attempt, error = system._generate_with_retry(task, project_dir, self.name, tags, deliver)
+        finally:
+            stop.set()
+            heartbeat.join()
+
+        if isinstance(error, LeaseExpired):
+            self.stats["expired"] += 1
+            return
+        if error is None:
+            answer = channel.request({"op": "complete", "lease": lease_id, "attempts": attempt})
+        else:
+            answer = channel.request({"op": "fail", "lease": lease_id, "error": str(error), "attempts": attempt})
+        if answer["op"] == "expired":
+            self.stats["expired"] += 1
+        else:
+            self.stats["completed" if error is None else "failed"] += 1
+
+    def _fetch_upstream(self, channel: _Channel, lease_id: str, project_dir: Path, paths: List[str]):
+        for relative_path in paths:
+            path = artifact_path(project_dir, relative_path)
+            if path.exists():
+                continue
+            answer = channel.request({"op": "fetch", "lease": lease_id, "path": relative_path})
+            if answer["op"] != "file":
+                continue
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(answer["content"], encoding="utf-8")
+
+    def _heartbeat(self, channel: _Channel, lease_id: str, interval: float, stop: threading.Event):
+        while not stop.wait(interval):
+            try:
+                if channel.request({"op": "heartbeat", "lease": lease_id})["op"] == "expired":
+                    return
+            except (ConnectionError, OSError):
+                return
+
+def run_worker(system, host: str = "127.0.0.1", port: int = DEFAULT_PORT, roles: Optional[List[str]] = None,
+               concurrency: int = 1, name: Optional[str] = None, poll: float = 5.0,
+               connect_timeout: float = 10.0) -> Dict[str, int]:
+    """concurrency 本の接続で並行にタスクを実行し、全て終わるまで待つ（合計の件数を返す）"""
+    name = name or f"{socket.gethostname()}:{os.getpid()}"
+    workers = [
+        RemoteWorker(system, host, port, roles, f"{name}#{i + 1}", poll, connect_timeout)
+        for i in range(max(concurrency, 1))
+    ]
+    threads = [threading.Thread(target=worker.run, name=worker.name) for worker in workers]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return {key: sum(worker.stats[key] for worker in workers) for key in ("completed", "failed", "expired")}
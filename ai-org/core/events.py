@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+AI Organization Event Stream
+タスクのライフサイクルイベント（作成・開始・完了・失敗・ファイル書き込み）をプロセス内の購読者に配信し、
+追記専用の JSONL ログに保存する。購読は同期イテレータ・非同期イテレータの両方で使え、ログは後から再生できる
+CLI の events からも読まれるため、標準ライブラリ以外は読み込まない
+"""
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows（プロセス間のロックなし）
+    fcntl = None
+
+TASK_CREATED = "task_created"
+TASK_STARTED = "task_started"
+TASK_COMPLETED = "task_completed"
+TASK_FAILED = "task_failed"
+FILE_WRITTEN = "file_written"
+EVENT_TYPES = (TASK_CREATED, TASK_STARTED, TASK_COMPLETED, TASK_FAILED, FILE_WRITTEN)
+
+def events_file(workspace_dir: str) -> str:
+    return os.path.join(workspace_dir, "logs", "events.jsonl")
+
+@dataclass
+class Event:
+    seq: int
+    type: str
+    timestamp: str
+    project: Optional[str] = None
+    task_id: Optional[str] = None
+    role: Optional[str] = None
+    data: Dict[str, Any] = field(default_factory=dict)
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), ensure_ascii=False, separators=(",", ":"))
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Event":
+        return cls(**data)
+
+class Subscription:
+    """
+    購読者ごとのイベントキュー（for で同期的に、async for で非同期に受け取る）
+    遅い購読者がタスク実行を止めないよう、max_pending を超えると古いイベントから捨てて dropped に数える
+    """
+    def __init__(self, stream: "EventStream", types: Optional[Iterable[str]] = None, max_pending: int = 10000):
+        self._stream = stream
+        self.types = frozenset(types) if types else None
+        self.max_pending = max_pending
+        self.dropped = 0
+        self._events: deque = deque()
+        self._cond = threading.Condition()
+        self._closed = False
+        # 非同期イテレータ使用時の (ループ, 通知用 asyncio.Event)
+        self._waker = None
+
+    def wants(self, event: Event) -> bool:
+        return self.types is None or event.type in self.types
+
+    def _deliver(self, event: Event):
+        with self._cond:
+            if self._closed:
+                return
+            if len(self._events) >= self.max_pending:
+                self._events.popleft()
+                self.dropped += 1
+            self._events.append(event)
+            self._cond.notify()
+            waker = self._waker
+        if waker is not None:
+            loop, ready = waker
+            try:
+                loop.call_soon_threadsafe(ready.set)
+            except RuntimeError:
+                # ループが閉じられた
+                pass
+
+    def close(self):
+        """購読を終了（受信済みのイベントを返し終えたらイテレーションが終わる）"""
+        self._stream._unsubscribe(self)
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+            waker = self._waker
+        if waker is not None:
+            loop, ready = waker
+            try:
+                loop.call_soon_threadsafe(ready.set)
+            except RuntimeError:
+                pass
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Event]:
+        """次のイベント（タイムアウトまたは終了時は None）"""
+        with self._cond:
+            deadline = time.monotonic() + timeout if timeout is not None else None
+            while not self._events:
+                if self._closed:
+                    return None
+                remaining = deadline - time.monotonic() if deadline is not None else None
+                if remaining is not None and remaining <= 0:
+                    return None
+                self._cond.wait(remaining)
+            return self._events.popleft()
+
+    def __iter__(self) -> Iterator[Event]:
+        while True:
+            event = self.get()
+            if event is None:
+                return
+            yield event
+
+    def __aiter__(self) -> "Subscription":
+        return self
+
+    async def __anext__(self) -> Event:
+        if self._waker is None:
+            import asyncio  # 非同期で使う場合だけ読み込む
+            self._waker = (asyncio.get_running_loop(), asyncio.Event())
+        _, ready = self._waker
+        while True:
+            with self._cond:
+                if self._events:
+                    return self._events.popleft()
+                if self._closed:
+                    raise StopAsyncIteration
+                ready.clear()
+            await ready.wait()
+
+    def __enter__(self) -> "Subscription":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class EventStream:
+    """
+    イベントの発行と配信（スレッドセーフ）。log_path を指定すると全イベントを追記専用の JSONL に保存する
+    seq はログの最後のイベントから引き継ぐ。複数プロセスが同じログに書く場合も、ファイルロックの中で
+    末尾の seq を読み直してから追記するため、ログ全体で seq が重複せず増加順に並ぶ
+    """
+    def __init__(self, log_path: Optional[str] = None, clock: Callable[[], datetime] = datetime.now):
+        self.log_path = log_path
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._subscriptions: List[Subscription] = []
+        self._log = None
+        # 最後に seq を合わせたときのログのサイズ（変わっていれば他プロセスが追記している）
+        self._log_size = None
+        self._seq = last_seq(log_path) if log_path else 0
+
+    @property
+    def seq(self) -> int:
+        """最後に発行したイベントの seq"""
+        return self._seq
+
+    def _open_log(self):
+        if self._log is None:
+            os.makedirs(os.path.dirname(self.log_path) or ".", exist_ok=True)
+            self._log = open(self.log_path, 'a', encoding='utf-8')
+        return self._log
+
+    def emit(self, type: str, project: Optional[str] = None, task_id: Optional[str] = None,
+             role: Optional[str] = None, **data) -> Event:
+        """イベントを発行（ログへの追記と購読者への配信）"""
+        with self._lock:
+            log = self._open_log() if self.log_path else None
+            if log is not None and fcntl is not None:
+                fcntl.flock(log, fcntl.LOCK_EX)
+            try:
+                if log is not None and os.fstat(log.fileno()).st_size != self._log_size:
+                    self._seq = max(self._seq, last_seq(self.log_path))
+                self._seq += 1
+                event = Event(seq=self._seq, type=type, timestamp=self.clock().isoformat(),
+                              project=project, task_id=task_id, role=role, data=data)
+                if log is not None:
+                    # 1行ずつ書き出す（別プロセスの tail が途中の行を読まないように）
+                    log.write(event.to_json() + "\n")
+                    log.flush()
+                    self._log_size = os.fstat(log.fileno()).st_size
+            finally:
+                if log is not None and fcntl is not None:
+                    fcntl.flock(log, fcntl.LOCK_UN)
+            # 購読者への配信もロック内で行い、seq の順に届ける（配信はキューに積むだけ）
+            for subscription in self._subscriptions:
+                if subscription.wants(event):
+                    subscription._deliver(event)
+        return event
+
+    def subscribe(self, types: Optional[Iterable[str]] = None, since: Optional[int] = None,
+                  max_pending: int = 10000) -> Subscription:
+        """
+        購読を開始。since を指定するとログからその seq より後のイベントを先に受け取る（取りこぼしなし）
+        """
+        subscription = Subscription(self, types, max_pending)
+        with self._lock:
+            if since is not None and self.log_path:
+                for event in replay(self.log_path, since=since, types=types):
+                    subscription._deliver(event)
+            self._subscriptions.append(subscription)
+        return subscription
+
+    def _unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            if subscription in self._subscriptions:
+                self._subscriptions.remove(subscription)
+
+    def replay(self, since: int = 0, types: Optional[Iterable[str]] = None) -> Iterator[Event]:
+        """ログのイベントを順に読む"""
+        if not self.log_path:
+            return iter(())
+        return replay(self.log_path, since=since, types=types)
+
+    def close(self):
+        """全ての購読を終了してログを閉じる"""
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        for subscription in subscriptions:
+            subscription.close()
+        with self._lock:
+            if self._log is not None:
+                self._log.close()
+                self._log = None
+                self._log_size = None
+
+def replay(path: str, since: int = 0, types: Optional[Iterable[str]] = None) -> Iterator[Event]:
+    """イベントログを読む（since より後の seq のみ。書き込み途中の最終行は読まない）"""
+    wanted = frozenset(types) if types else None
+    try:
+        f = open(path, 'r', encoding='utf-8')
+    except FileNotFoundError:
+        return
+    with f:
+        for line in f:
+            if not line.endswith("\n"):
+                break
+            event = _parse(line)
+            if event is not None and event.seq > since and (wanted is None or event.type in wanted):
+                yield event
+
+def follow(path: str, since: int = 0, types: Optional[Iterable[str]] = None, poll: float = 0.5,
+           stop: Optional[threading.Event] = None) -> Iterator[Event]:
+    """別プロセスが書き込むイベントログを追いかける（tail -f 相当。stop がセットされるまで続く）"""
+    wanted = frozenset(types) if types else None
+    position = 0
+    buffer = ""
+    while stop is None or not stop.is_set():
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                if os.fstat(f.fileno()).st_size < position:
+                    # ログが作り直された
+                    position, buffer = 0, ""
+                f.seek(position)
+                chunk = f.read()
+                position = f.tell()
+        except FileNotFoundError:
+            chunk = ""
+        buffer += chunk
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            event = _parse(line)
+            if event is not None and event.seq > since and (wanted is None or event.type in wanted):
+                since = event.seq
+                yield event
+        if not chunk:
+            if stop is not None:
+                stop.wait(poll)
+            else:
+                time.sleep(poll)
+
+def last_seq(path: str) -> int:
+    """ログの最後のイベントの seq（末尾だけ読む）"""
+    try:
+        with open(path, 'rb') as f:
+            size = f.seek(0, os.SEEK_END)
+            block = min(size, 64 * 1024)
+            f.seek(size - block)
+            lines = f.read(block).split(b"\n")
+    except FileNotFoundError:
+        return 0
+    for line in reversed(lines):
+        event = _parse(line.decode('utf-8', errors='replace'))
+        if event is not None:
+            return event.seq
+    return 0
+
+def _parse(line: str) -> Optional[Event]:
+    line = line.strip()
+    if not line:
+        return None
+    try:
+        return Event.from_dict(json.loads(line))
+    except (json.JSONDecodeError, TypeError):
+        return None
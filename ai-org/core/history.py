@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+AI Organization Duration History
+役割・タスク種別ごとの所要時間の履歴（指数移動平均）と、それを使ったクリティカルパス・完了予測
+CLI の status からも読まれるため、標準ライブラリ以外は読み込まない
+"""
+
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows（プロセス間のロックなし）
+    fcntl = None
+
+# 履歴がないときの見積もり（秒）
+DEFAULT_ESTIMATE = 1.0
+
+def history_file(workspace_dir: str) -> str:
+    return os.path.join(workspace_dir, "cache", "durations.json")
+
+class DurationHistory:
+    """
+    (役割, タスク種別) ごとの所要時間の指数移動平均と件数をJSONに保存する
+    未知のタスク種別は役割全体の平均、それもなければ default で見積もる
+    保存時はファイルロックの中で保存済みの履歴を読み直し、前回の保存以降に記録した分を重ねるため、
+    複数のプロセス（コーディネーターと CLI など）が同じ履歴に書いても互いの記録を消さない
+    """
+    def __init__(self, path: Optional[str] = None, alpha: float = 0.3, default: float = DEFAULT_ESTIMATE):
+        self.path = path
+        self.alpha = alpha
+        self.default = default
+        self._lock = threading.Lock()
+        # キー -> [平均, 件数]
+        self._entries: Dict[str, List[float]] = self._load() if path else {}
+        # 前回の保存以降に記録した (役割, タスク種別, 秒数)
+        self._pending: List[Tuple[str, str, float]] = []
+
+    def _load(self) -> Dict[str, List[float]]:
+        try:
+            with open(self.path, 'r') as f:
+                return {key: list(value) for key, value in json.load(f).get("entries", {}).items()}
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    @staticmethod
+    def key(role: str, task_type: Optional[str] = None) -> str:
+        return f"{role}/{task_type or '*'}"
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _update(self, entries: Dict[str, List[float]], key: str, seconds: float):
+        entry = entries.get(key)
+        if entry is None:
+            entries[key] = [seconds, 1]
+        else:
+            entry[0] += self.alpha * (seconds - entry[0])
+            entry[1] += 1
+
+    def _apply(self, entries: Dict[str, List[float]], role: str, task_type: str, seconds: float):
+        self._update(entries, self.key(role, task_type), seconds)
+        self._update(entries, self.key(role), seconds)
+
+    def record(self, role: str, task_type: str, seconds: float):
+        """完了したタスクの所要時間を記録（役割全体の平均も更新）"""
+        with self._lock:
+            self._apply(self._entries, role, task_type, seconds)
+            self._pending.append((role, task_type, seconds))
+
+    def estimate(self, role: str, task_type: str) -> float:
+        """所要時間の見積もり（秒）"""
+        entry = self._entries.get(self.key(role, task_type)) or self._entries.get(self.key(role))
+        return entry[0] if entry else self.default
+
+    def save(self):
+        """
+        変更があれば保存済みの履歴に重ねてアトミックに保存（別プロセスの読み込み中に壊れたファイルを見せない）
+        """
+        if not self.path:
+            return
+        with self._lock:
+            if not self._pending:
+                return
+            pending, self._pending = self._pending, []
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(f"{self.path}.lock", 'a') as lock:
+                if fcntl is not None:
+                    fcntl.flock(lock, fcntl.LOCK_EX)
+                entries = self._load()
+                for sample in pending:
+                    self._apply(entries, *sample)
+                data = {"version": 1, "alpha": self.alpha,
+                        "entries": {key: [round(mean, 6), int(count)] for key, (mean, count) in sorted(entries.items())}}
+                temporary = f"{self.path}.{os.getpid()}.tmp"
+                with open(temporary, 'w') as f:
+                    json.dump(data, f, separators=(",", ":"))
+                os.replace(temporary, self.path)
+        except BaseException:
+            # 保存できなかった分は次回の保存に回す
+            with self._lock:
+                self._pending[:0] = pending
+            raise
+        with self._lock:
+            # 他プロセスの記録を取り込み、保存中に記録された分を重ね直す
+            for sample in self._pending:
+                self._apply(entries, *sample)
+            self._entries = entries
+
+def critical_paths(dependencies: Dict[str, List[str]], durations: Dict[str, float]) -> Dict[str, float]:
+    """
+    各タスクから最後までの最長経路の長さ（自身の所要時間を含む）
+    dependencies は対象タスクの依存先ID（対象外のIDは無視）
+    """
+    dependents: Dict[str, List[str]] = {task_id: [] for task_id in dependencies}
+    remaining = {task_id: 0 for task_id in dependencies}
+    for task_id, deps in dependencies.items():
+        for dep in deps:
+            if dep in dependents:
+                dependents[dep].append(task_id)
+                remaining[dep] += 1
+
+    # 下流から順に（依存されているタスクが全て計算済みになったものから）計算する
+    lengths: Dict[str, float] = {}
+    ready = [task_id for task_id, count in remaining.items() if count == 0]
+    while ready:
+        task_id = ready.pop()
+        lengths[task_id] = durations[task_id] + max((lengths[child] for child in dependents[task_id]), default=0.0)
+        for dep in dependencies[task_id]:
+            if dep in remaining:
+                remaining[dep] -= 1
+                if remaining[dep] == 0:
+                    ready.append(dep)
+    return lengths
+
+def estimate_eta(tasks: List[Dict[str, Any]], history: DurationHistory, now: Optional[datetime] = None) -> Dict[str, Any]:
+    """
+    未完了タスクの見積もりから完了予測を計算
+    eta_seconds はワーカーが十分にある場合（クリティカルパス）、remaining_work_seconds は1ワーカーで順次実行した場合
+    tasks の各要素は id, assigned_to, title, status, dependencies, updated_at（ISO 形式）を持つ
+    """
+    now = now or datetime.now()
+    durations: Dict[str, float] = {}
+    dependencies: Dict[str, List[str]] = {}
+    for task in tasks:
+        if task['status'] not in ("pending", "in_progress"):
+            continue
+        estimate = history.estimate(task['assigned_to'], task['title'])
+        if task['status'] == "in_progress":
+            # 実行中のタスクは経過時間を差し引く
+            elapsed = (now - datetime.fromisoformat(task['updated_at'])).total_seconds()
+            estimate = max(estimate - elapsed, 0.0)
+        durations[task['id']] = estimate
+        dependencies[task['id']] = task.get('dependencies') or []
+
+    eta = max(critical_paths(dependencies, durations).values(), default=0.0)
+    return {
+        'eta_seconds': round(eta, 1),
+        'remaining_work_seconds': round(sum(durations.values()), 1),
+        'estimated_completion': datetime.fromtimestamp(now.timestamp() + eta).isoformat(timespec='seconds')
+        if durations else None
+    }
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+AI Organization Load Test
+擬似バックエンドで多数のプロジェクトをワーカープール・メッセージバス・成果物書き込みに流すオフライン負荷試験
+
+    cd ai-org && python3 -m core.loadtest --projects 1000 --workers-per-role 64 --time-scale 0.01
+"""
+
+import argparse
+import json
+import logging
+import math
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+if __package__ in (None, ""):
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.admission import AdmissionController
+from core.mailbox import MailboxQuota
+from core.profiling import add_profile_arguments, run_profiled
+from core.retry import load_retry_policies
+from core.scripts import load_script
+from core.simulation import LATENCY_DISTRIBUTIONS, SimulatedBackend
+from core.tracing import Tracer
+
+def percentile(values: List[float], q: float) -> float:
+    """最近傍法によるパーセンタイル（values はソート済み）"""
+    if not values:
+        return 0.0
+    return values[max(0, math.ceil(q / 100.0 * len(values)) - 1)]
+
+def _directory_size(path: Path) -> Tuple[int, int]:
+    files = 0
+    size = 0
+    for root, _, names in os.walk(path):
+        for name in names:
+            files += 1
+            size += os.path.getsize(os.path.join(root, name))
+    return files, size
+
+def run_load_test(projects: int = 100, project_type: str = "web-app", seed: int = 0,
+                  latency: str = "lognormal", latency_mean: float = 0.5, latency_sigma: float = 0.5,
+                  failure_rate: float = 0.0, rate_limit_rate: float = 0.0,
+                  output_size: Tuple[int, int] = (500, 4000), time_scale: float = 0.01,
+                  workers_per_role: int = 32, max_concurrency: int = 256,
+                  workspace_dir: Optional[str] = None, keep_workspace: bool = False,
+                  tracer: Optional[Tracer] = None, metrics_port: Optional[int] = None) -> Dict:
+    """負荷試験を実行して結果を返す（workspace_dir 未指定時は一時ディレクトリを使い、終了後に削除）"""
+    acs = load_script("ai_collaborative_system")
+    message_bus = load_script("message_bus")
+
+    workspace = Path(workspace_dir) if workspace_dir else Path(tempfile.mkdtemp(prefix="ai-org-loadtest-"))
+    backend = SimulatedBackend(
+        seed=seed, latency=latency, latency_mean=latency_mean, latency_sigma=latency_sigma,
+        failure_rate=failure_rate, rate_limit_rate=rate_limit_rate,
+        output_size=output_size, time_scale=time_scale
+    )
+    bus = None
+    durations: List[float] = []
+    durations_lock = threading.Lock()
+
+    class LoadTestSystem(acs.AICollaborativeSystem):
+        """タスク完了ごとにバスへ報告し、所要時間を記録する"""
+        def execute_task(self, task, worker=None) -> bool:
+            started = time.perf_counter()
+            succeeded = super().execute_task(task, worker)
+            elapsed = time.perf_counter() - started
+            with durations_lock:
+                durations.append(elapsed)
+            bus.send_message(
+                task.assigned_to.value, "ai-ceo",
+                "task_completed" if succeeded else "task_failed",
+                {"task_id": task.id, "project": task.project, "result": task.result}
+            )
+            return succeeded
+
+    roles = [role.value for role in acs.AgentRole]
+    # 再試行の待ち時間も擬似バックエンドの遅延と同じ倍率で縮める
+    default_retry, role_retries = load_retry_policies()
+    # タスク単位のログは大量になるため負荷試験中は抑制する（失敗・スキップ件数は結果に集計）
+    previous_disable = logging.root.manager.disable
+    logging.disable(logging.ERROR)
+    try:
+        system = LoadTestSystem(
+            str(workspace),
+            worker_instances={role: workers_per_role for role in roles},
+            backend=backend,
+            admission=AdmissionController(max_concurrency=max_concurrency),
+            use_response_cache=False,
+            default_retry_policy=default_retry.scaled(time_scale),
+            retry_policies={role: policy.scaled(time_scale) for role, policy in role_retries.items()},
+            tracer=tracer
+        )
+        # バスのメトリクスもシステムと同じレジストリで公開する
+        # 完了報告は試験の最後にまとめて数えるため、CEO のメールボックスは容量を無制限にする
+        bus = message_bus.AIMessageBus(str(workspace), verbose=False, metrics=system.metrics,
+                                       quotas={"ai-ceo": MailboxQuota()})
+        server = system.serve_metrics(metrics_port) if metrics_port is not None else None
+
+        started = time.perf_counter()
+        names = [f"load-{i:05d}" for i in range(projects)]
+        for name in names:
+            system.create_project(name, project_type)
+        created = time.perf_counter()
+
+        try:
+            stats = system.execute_projects(names, show_progress=False)
+        finally:
+            if server is not None:
+                server.stop()
+        finished = time.perf_counter()
+    finally:
+        logging.disable(previous_disable)
+
+    reports = len(bus.get_messages("ai-ceo"))
+    # 完了・失敗のどちらにも至らなかったタスク（ワーカーの取りこぼし）
+    unfinished = sum(1 for task in system.tasks
+                     if task.status in (acs.TaskStatus.PENDING, acs.TaskStatus.IN_PROGRESS))
+    files_written, bytes_written = _directory_size(workspace / "workspace" / "projects")
+    durations.sort()
+    execution_time = finished - created
+    result = {
+        "projects": projects,
+        "project_type": project_type,
+        "seed": seed,
+        "tasks": len(system.tasks),
+        "completed": stats["completed"],
+        "failed": stats["failed"],
+        "blocked": stats["blocked"],
+        "unfinished": unfinished,
+        "stolen": stats["stolen"],
+        "workers": stats["workers"],
+        "create_seconds": created - started,
+        "execute_seconds": execution_time,
+        "throughput": stats["completed"] / execution_time if execution_time > 0 else 0.0,
+        "task_latency": {
+            "p50": percentile(durations, 50),
+            "p95": percentile(durations, 95),
+            "p99": percentile(durations, 99),
+            "max": durations[-1] if durations else 0.0
+        },
+        "backend_calls": backend.calls,
+        "backend_failures": backend.failures,
+        "backend_retries": system.backend.retries,
+        "simulated_seconds": backend.simulated_seconds,
+        "messages": reports,
+        "files_written": files_written,
+        "bytes_written": bytes_written,
+        "workspace": str(workspace)
+    }
+
+    if not keep_workspace and workspace_dir is None:
+        shutil.rmtree(workspace, ignore_errors=True)
+        result["workspace"] = None
+    return result
+
+def _print_result(result: Dict):
+    latency = result["task_latency"]
+    print("\n" + "="*60)
+    print(f"🧪 LOAD TEST: {result['projects']} x {result['project_type']} (seed {result['seed']})")
+    print("="*60)
+    print(f"👷 Workers: {result['workers']}")
+    print(f"📋 Tasks: {result['tasks']} (✅ {result['completed']} / ❌ {result['failed']} / ⛔ {result['blocked']}, stolen {result['stolen']})")
+    print(f"⏱️  Create: {result['create_seconds']:.2f}s, execute: {result['execute_seconds']:.2f}s "
+          f"({result['throughput']:.1f} tasks/s)")
+    print(f"📈 Task latency: p50 {latency['p50'] * 1000:.1f}ms, p95 {latency['p95'] * 1000:.1f}ms, "
+          f"p99 {latency['p99'] * 1000:.1f}ms, max {latency['max'] * 1000:.1f}ms")
+    print(f"🤖 Backend: {result['backend_calls']} calls, {result['backend_failures']} failures, "
+          f"{result['backend_retries']} rate-limit retries, {result['simulated_seconds']:.1f}s simulated")
+    print(f"📨 Messages: {result['messages']}")
+    print(f"📁 Files: {result['files_written']} ({result['bytes_written'] / 1024 / 1024:.1f} MiB)")
+    if result["unfinished"]:
+        print(f"⚠️  Unfinished tasks: {result['unfinished']}")
+    if result["workspace"]:
+        print(f"📂 Workspace: {result['workspace']}")
+    print("="*60 + "\n")
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Offline load test with a simulated agent backend")
+    parser.add_argument("--projects", type=int, default=100, help="number of projects to create")
+    parser.add_argument("--type", dest="project_type", default="web-app", help="project type")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latency", choices=LATENCY_DISTRIBUTIONS, default="lognormal")
+    parser.add_argument("--latency-mean", type=float, default=0.5, help="mean simulated latency (seconds)")
+    parser.add_argument("--latency-sigma", type=float, default=0.5)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--output-min", type=int, default=500, help="minimum artifact size (chars)")
+    parser.add_argument("--output-max", type=int, default=4000, help="maximum artifact size (chars)")
+    parser.add_argument("--time-scale", type=float, default=0.01,
+                        help="real seconds slept per simulated second (0 disables sleeping)")
+    parser.add_argument("--workers-per-role", type=int, default=32)
+    parser.add_argument("--max-concurrency", type=int, default=256)
+    parser.add_argument("--workspace", help="workspace directory (default: temporary, removed afterwards)")
+    parser.add_argument("--keep", action="store_true", help="keep the temporary workspace")
+    parser.add_argument("--json", action="store_true", help="print the result as JSON")
+    parser.add_argument("--trace", help="write a Chrome trace of the run to this file")
+    parser.add_argument("--metrics-port", type=int, help="serve Prometheus metrics on this port during the run")
+    add_profile_arguments(parser)
+    args = parser.parse_args(argv)
+
+    tracer = Tracer(enabled=True) if args.trace else None
+    result = run_profiled(args, lambda: run_load_test(
+        projects=args.projects, project_type=args.project_type, seed=args.seed,
+        latency=args.latency, latency_mean=args.latency_mean, latency_sigma=args.latency_sigma,
+        failure_rate=args.failure_rate, rate_limit_rate=args.rate_limit_rate,
+        output_size=(args.output_min, args.output_max), time_scale=args.time_scale,
+        workers_per_role=args.workers_per_role, max_concurrency=args.max_concurrency,
+        workspace_dir=args.workspace, keep_workspace=args.keep, tracer=tracer,
+        metrics_port=args.metrics_port
+    ), tracer=tracer)
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        _print_result(result)
+    if tracer is not None:
+        tracer.export_chrome_trace(args.trace)
+        if not args.json:
+            tracer.print_summary()
+            print(f"🔍 Trace saved to: {args.trace}")
+    if result["unfinished"]:
+        print(f"❌ {result['unfinished']} tasks never finished", file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+AI Organization Logging
+キュー経由の非同期ロギング（整形・出力はバックグラウンドスレッド）、JSON構造化ログ、イベント単位のサンプリング
+
+環境変数:
+    AI_ORG_LOG_FORMAT  text（既定） / json
+    AI_ORG_LOG_LEVEL   INFO（既定） / DEBUG / WARNING ...
+    AI_ORG_LOG_SAMPLE  イベントごとの出力率（例: message_sent=0.01,task_progress=0）
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+from datetime import datetime
+from typing import Dict, Optional, TextIO
+
+TEXT_FORMAT = '%(asctime)s - [%(levelname)s] %(message)s'
+
+# LogRecord の標準属性（これ以外は extra として JSON に含める）
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+class JsonFormatter(logging.Formatter):
+    """1行1レコードのJSON（extra で渡したフィールドも含める）"""
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "thread": record.threadName,
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_"):
+                data[key] = value
+        if record.exc_info:
+            data["exception"] = self.formatException(record.exc_info)
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+class SamplingFilter(logging.Filter):
+    """
+    extra={"event": ...} を持つレコードをイベントごとの率で間引く（0で出力しない）
+    WARNING 以上は常に通す。呼び出し側のスレッドで判定するため、捨てるレコードはキューにも入らない
+    """
+    def __init__(self, rates: Optional[Dict[str, float]] = None):
+        super().__init__()
+        self.rates = dict(rates or {})
+        self._counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        event = getattr(record, "event", None)
+        if event is None or record.levelno >= logging.WARNING:
+            return True
+        rate = self.rates.get(event)
+        if rate is None or rate >= 1.0:
+            return True
+        if rate <= 0.0:
+            return False
+        with self._lock:
+            count = self._counts.get(event, 0)
+            self._counts[event] = count + 1
+        # 1/rate 件に1件を決定的に残す
+        return count % max(int(round(1.0 / rate)), 1) == 0
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """整形をリスナースレッドに任せる QueueHandler（標準実装は呼び出し側で format する）"""
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.args:
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_handler: Optional[logging.Handler] = None
+_lock = threading.Lock()
+
+def parse_sample_rates(spec: str) -> Dict[str, float]:
+    """"event=rate,event=rate" 形式を辞書に変換"""
+    rates = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        event, _, rate = item.partition("=")
+        rates[event.strip()] = float(rate)
+    return rates
+
+def parse_level(name: str) -> Optional[int]:
+    """ログレベル名（INFO / debug など）または数値をレベルに変換（不明なら None）"""
+    name = name.strip()
+    if name.isdigit():
+        return int(name)
+    # 未登録の名前には "Level XXX" という文字列が返る
+    level = logging.getLevelName(name.upper())
+    return level if isinstance(level, int) else None
+
+def configure_logging(fmt: str = "text", level: int = logging.INFO, stream: Optional[TextIO] = None,
+                      filename: Optional[str] = None, sample_rates: Optional[Dict[str, float]] = None,
+                      queued: bool = True) -> logging.Handler:
+    """
+    ルートロガーを設定（既存の設定は置き換える）
+    queued=True ではレコードをキューに入れるだけで戻り、整形・出力はバックグラウンドスレッドで行う
+    """
+    global _listener, _handler
+    with _lock:
+        _stop_listener()
+
+        output = logging.FileHandler(filename) if filename else logging.StreamHandler(stream or sys.stderr)
+        output.setFormatter(JsonFormatter() if fmt == "json" else logging.Formatter(TEXT_FORMAT))
+
+        if queued:
+            records: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+            handler: logging.Handler = _DeferredQueueHandler(records)
+            _listener = logging.handlers.QueueListener(records, output, respect_handler_level=True)
+            _listener.start()
+        else:
+            handler = output
+        handler.addFilter(SamplingFilter(sample_rates))
+
+        root = logging.getLogger()
+        if _handler is not None and _handler in root.handlers:
+            root.removeHandler(_handler)
+        root.addHandler(handler)
+        root.setLevel(level)
+        _handler = handler
+        return handler
+
+def ensure_logging() -> bool:
+    """ルートロガーが未設定なら環境変数に従って設定（basicConfig と同様、設定済みなら何もしない）"""
+    if logging.getLogger().handlers:
+        return False
+    level_name = os.environ.get("AI_ORG_LOG_LEVEL", "INFO")
+    level = parse_level(level_name)
+    configure_logging(
+        fmt=os.environ.get("AI_ORG_LOG_FORMAT", "text"),
+        level=logging.INFO if level is None else level,
+        sample_rates=parse_sample_rates(os.environ.get("AI_ORG_LOG_SAMPLE", ""))
+    )
+    if level is None:
+        logging.getLogger("ai_org").warning(f"⚠️ Unknown AI_ORG_LOG_LEVEL '{level_name}', using INFO")
+    return True
+
+def flush_logging():
+    """キューに残ったレコードを全て出力（リスナーは再起動する）"""
+    with _lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener.start()
+
+def _stop_listener():
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+def shutdown_logging():
+    """リスナースレッドを停止（キューに残ったレコードは出力してから止まる）"""
+    with _lock:
+        _stop_listener()
+
+atexit.register(shutdown_logging)
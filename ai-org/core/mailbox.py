@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+AI Organization Mailbox Quotas
+エージェントごとのメールボックス容量（件数・バイト数）と、満杯時の動作（待つ / 拒否する）
+"""
+
+import json
+from dataclasses import dataclass, fields, replace
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+DEFAULT_ORGANIZATION_FILE = Path(__file__).resolve().parent.parent / "config" / "organization.json"
+ON_FULL = ("block", "reject")
+
+class MailboxFullError(Exception):
+    """宛先のメールボックスが満杯（拒否された、または待ち時間内に空かなかった）"""
+    def __init__(self, agent: str, messages: int, size: int, reason: str):
+        super().__init__(f"Mailbox of {agent} is full ({messages} messages, {size} bytes): {reason}")
+        self.agent = agent
+        self.messages = messages
+        self.size = size
+
+@dataclass(frozen=True)
+class MailboxQuota:
+    # None は無制限
+    max_messages: Optional[int] = None
+    max_bytes: Optional[int] = None
+    on_full: str = "block"
+    # block のときの最大待ち時間（秒。None で空くまで待つ）
+    timeout: Optional[float] = 30.0
+
+    def __post_init__(self):
+        if self.on_full not in ON_FULL:
+            raise ValueError(f"Unknown on_full '{self.on_full}' (choose from {', '.join(ON_FULL)})")
+
+    @property
+    def unlimited(self) -> bool:
+        return self.max_messages is None and self.max_bytes is None
+
+    def fits(self, messages: int, size: int, message_size: int) -> bool:
+        """現在 messages 件 / size バイトのメールボックスに message_size バイトのメッセージが入るか"""
+        if self.max_messages is not None and messages + 1 > self.max_messages:
+            return False
+        return self.max_bytes is None or size + message_size <= self.max_bytes
+
+    def too_large(self, message_size: int) -> bool:
+        """空のメールボックスにも入らない大きさか"""
+        return self.max_bytes is not None and message_size > self.max_bytes
+
+    @classmethod
+    def from_dict(cls, data: Dict, base: Optional["MailboxQuota"] = None) -> "MailboxQuota":
+        """設定辞書から生成（未指定の項目は base を引き継ぐ）"""
+        known = {f.name for f in fields(cls)}
+        unknown = set(data) - known
+        if unknown:
+            raise ValueError(f"Unknown mailbox quota fields: {', '.join(sorted(unknown))}")
+        return replace(base or cls(), **data)
+
+def load_mailbox_quotas(organization_file: Optional[str] = None) -> Tuple[MailboxQuota, Dict[str, MailboxQuota]]:
+    """organization.json の mailboxes 設定を読む（既定の容量, エージェント別の容量）"""
+    path = Path(organization_file) if organization_file else DEFAULT_ORGANIZATION_FILE
+    try:
+        with open(path, 'r') as f:
+            config = json.load(f).get("mailboxes", {})
+    except FileNotFoundError:
+        config = {}
+    default = MailboxQuota.from_dict(config.get("default", {}))
+    agents = {agent: MailboxQuota.from_dict(data, default) for agent, data in config.get("agents", {}).items()}
+    return default, agents
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+AI Organization Persona Registry
+personas/ 配下のペルソナ定義を読み込み、スキル -> エージェントの転置インデックスでタスクをルーティング
+"""
+
+import hashlib
+import json
+import math
+import os
+import re
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+_yaml = False  # 未読み込み
+
+def _yaml_module():
+    """PyYAML を初回のみ読み込む（オプション。ペルソナ定義は簡易パーサで読める形式）"""
+    global _yaml
+    if _yaml is False:
+        try:
+            import yaml
+        except ImportError:
+            yaml = None
+        _yaml = yaml
+    return _yaml
+
+AI_ORG_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_PERSONAS_DIR = AI_ORG_DIR / "personas"
+DEFAULT_ORGANIZATION_FILE = AI_ORG_DIR / "config" / "organization.json"
+
+# フィールドごとの重み（専門性 > 得意分野 > 責務）
+FIELD_WEIGHTS = {
+    "expertise": 3.0,
+    "specialties": 2.0,
+    "capabilities": 2.0,
+    "responsibilities": 1.0,
+    "role": 1.0,
+}
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset({
+    "a", "an", "and", "the", "of", "for", "to", "in", "on", "with", "by", "as",
+    "is", "are", "be", "all", "into", "from", "using", "ai", "e", "g",
+})
+
+def tokenize(text: str) -> List[str]:
+    """スキル照合用のトークン化（小文字化・簡易ステミング）"""
+    tokens = []
+    for token in _TOKEN_RE.findall(text.lower()):
+        if token in _STOPWORDS:
+            continue
+        if len(token) > 5 and token.endswith("ing"):
+            token = token[:-3]
+        elif len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+def _parse_scalar(value: str):
+    value = value.strip()
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'":
+        return value[1:-1]
+    return value
+
+def _strip_comment(line: str) -> str:
+    """引用符の外にある # 以降（行頭または空白の直後）を取り除く"""
+    quote = None
+    escaped = False
+    for i, ch in enumerate(line):
+        if quote is not None:
+            if escaped:
+                escaped = False
+            elif ch == "\\" and quote == '"':
+                escaped = True
+            elif ch == quote:
+                quote = None
+        elif ch in "\"'" and line[:i].rstrip()[-1:] in ("", ":", "-", "[", ","):
+            # スカラーの先頭の引用符だけを引用とみなす（Bob's などの ' は対象外）
+            quote = ch
+        elif ch == "#" and (i == 0 or line[i - 1] in " \t"):
+            return line[:i]
+    return line
+
+def parse_simple_yaml(text: str) -> Dict:
+    """ペルソナ定義用の簡易YAMLパーサ（スカラー・ブロックリスト・インラインリストのみ）"""
+    data: Dict = {}
+    current_list: Optional[List] = None
+    for raw_line in text.splitlines():
+        line = _strip_comment(raw_line).rstrip()
+        if not line.strip() or line.lstrip().startswith("#"):
+            continue
+        stripped = line.strip()
+        if stripped.startswith("- ") and current_list is not None:
+            current_list.append(_parse_scalar(stripped[2:]))
+            continue
+        key, sep, value = stripped.partition(":")
+        if not sep:
+            raise ValueError(f"Unsupported YAML line: {raw_line!r}")
+        key, value = key.strip(), value.strip()
+        if not value:
+            current_list = data[key] = []
+        elif value.startswith("[") and value.endswith("]"):
+            inner = value[1:-1].strip()
+            data[key] = [_parse_scalar(v) for v in inner.split(",")] if inner else []
+            current_list = None
+        else:
+            data[key] = _parse_scalar(value)
+            current_list = None
+    return data
+
+def _as_list(value) -> List[str]:
+    if value is None:
+        return []
+    if isinstance(value, list):
+        return [str(v) for v in value]
+    return [str(value)]
+
+@dataclass
+class Persona:
+    agent_id: str
+    name: str
+    role: str
+    path: Optional[str]
+    expertise: List[str] = field(default_factory=list)
+    responsibilities: List[str] = field(default_factory=list)
+    specialties: List[str] = field(default_factory=list)
+    content_hash: str = ""
+    data: Dict = field(default_factory=dict)
+
+def load_persona(path: Path) -> Persona:
+    """ペルソナYAMLを1ファイル読み込み"""
+    with open(path, 'rb') as f:
+        raw = f.read()
+    text = raw.decode("utf-8")
+    yaml = _yaml_module()
+    data = yaml.safe_load(text) if yaml is not None else parse_simple_yaml(text)
+    if not isinstance(data, dict):
+        raise ValueError(f"Persona file {path} must contain a mapping")
+    return Persona(
+        agent_id=path.stem,
+        name=str(data.get("name", path.stem)),
+        role=str(data.get("role", "")),
+        path=str(path),
+        expertise=_as_list(data.get("expertise")),
+        responsibilities=_as_list(data.get("responsibilities")),
+        specialties=_as_list(data.get("specialties")),
+        content_hash=hashlib.sha256(raw).hexdigest(),
+        data=data
+    )
+
+class PersonaRegistry:
+    """ペルソナのキャッシュ（mtimeで無効化）とスキル転置インデックス"""
+    def __init__(self, personas_dir: Optional[str] = None, organization_file: Optional[str] = None,
+                 extra_capabilities: Optional[Dict[str, Iterable[str]]] = None,
+                 check_interval: float = 1.0):
+        self.personas_dir = Path(personas_dir) if personas_dir else DEFAULT_PERSONAS_DIR
+        self.organization_file = Path(organization_file) if organization_file else DEFAULT_ORGANIZATION_FILE
+        self.extra_capabilities = {agent: list(caps) for agent, caps in (extra_capabilities or {}).items()}
+        self.check_interval = check_interval
+
+        # path -> ((mtime_ns, size), Persona)
+        self._files: Dict[str, Tuple[Tuple[int, int], Persona]] = {}
+        self._org_signature: Optional[Tuple[int, int]] = None
+        self._org_agents: List[str] = []
+        self._personas: Dict[str, Persona] = {}
+        self._index: Dict[str, Dict[str, float]] = {}
+        self._last_check = float("-inf")
+
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        found = {}
+        stack = [str(self.personas_dir)]
+        while stack:
+            try:
+                entries = list(os.scandir(stack.pop()))
+            except FileNotFoundError:
+                continue
+            for entry in entries:
+                if entry.is_dir():
+                    stack.append(entry.path)
+                elif entry.name.endswith((".yaml", ".yml")):
+                    stat = entry.stat()
+                    found[entry.path] = (stat.st_mtime_ns, stat.st_size)
+        return found
+
+    def _load_organization_agents(self) -> bool:
+        """organization.json に定義された全エージェントを取得（変更時のみ）"""
+        try:
+            stat = os.stat(self.organization_file)
+        except FileNotFoundError:
+            changed = bool(self._org_agents)
+            self._org_signature, self._org_agents = None, []
+            return changed
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if signature == self._org_signature:
+            return False
+        with open(self.organization_file, 'r') as f:
+            structure = json.load(f).get("structure", {})
+        agents = list(structure.get("leadership", []))
+        for members in structure.get("departments", {}).values():
+            agents.extend(members)
+        self._org_signature, self._org_agents = signature, agents
+        return True
+
+    def refresh(self, force: bool = False) -> bool:
+        """変更されたファイルのみ再読み込みし、必要ならインデックスを再構築"""
+        now = time.monotonic()
+        if not force and now - self._last_check < self.check_interval:
+            return False
+        self._last_check = now
+
+        changed = self._load_organization_agents()
+        found = self._scan()
+        for path in list(self._files):
+            if path not in found:
+                del self._files[path]
+                changed = True
+        for path, signature in found.items():
+            cached = self._files.get(path)
+            if cached is None or cached[0] != signature:
+                self._files[path] = (signature, load_persona(Path(path)))
+                changed = True
+
+        if changed or not self._personas:
+            self._rebuild()
+        return changed
+
+    def _rebuild(self):
+        personas = {persona.agent_id: persona for _, persona in self._files.values()}
+        for agent_id in list(self._org_agents) + list(self.extra_capabilities):
+            if agent_id not in personas:
+                personas[agent_id] = Persona(agent_id=agent_id, name=agent_id, role="", path=None)
+
+        # 転置インデックス（重み付き出現回数）
+        postings: Dict[str, Dict[str, float]] = {}
+        for agent_id, persona in personas.items():
+            fields = {
+                "expertise": persona.expertise,
+                "specialties": persona.specialties,
+                "responsibilities": persona.responsibilities,
+                "role": [persona.role],
+                "capabilities": self.extra_capabilities.get(agent_id, []),
+            }
+            for field_name, values in fields.items():
+                weight = FIELD_WEIGHTS[field_name]
+                for value in values:
+                    for token in tokenize(value):
+                        agents = postings.setdefault(token, {})
+                        agents[agent_id] = agents.get(agent_id, 0.0) + weight
+
+        # IDFを事前に掛け込んでおき、ルーティング時は加算のみ
+        total = max(len(personas), 1)
+        for agents in postings.values():
+            idf = math.log(1.0 + total / len(agents))
+            for agent_id in agents:
+                agents[agent_id] *= idf
+
+        self._personas = personas
+        self._index = postings
+
+    def personas(self) -> Dict[str, Persona]:
+        """全ペルソナ（組織定義のみでファイルのないエージェントを含む）"""
+        self.refresh()
+        return self._personas
+
+    def get(self, agent_id: str) -> Optional[Persona]:
+        """エージェントのペルソナを取得"""
+        return self.personas().get(agent_id)
+
+    def agents_with_skill(self, skill: str) -> List[str]:
+        """スキルを持つエージェント一覧"""
+        self.refresh()
+        scores: Dict[str, float] = {}
+        for token in tokenize(skill):
+            for agent_id, weight in self._index.get(token, {}).items():
+                scores[agent_id] = scores.get(agent_id, 0.0) + weight
+        return sorted(scores, key=lambda a: -scores[a])
+
+    def route(self, text: str, candidates: Optional[Iterable[str]] = None, limit: int = 3) -> List[Tuple[str, float]]:
+        """タスク記述に最も適合するエージェントをスコア順に返す"""
+        self.refresh()
+        allowed = set(candidates) if candidates is not None else None
+        scores: Dict[str, float] = {}
+        for token in set(tokenize(text)):
+            for agent_id, weight in self._index.get(token, {}).items():
+                if allowed is None or agent_id in allowed:
+                    scores[agent_id] = scores.get(agent_id, 0.0) + weight
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return ranked[:limit]
+
+    def best_agent(self, text: str, candidates: Optional[Iterable[str]] = None) -> Optional[str]:
+        """最適なエージェントを1つ返す（該当なしは None）"""
+        ranked = self.route(text, candidates, limit=1)
+        return ranked[0][0] if ranked else None
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+AI Organization Profiling
+--profile 用の CPU プロファイル（cProfile、ワーカースレッドを含む）とメモリ割り当て追跡（tracemalloc）
+"""
+
+import cProfile
+import io
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from typing import List, Optional
+
+from core.tracing import Tracer
+
+# Python 3.12 以降の cProfile は sys.monitoring を使い、1つのプロファイラで全スレッドを計測する
+# （スレッドごとに別のプロファイラを有効にしようとすると "Another profiling tool is already active" になる）
+PROFILES_ALL_THREADS = hasattr(sys, "monitoring")
+
+class Profiler:
+    """
+    with Profiler() as profiler: ... で計測し、profiler.report() でレポートを得る
+    tracer を渡すと、そのスパンから役割別の所要時間も集計する
+    """
+    def __init__(self, top: int = 25, frames: int = 10, tracer: Optional[Tracer] = None):
+        self.top = top
+        self.frames = frames
+        self.tracer = tracer
+        self._profile = cProfile.Profile()
+        self._thread_profiles: List[cProfile.Profile] = []
+        self._lock = threading.Lock()
+        self.stats: Optional[pstats.Stats] = None
+        self.snapshot: Optional[tracemalloc.Snapshot] = None
+        self.peak_memory = 0
+        self.elapsed = 0.0
+        self._started = 0.0
+
+    def _profile_thread(self, frame, event, arg):
+        """新しいスレッドの最初のイベントでそのスレッド専用のプロファイラを有効化"""
+        profile = cProfile.Profile()
+        with self._lock:
+            self._thread_profiles.append(profile)
+        profile.enable()
+
+    def start(self):
+        tracemalloc.start(self.frames)
+        if not PROFILES_ALL_THREADS:
+            threading.setprofile(self._profile_thread)
+        self._started = time.perf_counter()
+        self._profile.enable()
+
+    def stop(self):
+        self._profile.disable()
+        self.elapsed = time.perf_counter() - self._started
+        if not PROFILES_ALL_THREADS:
+            threading.setprofile(None)
+        self.peak_memory = tracemalloc.get_traced_memory()[1]
+        self.snapshot = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ])
+        tracemalloc.stop()
+
+        self.stats = pstats.Stats(self._profile)
+        with self._lock:
+            for profile in self._thread_profiles:
+                try:
+                    self.stats.add(profile)
+                except TypeError:
+                    # イベントを1件も記録しなかったスレッド
+                    continue
+
+    def __enter__(self) -> "Profiler":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
+
+    def dump(self, path: str):
+        """pstats 形式で保存（snakeviz などで表示可能）"""
+        self.stats.dump_stats(path)
+
+    def _function_report(self, sort: str) -> str:
+        if self.stats is None:
+            return ""
+        stream = io.StringIO()
+        self.stats.stream = stream
+        self.stats.sort_stats(sort).print_stats(self.top)
+        # pstats のヘッダー部分（ファイル名など）を省く
+        lines = stream.getvalue().splitlines()
+        start = next((i for i, line in enumerate(lines) if line.lstrip().startswith("ncalls")), 0)
+        return "\n".join(lines[start:])
+
+    def _role_report(self) -> List[str]:
+        if self.tracer is None:
+            return []
+        summary = {name: entry for name, entry in self.tracer.summary(group_by="role").items()
+                   if name.startswith("execute_task [")}
+        if not summary:
+            return []
+        lines = ["", "👤 Time by role (execute_task spans)"]
+        for name, entry in summary.items():
+            role = name[len("execute_task ["):-1]
+            share = entry["total"] / self.elapsed * 100 if self.elapsed else 0.0
+            lines.append(f"  {role:<14} {int(entry['count']):>6} tasks  total {entry['total'] * 1000:>10.1f}ms  "
+                         f"mean {entry['mean'] * 1000:>8.2f}ms  max {entry['max'] * 1000:>8.2f}ms  ({share:.0f}% of wall)")
+        phases = {name: entry for name, entry in self.tracer.summary().items() if name != "execute_task"}
+        if phases:
+            lines.append("")
+            lines.append("🧩 Time by phase")
+            for name, entry in phases.items():
+                lines.append(f"  {name:<16} {int(entry['count']):>6}  total {entry['total'] * 1000:>10.1f}ms  "
+                             f"mean {entry['mean'] * 1000:>8.2f}ms")
+        return lines
+
+    def report(self) -> str:
+        """役割別・関数別の時間と、割り当ての多い箇所のレポート"""
+        lines = ["=" * 60, f"🔬 PROFILE REPORT ({self.elapsed:.2f}s wall, peak memory {self.peak_memory / 1024 / 1024:.1f} MiB)",
+                 "=" * 60]
+        lines.extend(self._role_report())
+        lines.append("")
+        lines.append(f"⏱️  Top {self.top} functions by cumulative time")
+        lines.append(self._function_report("cumulative"))
+        lines.append("")
+        lines.append(f"⏱️  Top {self.top} functions by own time")
+        lines.append(self._function_report("tottime"))
+        if self.snapshot is not None:
+            lines.append("")
+            lines.append(f"💾 Top {self.top} allocation sites (live at end of run)")
+            for stat in self.snapshot.statistics("lineno")[:self.top]:
+                frame = stat.traceback[0]
+                lines.append(f"  {stat.size / 1024:>10.1f} KiB  {stat.count:>7} blocks  {frame.filename}:{frame.lineno}")
+        lines.append("=" * 60)
+        return "\n".join(lines) + "\n"
+
+def add_profile_arguments(parser):
+    """--profile / --profile-output / --profile-top を argparse に追加"""
+    parser.add_argument("--profile", action="store_true", help="profile CPU time and allocations of the run")
+    parser.add_argument("--profile-output", metavar="FILE", help="also save raw pstats data to FILE")
+    parser.add_argument("--profile-top", type=int, default=25, help="number of entries per report section")
+
+def run_profiled(args, function, tracer: Optional[Tracer] = None):
+    """args.profile が指定されていれば function をプロファイル付きで実行してレポートを表示"""
+    if not getattr(args, "profile", False):
+        return function()
+    profiler = Profiler(top=args.profile_top, tracer=tracer)
+    with profiler:
+        result = function()
+    print(profiler.report())
+    if args.profile_output:
+        profiler.dump(args.profile_output)
+        print(f"💾 Profile data saved to: {args.profile_output}")
+    return result
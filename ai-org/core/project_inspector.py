@@ -0,0 +1,497 @@
+#!/usr/bin/env python3
+"""
+AI Organization Project Inspector
+ローカルのチェックアウトを並列に走査し、言語・フレームワーク・マニフェスト・LOC からプロジェクトタイプとチーム構成を推定する
+走査結果（パス・サイズ・更新時刻）のハッシュをキーに解析結果をキャッシュし、変更のないリポジトリはファイルを読まずに返す
+"""
+
+import argparse
+import fnmatch
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from core.workflow import WorkflowRegistry
+
+# 走査しないディレクトリ（ignore ファイルがなくても除外）
+DEFAULT_IGNORED_DIRS = frozenset({
+    ".git", ".hg", ".svn", "node_modules", "__pycache__", ".venv", "venv", ".tox", ".mypy_cache",
+    ".pytest_cache", ".next", ".nuxt", "dist", "build", "target", "vendor", "coverage", ".idea", ".vscode"
+})
+IGNORE_FILES = (".gitignore", ".ignore")
+# これより大きいファイルは LOC を数えない（生成物・データとみなす）
+MAX_SOURCE_BYTES = 2 * 1024 * 1024
+
+LANGUAGES = {
+    ".py": "Python", ".js": "JavaScript", ".mjs": "JavaScript", ".cjs": "JavaScript", ".jsx": "JavaScript",
+    ".ts": "TypeScript", ".tsx": "TypeScript", ".vue": "Vue", ".svelte": "Svelte",
+    ".html": "HTML", ".htm": "HTML", ".css": "CSS", ".scss": "CSS", ".sass": "CSS", ".less": "CSS",
+    ".go": "Go", ".rs": "Rust", ".java": "Java", ".kt": "Kotlin", ".scala": "Scala", ".rb": "Ruby",
+    ".php": "PHP", ".cs": "C#", ".c": "C", ".h": "C", ".cc": "C++", ".cpp": "C++", ".hpp": "C++",
+    ".swift": "Swift", ".dart": "Dart", ".sh": "Shell", ".bash": "Shell", ".sql": "SQL",
+}
+FRONTEND_LANGUAGES = frozenset({"HTML", "CSS", "Vue", "Svelte"})
+
+# ファイル名 -> マニフェストの種類
+MANIFESTS = {
+    "package.json": "npm", "requirements.txt": "pip", "pyproject.toml": "python", "setup.py": "python",
+    "setup.cfg": "python", "Pipfile": "pipenv", "go.mod": "go", "Cargo.toml": "cargo", "pom.xml": "maven",
+    "build.gradle": "gradle", "build.gradle.kts": "gradle", "Gemfile": "bundler", "composer.json": "composer",
+    "pubspec.yaml": "dart", "Dockerfile": "docker", "docker-compose.yml": "docker-compose",
+    "docker-compose.yaml": "docker-compose", "compose.yaml": "docker-compose", "Makefile": "make",
+}
+TEST_CONFIGS = (
+    "pytest.ini", "tox.ini", "noxfile.py", "conftest.py", "jest.config.*", "vitest.config.*", "karma.conf.*",
+    "cypress.config.*", "cypress.json", "playwright.config.*", ".mocharc*", "phpunit.xml*",
+)
+CI_PATTERNS = (".github/workflows/*", ".gitlab-ci.yml", ".circleci/config.yml", "Jenkinsfile", "azure-pipelines.yml")
+
+# エコシステム -> 依存パッケージ名 -> (フレームワーク名, 分類)
+FRAMEWORKS = {
+    "npm": {
+        "react": ("React", "frontend"), "vue": ("Vue", "frontend"), "@angular/core": ("Angular", "frontend"),
+        "svelte": ("Svelte", "frontend"), "next": ("Next.js", "frontend"), "nuxt": ("Nuxt", "frontend"),
+        "express": ("Express", "backend"), "fastify": ("Fastify", "backend"), "koa": ("Koa", "backend"),
+        "@nestjs/core": ("NestJS", "backend"), "hono": ("Hono", "backend"),
+        "commander": ("Commander", "cli"), "yargs": ("yargs", "cli"), "oclif": ("oclif", "cli"),
+    },
+    "python": {
+        "django": ("Django", "backend"), "flask": ("Flask", "backend"), "fastapi": ("FastAPI", "backend"),
+        "starlette": ("Starlette", "backend"), "aiohttp": ("aiohttp", "backend"),
+        "streamlit": ("Streamlit", "frontend"), "click": ("Click", "cli"), "typer": ("Typer", "cli"),
+    },
+    "go": {
+        "github.com/gin-gonic/gin": ("Gin", "backend"), "github.com/labstack/echo": ("Echo", "backend"),
+        "github.com/gofiber/fiber": ("Fiber", "backend"), "github.com/spf13/cobra": ("Cobra", "cli"),
+        "github.com/urfave/cli": ("urfave/cli", "cli"),
+    },
+    "rust": {
+        "actix-web": ("Actix Web", "backend"), "axum": ("Axum", "backend"), "rocket": ("Rocket", "backend"),
+        "clap": ("clap", "cli"),
+    },
+    "ruby": {"rails": ("Rails", "backend"), "sinatra": ("Sinatra", "backend")},
+    "php": {"laravel/framework": ("Laravel", "backend"), "symfony/framework-bundle": ("Symfony", "backend")},
+    "java": {"spring-boot-starter-web": ("Spring Boot", "backend")},
+}
+# マニフェストの種類 -> エコシステム
+ECOSYSTEMS = {
+    "npm": "npm", "pip": "python", "python": "python", "pipenv": "python", "go": "go", "cargo": "rust",
+    "bundler": "ruby", "composer": "php", "maven": "java", "gradle": "java",
+}
+
+DEFAULT_PROJECT_TYPE = "web-app"
+
+def analysis_dir(workspace_dir: str) -> str:
+    return os.path.join(workspace_dir, "cache", "repositories")
+
+def _compile_pattern(pattern: str) -> re.Pattern:
+    """gitignore 形式のグロブを正規表現に変換（** はディレクトリをまたぐ）"""
+    i, parts = 0, []
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            parts.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("/**", i) and i + 3 == len(pattern):
+            parts.append("/.*")
+            i += 3
+        elif pattern[i] == "*":
+            parts.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            parts.append("[^/]")
+            i += 1
+        elif pattern[i] == "[":
+            end = pattern.find("]", i + 1)
+            if end == -1:
+                parts.append(re.escape("["))
+                i += 1
+            else:
+                parts.append(fnmatch.translate(pattern[i:end + 1])[4:-3])
+                i = end + 1
+        else:
+            parts.append(re.escape(pattern[i]))
+            i += 1
+    return re.compile("".join(parts) + r"\Z")
+
+@dataclass(frozen=True)
+class IgnoreRule:
+    base: str
+    regex: re.Pattern
+    negate: bool
+    dir_only: bool
+    anchored: bool
+
+    def matches(self, rel_path: str, is_dir: bool) -> bool:
+        if self.dir_only and not is_dir:
+            return False
+        if self.base:
+            if not rel_path.startswith(self.base + "/"):
+                return False
+            rel_path = rel_path[len(self.base) + 1:]
+        target = rel_path if self.anchored else rel_path.rsplit("/", 1)[-1]
+        return self.regex.match(target) is not None
+
+def parse_ignore_file(path: str, base: str) -> Tuple[IgnoreRule, ...]:
+    """ignore ファイルを読み込む（base はリポジトリルートからの相対ディレクトリ）"""
+    try:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return ()
+    rules = []
+    for line in lines:
+        line = line.rstrip()
+        if not line or line.startswith("#"):
+            continue
+        negate = line.startswith("!")
+        if negate:
+            line = line[1:]
+        if line.startswith("\\"):
+            line = line[1:]
+        dir_only = line.endswith("/")
+        line = line.rstrip("/")
+        anchored = "/" in line
+        line = line.lstrip("/")
+        if line:
+            rules.append(IgnoreRule(base, _compile_pattern(line), negate, dir_only, anchored))
+    return tuple(rules)
+
+def is_ignored(rules: Tuple[IgnoreRule, ...], rel_path: str, is_dir: bool) -> bool:
+    """最後に一致したルールで判定（! は除外の取り消し）"""
+    ignored = False
+    for rule in rules:
+        if rule.matches(rel_path, is_dir):
+            ignored = not rule.negate
+    return ignored
+
+@dataclass
+class RepositoryAnalysis:
+    path: str
+    tree_hash: str
+    files: int = 0
+    bytes: int = 0
+    loc: int = 0
+    # 言語 -> {"files": 件数, "loc": 行数}
+    languages: Dict[str, Dict[str, int]] = field(default_factory=dict)
+    manifests: List[str] = field(default_factory=list)
+    frameworks: List[str] = field(default_factory=list)
+    test_configs: List[str] = field(default_factory=list)
+    ci: List[str] = field(default_factory=list)
+    # 分類 -> 根拠（frontend / backend / cli）
+    signals: Dict[str, List[str]] = field(default_factory=dict)
+    project_type: str = DEFAULT_PROJECT_TYPE
+    roles: List[str] = field(default_factory=list)
+    cached: bool = False
+    elapsed_seconds: float = 0.0
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "RepositoryAnalysis":
+        return cls(**data)
+
+    def primary_languages(self, limit: int = 3) -> List[str]:
+        """LOC の多い順の言語"""
+        ranked = sorted(self.languages.items(), key=lambda item: (-item[1]["loc"], item[0]))
+        return [language for language, _ in ranked[:limit]]
+
+class RepositoryInspector:
+    """ローカルリポジトリの解析（走査とファイル読み込みはスレッドプールで並列化）"""
+    def __init__(self, cache_dir: Optional[str] = None, max_workers: Optional[int] = None):
+        self.cache_dir = cache_dir
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) * 4)
+
+    # --- 走査 ---
+
+    def walk(self, root: str) -> List[Tuple[str, int, int]]:
+        """ignore ファイルを反映して (相対パス, サイズ, 更新時刻ns) を列挙（パス順）"""
+        root = os.path.abspath(root)
+        base_rules = parse_ignore_file(os.path.join(root, ".git", "info", "exclude"), "")
+        entries: List[Tuple[str, int, int]] = []
+        lock = threading.Lock()
+
+        def scan(directory: str, rel_dir: str, rules: Tuple[IgnoreRule, ...]):
+            for name in IGNORE_FILES:
+                rules = rules + parse_ignore_file(os.path.join(directory, name), rel_dir)
+            files, subdirs = [], []
+            try:
+                with os.scandir(directory) as iterator:
+                    for entry in iterator:
+                        rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                if entry.name not in DEFAULT_IGNORED_DIRS and not is_ignored(rules, rel_path, True):
+                                    subdirs.append((entry.path, rel_path, rules))
+                            elif entry.is_file(follow_symlinks=False) and not is_ignored(rules, rel_path, False):
+                                stat = entry.stat(follow_symlinks=False)
+                                files.append((rel_path, stat.st_size, stat.st_mtime_ns))
+                        except OSError:
+                            continue
+            except OSError:
+                pass
+            with lock:
+                entries.extend(files)
+            return subdirs
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="inspect-walk") as pool:
+            pending = {pool.submit(scan, root, "", base_rules)}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    pending.update(pool.submit(scan, *subdir) for subdir in future.result())
+
+        entries.sort()
+        return entries
+
+    @staticmethod
+    def tree_hash(entries: Iterable[Tuple[str, int, int]]) -> str:
+        """走査結果のハッシュ（内容は読まない。内容が変われば通常サイズか更新時刻も変わる）"""
+        digest = hashlib.sha256()
+        for rel_path, size, mtime_ns in entries:
+            digest.update(f"{rel_path}\x00{size}\x00{mtime_ns}\n".encode("utf-8", "surrogateescape"))
+        return digest.hexdigest()
+
+    # --- キャッシュ ---
+
+    def _cache_file(self, tree_hash: str) -> Optional[str]:
+        return os.path.join(self.cache_dir, f"{tree_hash}.json") if self.cache_dir else None
+
+    def _load_cached(self, tree_hash: str) -> Optional[RepositoryAnalysis]:
+        path = self._cache_file(tree_hash)
+        if not path:
+            return None
+        try:
+            with open(path, 'r') as f:
+                return RepositoryAnalysis.from_dict(json.load(f))
+        except (FileNotFoundError, json.JSONDecodeError, TypeError):
+            return None
+
+    def _store(self, analysis: RepositoryAnalysis):
+        path = self._cache_file(analysis.tree_hash)
+        if not path:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, 'w') as f:
+            json.dump(analysis.to_dict(), f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(temporary, path)
+
+    # --- 解析 ---
+
+    def analyze(self, root: str, use_cache: bool = True) -> RepositoryAnalysis:
+        """リポジトリを解析（走査結果が前回と同じならキャッシュを返す）"""
+        started = time.perf_counter()
+        root = os.path.abspath(os.path.expanduser(root))
+        if not os.path.isdir(root):
+            raise NotADirectoryError(f"Not a directory: {root}")
+
+        entries = self.walk(root)
+        tree_hash = self.tree_hash(entries)
+        if use_cache:
+            cached = self._load_cached(tree_hash)
+            if cached is not None:
+                cached.path = root
+                cached.cached = True
+                cached.elapsed_seconds = round(time.perf_counter() - started, 3)
+                return cached
+
+        analysis = RepositoryAnalysis(path=root, tree_hash=tree_hash, files=len(entries),
+                                      bytes=sum(size for _, size, _ in entries))
+        sources = [(rel_path, LANGUAGES[ext]) for rel_path, size, _ in entries
+                   if size <= MAX_SOURCE_BYTES and (ext := os.path.splitext(rel_path)[1].lower()) in LANGUAGES]
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="inspect-loc") as pool:
+            counts = pool.map(lambda source: _count_loc(os.path.join(root, source[0])), sources, chunksize=32)
+            for (_, language), loc in zip(sources, counts):
+                if loc is None:
+                    continue
+                stats = analysis.languages.setdefault(language, {"files": 0, "loc": 0})
+                stats["files"] += 1
+                stats["loc"] += loc
+                analysis.loc += loc
+
+        paths = [rel_path for rel_path, _, _ in entries]
+        analysis.manifests = [p for p in paths if os.path.basename(p) in MANIFESTS]
+        analysis.test_configs = [p for p in paths if any(fnmatch.fnmatch(os.path.basename(p), pattern) for pattern in TEST_CONFIGS)]
+        analysis.ci = [p for p in paths if any(fnmatch.fnmatch(p, pattern) for pattern in CI_PATTERNS)]
+        self._detect_frameworks(root, analysis)
+        analysis.project_type = infer_project_type(analysis)
+        analysis.elapsed_seconds = round(time.perf_counter() - started, 3)
+        if use_cache:
+            self._store(analysis)
+        return analysis
+
+    def _detect_frameworks(self, root: str, analysis: RepositoryAnalysis):
+        """マニフェストの依存関係と言語構成からフレームワークと分類の根拠を集める"""
+        signals: Dict[str, List[str]] = {}
+        frameworks: List[str] = []
+
+        def add(category: str, reason: str):
+            reasons = signals.setdefault(category, [])
+            if reason not in reasons:
+                reasons.append(reason)
+
+        for manifest in analysis.manifests:
+            kind = MANIFESTS[os.path.basename(manifest)]
+            known = FRAMEWORKS.get(ECOSYSTEMS.get(kind), {})
+            dependencies, is_cli = _read_dependencies(os.path.join(root, manifest), kind, known)
+            for dependency in dependencies:
+                if dependency in known:
+                    name, category = known[dependency]
+                    if name not in frameworks:
+                        frameworks.append(name)
+                    add(category, name)
+            if is_cli:
+                add("cli", f"{manifest} entry point")
+
+        frontend_loc = sum(stats["loc"] for language, stats in analysis.languages.items() if language in FRONTEND_LANGUAGES)
+        if frontend_loc and frontend_loc * 5 >= analysis.loc:
+            add("frontend", "HTML/CSS sources")
+
+        analysis.frameworks = sorted(frameworks)
+        analysis.signals = signals
+
+def _count_loc(path: str) -> Optional[int]:
+    """空行を除いた行数（バイナリは None）"""
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except OSError:
+        return None
+    if b"\x00" in data[:8192]:
+        return None
+    return sum(1 for line in data.splitlines() if line.strip())
+
+_REQUIREMENT_NAME = re.compile(r"^\s*([A-Za-z0-9][A-Za-z0-9._-]*)")
+_GO_MAJOR_VERSION = re.compile(r"/v\d+$")
+
+def _read_dependencies(path: str, kind: str, known: Dict[str, Tuple[str, str]]) -> Tuple[List[str], bool]:
+    """マニフェストから依存パッケージ名（小文字）と CLI のエントリポイントの有無を読む"""
+    if kind not in ECOSYSTEMS:
+        return [], False
+    try:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            text = f.read()
+    except OSError:
+        return [], False
+
+    if kind in ("npm", "composer"):
+        try:
+            data = json.loads(text)
+        except json.JSONDecodeError:
+            return [], False
+        if not isinstance(data, dict):
+            return [], False
+        names = []
+        for section in ("dependencies", "devDependencies", "peerDependencies", "require"):
+            if isinstance(data.get(section), dict):
+                names.extend(name.lower() for name in data[section])
+        return names, bool(data.get("bin"))
+    if kind == "pip":
+        return [m.group(1).lower() for line in text.splitlines()
+                if not line.lstrip().startswith(("#", "-")) and (m := _REQUIREMENT_NAME.match(line))], False
+    if kind == "go":
+        names = []
+        for line in text.splitlines():
+            tokens = line.split()
+            if tokens and tokens[0] == "require":
+                tokens = tokens[1:]
+            if tokens and "/" in tokens[0]:
+                names.append(_GO_MAJOR_VERSION.sub("", tokens[0].lower()))
+        return names, False
+
+    # TOML / XML / Ruby は構文解析せず、既知の依存名が名前として現れるかだけを見る
+    lowered = text.lower()
+    names = [name for name in known if re.search(rf"[\"'\s<:/]{re.escape(name)}[\"'\s<>=~\[,]", lowered)]
+    is_cli = (kind == "python" and any(marker in lowered for marker in
+                                        ("[project.scripts]", "[tool.poetry.scripts]", "console_scripts"))) \
+        or (kind == "cargo" and "[[bin]]" in lowered)
+    return names, is_cli
+
+def infer_project_type(analysis: RepositoryAnalysis, available: Optional[Iterable[str]] = None) -> str:
+    """根拠の分類からプロジェクトタイプを選ぶ（available にないタイプは選ばない）"""
+    signals = analysis.signals
+    if "frontend" in signals:
+        candidate = "web-app"
+    elif "backend" in signals:
+        candidate = "api"
+    elif "cli" in signals:
+        candidate = "cli-tool"
+    else:
+        candidate = DEFAULT_PROJECT_TYPE
+    if available is not None and candidate not in set(available):
+        return DEFAULT_PROJECT_TYPE
+    return candidate
+
+def select_roles(analysis: RepositoryAnalysis, plan_roles: Iterable[str]) -> List[str]:
+    """プランの役割から、根拠のない開発レイヤーを外したチーム構成"""
+    signals = analysis.signals
+    roles = list(dict.fromkeys(plan_roles))
+    # フロントエンド・バックエンドの片方にしか根拠がなければ、もう片方は外す
+    if "frontend" in signals and not ("backend" in signals or "cli" in signals):
+        roles = [role for role in roles if role != "ai-backend"]
+    elif ("backend" in signals or "cli" in signals) and "frontend" not in signals:
+        roles = [role for role in roles if role != "ai-frontend"]
+    return roles
+
+def compose_team(analysis: RepositoryAnalysis, registry) -> Tuple[str, List[str]]:
+    """定義済みワークフローからプロジェクトタイプと役割を選んで analysis に設定（registry は WorkflowRegistry）"""
+    analysis.project_type = infer_project_type(analysis, registry.project_types())
+    plan = registry.get_plan(analysis.project_type)
+    analysis.roles = select_roles(analysis, [step.role for step in plan.steps])
+    return analysis.project_type, analysis.roles
+
+def print_analysis(analysis: RepositoryAnalysis):
+    """解析結果を表示"""
+    print("\n" + "="*60)
+    print(f"🔍 Repository: {analysis.path}")
+    print("="*60)
+    source = "cache" if analysis.cached else "scan"
+    print(f"Files: {analysis.files} ({analysis.bytes / 1024:.0f} KiB), LOC: {analysis.loc} "
+          f"[{analysis.elapsed_seconds:.2f}s, {source}]")
+    for language in analysis.primary_languages(limit=len(analysis.languages)):
+        stats = analysis.languages[language]
+        print(f"  {language:<12} {stats['loc']:>8} LOC  {stats['files']:>5} files")
+    if analysis.frameworks:
+        print(f"Frameworks: {', '.join(analysis.frameworks)}")
+    if analysis.manifests:
+        print(f"Manifests: {', '.join(analysis.manifests[:10])}{' ...' if len(analysis.manifests) > 10 else ''}")
+    if analysis.test_configs:
+        print(f"Test configs: {', '.join(analysis.test_configs[:10])}")
+    if analysis.ci:
+        print(f"CI: {', '.join(analysis.ci[:10])}")
+    print(f"Project type: {analysis.project_type}")
+    if analysis.roles:
+        print(f"Team: {', '.join(analysis.roles)}")
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Analyze a local repository and suggest a project type")
+    parser.add_argument("path", help="local checkout")
+    parser.add_argument("--workspace", default=".", help="workspace directory (cache location)")
+    parser.add_argument("--no-cache", action="store_true", help="ignore and do not update the cache")
+    parser.add_argument("--workers", type=int, help="threads used for walking and reading")
+    parser.add_argument("--json", action="store_true", help="print the analysis as JSON")
+    args = parser.parse_args(argv)
+
+    inspector = RepositoryInspector(cache_dir=analysis_dir(args.workspace), max_workers=args.workers)
+    try:
+        analysis = inspector.analyze(args.path, use_cache=not args.no_cache)
+    except NotADirectoryError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    compose_team(analysis, WorkflowRegistry())
+    if args.json:
+        print(json.dumps(analysis.to_dict(), indent=2, ensure_ascii=False))
+    else:
+        print_analysis(analysis)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+AI Organization Queries
+ワークスペース上のファイルを直接読む軽量な参照処理（プロジェクト状態・受信箱）
+CLI の status / inbox から毎回呼ばれるため、標準ライブラリと core.history 以外は読み込まない
+"""
+
+import json
+import os
+from typing import Any, Dict, List, Optional
+
+from core.history import DurationHistory, estimate_eta, history_file
+
+STATUSES = ("pending", "in_progress", "completed", "failed")
+STATUS_ICONS = {"completed": "✅", "in_progress": "🔄", "pending": "⏳", "failed": "❌"}
+
+def tasks_dir(workspace_dir: str) -> str:
+    return os.path.join(workspace_dir, "communication", "tasks")
+
+def projects_dir(workspace_dir: str) -> str:
+    return os.path.join(workspace_dir, "communication", "projects")
+
+def messages_dir(workspace_dir: str) -> str:
+    return os.path.join(workspace_dir, "communication", "messages")
+
+def build_project_status(project_name: str, tasks: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    タスク一覧からプロジェクトの状態を集計（AICollaborativeSystem.get_project_status と同じ形式）
+    tasks の各要素は id, title, assigned_to, status, priority, created_files を持つ
+    """
+    status_count = {status: 0 for status in STATUSES}
+    for task in tasks:
+        status_count[task['status']] += 1
+    completed = status_count["completed"]
+    return {
+        'project': project_name,
+        'total_tasks': len(tasks),
+        'completed_tasks': completed,
+        'success_rate': (completed / len(tasks) * 100) if tasks else 0,
+        'status_breakdown': status_count,
+        'tasks': tasks
+    }
+
+def read_project_index(workspace_dir: str, project_name: str) -> Optional[Dict[str, Any]]:
+    """プロジェクトのインデックス（タイプ・タスクID一覧）。存在しなければ None"""
+    try:
+        with open(os.path.join(projects_dir(workspace_dir), f"{project_name}.json"), 'r') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+def list_projects(workspace_dir: str) -> List[str]:
+    """インデックスのあるプロジェクト名一覧"""
+    try:
+        names = os.listdir(projects_dir(workspace_dir))
+    except FileNotFoundError:
+        return []
+    return sorted(name[:-5] for name in names if name.endswith('.json'))
+
+def read_project_tasks(workspace_dir: str, project_name: str) -> List[Dict[str, Any]]:
+    """プロジェクトのタスクファイルを読み込む（インデックスがなければ全タスクを走査）"""
+    directory = tasks_dir(workspace_dir)
+    index = read_project_index(workspace_dir, project_name)
+    tasks = []
+    if index is not None:
+        for task_id in index['tasks']:
+            try:
+                with open(os.path.join(directory, f"{task_id}.json"), 'r') as f:
+                    tasks.append(json.load(f))
+            except FileNotFoundError:
+                continue
+        return tasks
+
+    try:
+        names = sorted(os.listdir(directory))
+    except FileNotFoundError:
+        return []
+    for name in names:
+        if name.endswith('.json') and f"_{project_name}_" in name:
+            with open(os.path.join(directory, name), 'r') as f:
+                task = json.load(f)
+            if task.get('project') == project_name:
+                tasks.append(task)
+    return sorted(tasks, key=lambda t: t['priority'])
+
+def read_project_status(workspace_dir: str, project_name: str,
+                        history: Optional[DurationHistory] = None) -> Optional[Dict[str, Any]]:
+    """ファイルからプロジェクトの状態を集計（タスクがなければ None。history は複数プロジェクトで共有可能）"""
+    tasks = read_project_tasks(workspace_dir, project_name)
+    if not tasks:
+        return None
+    status = build_project_status(project_name, [
+        {
+            'id': t['id'],
+            'title': t['title'],
+            'assigned_to': t['assigned_to'],
+            'status': t['status'],
+            'priority': t['priority'],
+            'created_files': (t.get('result') or {}).get('created_files', [])
+        }
+        for t in tasks
+    ])
+    status['eta'] = estimate_eta(tasks, history or DurationHistory(history_file(workspace_dir)))
+    return status
+
+def format_duration(seconds: float) -> str:
+    """秒数を 1h02m / 3m05s / 12.3s 形式に"""
+    if seconds >= 3600:
+        return f"{int(seconds // 3600)}h{int(seconds % 3600 // 60):02d}m"
+    if seconds >= 60:
+        return f"{int(seconds // 60)}m{int(seconds % 60):02d}s"
+    return f"{seconds:.1f}s"
+
+def print_project_monitor(status: Dict[str, Any]):
+    """プロジェクトの現在状態をモニタリング表示"""
+    print("\n" + "="*60)
+    print(f"📊 PROJECT MONITOR: {status['project']}")
+    print("="*60)
+    print(f"Progress: {status['success_rate']:.0f}% ({status['completed_tasks']}/{status['total_tasks']} tasks)")
+    eta = status.get('eta')
+    if eta and eta['estimated_completion']:
+        print(f"ETA: {format_duration(eta['eta_seconds'])} (~{eta['estimated_completion']}, "
+              f"{format_duration(eta['remaining_work_seconds'])} of work remaining)")
+    print(f"\nStatus Breakdown:")
+    for status_type, count in status['status_breakdown'].items():
+        if count > 0:
+            icon = STATUS_ICONS.get(status_type, "❓")
+            print(f"  {icon} {status_type}: {count}")
+
+    print(f"\nTask Details:")
+    for task in status['tasks']:
+        status_icon = STATUS_ICONS.get(task['status'], "❓")
+        print(f"  {status_icon} [{task['assigned_to']}] {task['title']}")
+        if task['created_files']:
+            print(f"     📁 Files: {', '.join(task['created_files'])}")
+    print("="*60 + "\n")
+
+def read_inbox(directory: str, ai_name: str) -> List[Dict[str, Any]]:
+    """指定されたAIの未読メッセージを取得（古い順）"""
+    messages = []
+    prefix = f"{ai_name}_"
+    try:
+        entries = os.scandir(directory)
+    except FileNotFoundError:
+        return []
+    with entries:
+        for entry in entries:
+            # エージェント名に "_" を含む別の宛先（ai_x と ai_x_y など）を区別する
+            if not (entry.name.startswith(prefix) and entry.name.endswith('.json')
+                    and entry.name.rsplit('_', 1)[0] == ai_name):
+                continue
+            try:
+                with open(entry.path, 'r') as f:
+                    message = json.load(f)
+            except FileNotFoundError:
+                # 別プロセスが受信確認（削除）した
+                continue
+            except json.JSONDecodeError:
+                # 書き込み中のメッセージは次回読む
+                continue
+            if message["status"] == "pending":
+                messages.append(message)
+    return sorted(messages, key=lambda x: x["timestamp"])
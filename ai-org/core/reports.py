@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+AI Organization Portfolio Reports
+全プロジェクトを横断したレポート（Markdown / JSON / CSV）
+
+タスクファイルはプロジェクト単位で読み、集計結果だけを communication/reports/portfolio_state.jsonl
+（プロジェクト名順に1行1プロジェクト）に残す。次回はタスクファイルの更新時刻・サイズが変わった
+プロジェクトだけを読み直し、それ以外は前回の集計を使う。メモリに載るのは1プロジェクト分のタスクだけ。
+
+使い方:
+    python3 -m core.reports --workspace . --format md,json,csv
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, TextIO, Tuple
+
+from core import queries
+
+FORMATS = ("md", "json", "csv")
+CSV_FIELDS = ("project", "type", "total_tasks", "completed", "failed", "pending", "in_progress",
+              "success_rate", "files", "duration_seconds", "last_updated")
+
+def reports_dir(workspace_dir: str) -> str:
+    return os.path.join(workspace_dir, "communication", "reports")
+
+def _signature(workspace_dir: str, index: Dict[str, Any]) -> str:
+    """プロジェクトのタスクファイルの件数・最終更新時刻・合計サイズ（内容を読まずに変更を検出）"""
+    directory = queries.tasks_dir(workspace_dir)
+    count = latest = size = 0
+    for task_id in index['tasks']:
+        try:
+            stat = os.stat(os.path.join(directory, f"{task_id}.json"))
+        except FileNotFoundError:
+            continue
+        count += 1
+        latest = max(latest, stat.st_mtime_ns)
+        size += stat.st_size
+    return f"{count}:{latest}:{size}"
+
+def check_formats(formats: Tuple[str, ...]):
+    """未知の出力形式があれば ValueError"""
+    for fmt in formats:
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown report format '{fmt}' (choose from {', '.join(FORMATS)})")
+
+@contextmanager
+def _atomic_write(path: str, newline: Optional[str] = None) -> Iterator[TextIO]:
+    """同じディレクトリの一時ファイルに書いてから置き換える（読み手が書きかけのファイルを見ないように）"""
+    directory, name = os.path.split(path)
+    handle, temporary = tempfile.mkstemp(prefix=f".{name}.", dir=directory or ".")
+    try:
+        with os.fdopen(handle, 'w', newline=newline) as f:
+            yield f
+        # mkstemp は所有者のみ読み書き可で作るため、通常のファイルと同じ権限に戻す
+        os.chmod(temporary, 0o644)
+        os.replace(temporary, path)
+    except BaseException:
+        os.unlink(temporary)
+        raise
+
+def _empty_counts() -> Dict[str, Any]:
+    return {'tasks': 0, **{status: 0 for status in queries.STATUSES}, 'files': 0,
+            'duration_seconds': 0.0, 'timed_tasks': 0}
+
+def _add_counts(total: Dict[str, Any], counts: Dict[str, Any]):
+    for key, value in counts.items():
+        total[key] += value
+
+def summarize_project(project_name: str, index: Dict[str, Any], tasks: List[Dict[str, Any]],
+                      signature: str) -> Dict[str, Any]:
+    """1プロジェクトのタスクから集計を作る（レポートの状態ファイルに保存する形式）"""
+    totals = _empty_counts()
+    roles: Dict[str, Dict[str, Any]] = {}
+    last_updated = ""
+    for task in tasks:
+        counts = _empty_counts()
+        result = task.get('result') or {}
+        counts['tasks'] = 1
+        counts[task['status']] = 1
+        counts['files'] = len(result.get('created_files', []))
+        if 'duration' in result:
+            counts['duration_seconds'] = result['duration']
+            counts['timed_tasks'] = 1
+        _add_counts(totals, counts)
+        _add_counts(roles.setdefault(task['assigned_to'], _empty_counts()), counts)
+        last_updated = max(last_updated, task.get('updated_at', ""))
+    return {
+        'project': project_name,
+        'type': index.get('type', ''),
+        'created_at': index.get('created_at', ''),
+        'last_updated': last_updated,
+        'signature': signature,
+        'totals': totals,
+        'roles': roles
+    }
+
+def _success_rate(counts: Dict[str, Any]) -> float:
+    return round(counts['completed'] / counts['tasks'] * 100, 1) if counts['tasks'] else 0.0
+
+def _mean_duration(counts: Dict[str, Any]) -> Optional[float]:
+    return round(counts['duration_seconds'] / counts['timed_tasks'], 3) if counts['timed_tasks'] else None
+
+class PortfolioReport:
+    """全プロジェクトの集計を増分更新し、各形式で出力する"""
+    def __init__(self, workspace_dir: str = ".", output_dir: Optional[str] = None):
+        self.workspace_dir = workspace_dir
+        self.output_dir = output_dir or reports_dir(workspace_dir)
+        self.state_file = os.path.join(self.output_dir, "portfolio_state.jsonl")
+        self.totals = _empty_counts()
+        self.roles: Dict[str, Dict[str, Any]] = {}
+        self.projects = 0
+        self.stats = {'projects': 0, 'refreshed': 0, 'reused': 0, 'removed': 0}
+
+    def _previous(self) -> Iterator[Dict[str, Any]]:
+        try:
+            with open(self.state_file, 'r') as f:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+        except FileNotFoundError:
+            return
+
+    def update(self) -> Dict[str, int]:
+        """
+        状態ファイルを更新して全体の集計を計算
+        前回の状態と現在のプロジェクト一覧はどちらも名前順なので、突き合わせながら1件ずつ処理する
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        self.totals = _empty_counts()
+        self.roles = {}
+        self.projects = 0
+        self.stats = {'projects': 0, 'refreshed': 0, 'reused': 0, 'removed': 0}
+
+        previous = self._previous()
+        pending = next(previous, None)
+        with _atomic_write(self.state_file) as out:
+            for project_name in queries.list_projects(self.workspace_dir):
+                # 削除されたプロジェクトの状態は読み飛ばす
+                while pending is not None and pending['project'] < project_name:
+                    self.stats['removed'] += 1
+                    pending = next(previous, None)
+                cached = None
+                if pending is not None and pending['project'] == project_name:
+                    cached = pending
+                    pending = next(previous, None)
+
+                summary = self._summary(project_name, cached)
+                if summary is None:
+                    continue
+                out.write(json.dumps(summary, ensure_ascii=False) + "\n")
+                self.projects += 1
+                _add_counts(self.totals, summary['totals'])
+                for role, counts in summary['roles'].items():
+                    _add_counts(self.roles.setdefault(role, _empty_counts()), counts)
+            while pending is not None:
+                self.stats['removed'] += 1
+                pending = next(previous, None)
+        self.stats['projects'] = self.projects
+        return self.stats
+
+    def _summary(self, project_name: str, cached: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        index = queries.read_project_index(self.workspace_dir, project_name)
+        if index is None:
+            return None
+        signature = _signature(self.workspace_dir, index)
+        if cached is not None and cached.get('signature') == signature:
+            self.stats['reused'] += 1
+            return cached
+        self.stats['refreshed'] += 1
+        tasks = queries.read_project_tasks(self.workspace_dir, project_name)
+        return summarize_project(project_name, index, tasks, signature)
+
+    def projects_iter(self) -> Iterator[Dict[str, Any]]:
+        """update() で保存したプロジェクトごとの集計を順に返す"""
+        return self._previous()
+
+    def overview(self) -> Dict[str, Any]:
+        """全体の集計（JSON 出力の先頭部分）"""
+        totals = self.totals
+        return {
+            'generated_at': datetime.now().isoformat(timespec='seconds'),
+            'project_count': self.projects,
+            'tasks': totals['tasks'],
+            'status_breakdown': {status: totals[status] for status in queries.STATUSES},
+            'success_rate': _success_rate(totals),
+            'files': totals['files'],
+            'duration_seconds': round(totals['duration_seconds'], 3),
+            'roles': {
+                role: {
+                    'tasks': counts['tasks'],
+                    'completed': counts['completed'],
+                    'failed': counts['failed'],
+                    'success_rate': _success_rate(counts),
+                    'files': counts['files'],
+                    'mean_duration_seconds': _mean_duration(counts)
+                }
+                for role, counts in sorted(self.roles.items())
+            }
+        }
+
+    @staticmethod
+    def _project_row(summary: Dict[str, Any]) -> Dict[str, Any]:
+        totals = summary['totals']
+        return {
+            'project': summary['project'],
+            'type': summary['type'],
+            'total_tasks': totals['tasks'],
+            'completed': totals['completed'],
+            'failed': totals['failed'],
+            'pending': totals['pending'],
+            'in_progress': totals['in_progress'],
+            'success_rate': _success_rate(totals),
+            'files': totals['files'],
+            'duration_seconds': round(totals['duration_seconds'], 3),
+            'last_updated': summary['last_updated']
+        }
+
+    def write_json(self, path: str):
+        """全体の集計の後にプロジェクトを1件ずつ書き出す（全体を一度にメモリに載せない）"""
+        overview = json.dumps(self.overview(), indent=2, ensure_ascii=False)
+        with _atomic_write(path) as f:
+            f.write(overview[:-2] + ',\n  "projects": [')
+            for i, summary in enumerate(self.projects_iter()):
+                f.write(("," if i else "") + "\n    " + json.dumps(self._project_row(summary), ensure_ascii=False))
+            f.write("\n  ]\n}\n")
+
+    def write_csv(self, path: str):
+        with _atomic_write(path, newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+            writer.writeheader()
+            for summary in self.projects_iter():
+                writer.writerow(self._project_row(summary))
+
+    def write_markdown(self, path: str):
+        overview = self.overview()
+        breakdown = overview['status_breakdown']
+        with _atomic_write(path) as f:
+            f.write(f"""# Portfolio Report
+
+Generated: {overview['generated_at']}
+
+## Overview
+- Projects: {overview['project_count']}
+- Tasks: {overview['tasks']} (✅ {breakdown['completed']} / ❌ {breakdown['failed']} / ⏳ {breakdown['pending']} / 🔄 {breakdown['in_progress']})
+- Success Rate: {overview['success_rate']:.1f}%
+- Files: {overview['files']}
+- Total Task Time: {queries.format_duration(overview['duration_seconds'])}
+
+## Roles
+
+| Role | Tasks | Completed | Failed | Success Rate | Files | Mean Duration |
+|------|------:|----------:|-------:|-------------:|------:|--------------:|
+""")
+            for role, counts in overview['roles'].items():
+                mean = counts['mean_duration_seconds']
+                f.write(f"| {role} | {counts['tasks']} | {counts['completed']} | {counts['failed']} | "
+                        f"{counts['success_rate']:.1f}% | {counts['files']} | "
+                        f"{queries.format_duration(mean) if mean is not None else '-'} |\n")
+            f.write("""
+## Projects
+
+| Project | Type | Tasks | Completed | Failed | Success Rate | Files | Task Time | Last Updated |
+|---------|------|------:|----------:|-------:|-------------:|------:|----------:|--------------|
+""")
+            for summary in self.projects_iter():
+                row = self._project_row(summary)
+                f.write(f"| {row['project']} | {row['type']} | {row['total_tasks']} | {row['completed']} | "
+                        f"{row['failed']} | {row['success_rate']:.1f}% | {row['files']} | "
+                        f"{queries.format_duration(row['duration_seconds'])} | {row['last_updated'][:19]} |\n")
+
+    def write(self, formats: Tuple[str, ...] = FORMATS) -> Dict[str, str]:
+        """指定形式で出力（update() の後に呼ぶ）。形式 -> 出力ファイル"""
+        check_formats(formats)
+        writers = {'md': self.write_markdown, 'json': self.write_json, 'csv': self.write_csv}
+        outputs = {}
+        for fmt in formats:
+            path = os.path.join(self.output_dir, f"portfolio.{fmt}")
+            writers[fmt](path)
+            outputs[fmt] = path
+        return outputs
+
+def generate_portfolio_report(workspace_dir: str = ".", formats: Tuple[str, ...] = FORMATS,
+                              output_dir: Optional[str] = None) -> Tuple[Dict[str, int], Dict[str, str]]:
+    """集計を増分更新してレポートを出力（更新件数, 出力ファイル）"""
+    # 状態ファイルを書き換える前に形式を検証する
+    check_formats(formats)
+    report = PortfolioReport(workspace_dir, output_dir)
+    stats = report.update()
+    return stats, report.write(formats)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="AI Organization portfolio report")
+    parser.add_argument("--workspace", default=".", help="ワークスペースディレクトリ")
+    parser.add_argument("--format", default=",".join(FORMATS), help="comma separated formats (md,json,csv)")
+    parser.add_argument("--output-dir", help="output directory (default: communication/reports)")
+    args = parser.parse_args(argv)
+
+    try:
+        stats, outputs = generate_portfolio_report(args.workspace, tuple(args.format.split(",")), args.output_dir)
+    except ValueError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 2
+    print(f"📊 Portfolio: {stats['projects']} projects ({stats['refreshed']} refreshed, {stats['reused']} unchanged, "
+          f"{stats['removed']} removed)")
+    for path in outputs.values():
+        print(f"💾 {path}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
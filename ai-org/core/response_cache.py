@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+AI Organization Response Cache
+バックエンド応答の永続LRUキャッシュ（役割・ペルソナ・タスク記述・プロンプトをキーにSQLiteへ保存）
+"""
+
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+from core.backends import AgentBackend, AgentRequest, AgentResponse
+
+PROJECT_PLACEHOLDER = "\x00project\x00"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    role TEXT NOT NULL,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed);
+CREATE INDEX IF NOT EXISTS responses_role ON responses (role);
+"""
+
+class ResponseCache:
+    """サイズ上限（LRU）と有効期限で削除されるディスクキャッシュ"""
+    def __init__(self, path: str, max_bytes: int = 256 * 1024 * 1024, max_age: float = 7 * 24 * 3600,
+                 clock: Callable[[], float] = time.time):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        self._total_bytes = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    @staticmethod
+    def make_key(role: str, persona_hash: str, description: str, prompt: str) -> str:
+        """キャッシュキー（全要素のSHA-256）"""
+        payload = json.dumps([role, persona_hash, description, prompt], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str, count_miss: bool = True) -> Optional[AgentResponse]:
+        """キャッシュを参照（期限切れは削除してミス扱い。count_miss=False ならミスを統計に数えない）"""
+        now = self.clock()
+        with self._lock:
+            row = self._db.execute("SELECT value, size, created FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                if count_miss:
+                    self.misses += 1
+                return None
+            value, size, created = row
+            if now - created > self.max_age:
+                self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._total_bytes -= size
+                if count_miss:
+                    self.misses += 1
+                return None
+            self._db.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+            self.hits += 1
+        data = json.loads(value)
+        return AgentResponse(**data)
+
+    def put(self, key: str, role: str, response: AgentResponse):
+        """応答を保存し、上限を超えたら古いものから削除"""
+        value = json.dumps({
+            "text": response.text,
+            "files": response.files,
+            "input_tokens": response.input_tokens,
+            "output_tokens": response.output_tokens,
+            "metadata": response.metadata
+        }, ensure_ascii=False)
+        size = len(value.encode("utf-8"))
+        now = self.clock()
+        with self._lock:
+            old = self._db.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, role, value, size, created, accessed) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, role, value, size, now, now)
+            )
+            self._total_bytes += size - (old[0] if old else 0)
+            if self._total_bytes > self.max_bytes:
+                self._evict(now)
+
+    def _evict(self, now: float):
+        """期限切れを削除し、まだ上限を超えていればアクセスの古い順に削除（ロック保持中に呼ぶ）"""
+        self._db.execute("DELETE FROM responses WHERE created < ?", (now - self.max_age,))
+        self._total_bytes = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        # 上限の90%まで一括で減らし、毎回の削除を避ける
+        target = self.max_bytes * 0.9
+        while self._total_bytes > target:
+            rows = self._db.execute("SELECT key, size FROM responses ORDER BY accessed LIMIT 64").fetchall()
+            if not rows:
+                break
+            for key, size in rows:
+                self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._total_bytes -= size
+                if self._total_bytes <= target:
+                    break
+
+    def invalidate(self, key: Optional[str] = None, role: Optional[str] = None) -> int:
+        """キー・役割を指定して削除（どちらも省略すると全削除）。削除件数を返す"""
+        with self._lock:
+            if key is not None:
+                cursor = self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+            elif role is not None:
+                cursor = self._db.execute("DELETE FROM responses WHERE role = ?", (role,))
+            else:
+                cursor = self._db.execute("DELETE FROM responses")
+            self._total_bytes = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            return cursor.rowcount
+
+    def stats(self) -> Dict:
+        """件数・サイズ・ヒット率"""
+        with self._lock:
+            entries = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "entries": entries,
+            "bytes": self._total_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+class CachingBackend(AgentBackend):
+    """
+    応答キャッシュ付きバックエンド
+    応答はそのまま保存する（パスや内容のプロジェクト名を置き換えると src/app.js のような成果物を壊すため）
+    プロジェクト名を含まない応答はキーのプロジェクト名をプレースホルダにして保存し、同種の別プロジェクトでも再利用する
+    """
+    def __init__(self, backend: AgentBackend, cache: ResponseCache,
+                 persona_hash: Optional[Callable[[str], str]] = None):
+        self.backend = backend
+        self.cache = cache
+        self.persona_hash = persona_hash or (lambda role: "")
+        self.name = f"cached({backend.name})"
+        self.supports_sessions = backend.supports_sessions
+
+    def cache_key(self, request: AgentRequest, shared: bool = True) -> str:
+        """キャッシュキー（shared ならプロンプト中のプロジェクト名をプレースホルダに置き換える）"""
+        prompt = request.prompt
+        if shared and request.project:
+            prompt = self._project_pattern(request.project).sub(PROJECT_PLACEHOLDER, prompt)
+        persona_hash = self.persona_hash(request.role)
+        prefix_hash = request.metadata.get("prefix_hash")
+        if prefix_hash:
+            persona_hash = f"{persona_hash}:{prefix_hash}"
+        return ResponseCache.make_key(request.role, persona_hash, request.description, prompt)
+
+    @staticmethod
+    def _project_pattern(project: str) -> "re.Pattern":
+        return re.compile(rf"(?<![\w-]){re.escape(project)}(?![\w-])")
+
+    def complete(self, request: AgentRequest) -> AgentResponse:
+        # セッション継続中の差分プロンプトは会話履歴に依存するためキャッシュしない
+        if request.session is not None:
+            return self.backend.complete(request)
+
+        shared_key = self.cache_key(request)
+        own_key = self.cache_key(request, shared=False)
+        # プロジェクト名を含む応答はそのプロジェクト専用のキーで保存されている
+        cached = self.cache.get(own_key, count_miss=False) if own_key != shared_key else None
+        if cached is None:
+            cached = self.cache.get(shared_key)
+        if cached is not None:
+            cached.metadata["cached"] = True
+            return cached
+
+        response = self.backend.complete(request)
+        key = own_key if request.project and self._mentions(response, request.project) else shared_key
+        self.cache.put(key, request.role, response)
+        return response
+
+    def _mentions(self, response: AgentResponse, project: str) -> bool:
+        """応答（本文・ファイルパス・ファイル内容）にプロジェクト名が含まれるか"""
+        pattern = self._project_pattern(project)
+        return bool(pattern.search(response.text)) or any(
+            pattern.search(path) or pattern.search(content) for path, content in response.files.items()
+        )
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+AI Organization Retry Policies
+役割ごとの再試行ポリシー（指数バックオフ + ジッター）
+"""
+
+import json
+import random
+from dataclasses import dataclass, fields, replace
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+DEFAULT_ORGANIZATION_FILE = Path(__file__).resolve().parent.parent / "config" / "organization.json"
+
+class NonRetryableError(Exception):
+    """再試行しても結果が変わらない失敗（入力不正など）"""
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    max_attempts: int = 1
+    base_delay: float = 0.5
+    max_delay: float = 30.0
+    multiplier: float = 2.0
+    # 待ち時間のうちランダムにする割合（0: 固定、1: 0〜待ち時間の一様分布）
+    jitter: float = 0.5
+
+    def should_retry(self, attempt: int, error: Exception) -> bool:
+        """attempt 回目の失敗の後に再試行するか"""
+        return attempt < self.max_attempts and not isinstance(error, NonRetryableError)
+
+    def delay(self, attempt: int, rng: Optional[random.Random] = None) -> float:
+        """attempt 回目の失敗の後の待ち時間（秒）"""
+        delay = min(self.max_delay, self.base_delay * self.multiplier ** (attempt - 1))
+        fixed = delay * (1.0 - self.jitter)
+        return fixed + (rng or random).uniform(0.0, delay - fixed)
+
+    def scaled(self, factor: float) -> "RetryPolicy":
+        """待ち時間を factor 倍したポリシー（負荷試験などで時間を縮める用途）"""
+        return replace(self, base_delay=self.base_delay * factor, max_delay=self.max_delay * factor)
+
+    @classmethod
+    def from_dict(cls, data: Dict, base: Optional["RetryPolicy"] = None) -> "RetryPolicy":
+        """設定辞書から生成（未指定の項目は base を引き継ぐ）"""
+        known = {f.name for f in fields(cls)}
+        unknown = set(data) - known
+        if unknown:
+            raise ValueError(f"Unknown retry policy fields: {', '.join(sorted(unknown))}")
+        return replace(base or cls(), **data)
+
+def load_retry_policies(organization_file: Optional[str] = None) -> Tuple[RetryPolicy, Dict[str, RetryPolicy]]:
+    """organization.json の retry 設定を読む（既定ポリシー, 役割別ポリシー）"""
+    path = Path(organization_file) if organization_file else DEFAULT_ORGANIZATION_FILE
+    try:
+        with open(path, 'r') as f:
+            config = json.load(f).get("retry", {})
+    except FileNotFoundError:
+        config = {}
+    default = RetryPolicy.from_dict(config.get("default", {}))
+    roles = {role: RetryPolicy.from_dict(data, default) for role, data in config.get("roles", {}).items()}
+    return default, roles
@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+AI Organization Script Loader
+ハイフン付きファイル名のスクリプト（ai-collaborative-system.py など）をモジュールとして読み込む
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+from types import ModuleType
+
+AI_ORG_DIR = Path(__file__).resolve().parent.parent
+
+SCRIPTS = {
+    "ai_collaborative_system": AI_ORG_DIR / "ai-collaborative-system.py",
+    "message_bus": AI_ORG_DIR / "communication" / "message-bus.py",
+    "project_generator": AI_ORG_DIR / "knowledge" / "templates" / "project-generator.py",
+}
+
+def load_script(name: str) -> ModuleType:
+    """スクリプトを読み込む（読み込み済みなら sys.modules のものを返す）"""
+    if name in sys.modules:
+        return sys.modules[name]
+    if name not in SCRIPTS:
+        raise KeyError(f"Unknown script '{name}' (available: {', '.join(sorted(SCRIPTS))})")
+    spec = importlib.util.spec_from_file_location(name, SCRIPTS[name])
+    module = importlib.util.module_from_spec(spec)
+    # dataclass などがモジュールを参照できるよう実行前に登録する
+    sys.modules[name] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        del sys.modules[name]
+        raise
+    return module
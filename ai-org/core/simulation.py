@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+AI Organization Simulated Backend
+オフライン負荷試験用の決定的な擬似バックエンド（遅延分布・失敗率・出力サイズを設定可能）
+"""
+
+import hashlib
+import math
+import random
+import threading
+import time
+from typing import Callable, Dict, List, Tuple
+
+from core.backends import AgentBackend, AgentRequest, AgentResponse, BackendError, RateLimitError
+
+# 役割ごとに返す成果物（組み込みのロールハンドラと同じパス）
+ROLE_ARTIFACTS: Dict[str, List[str]] = {
+    "ai-ceo": ["docs/requirements.md"],
+    "ai-cto": ["docs/architecture.md"],
+    "ai-frontend": ["src/types/todo.ts", "src/App.tsx", "src/components/AddTodo.tsx"],
+    "ai-backend": ["backend/server.js", "backend/package.json"],
+    "ai-devops": ["Dockerfile", "docker-compose.yml", ".github/workflows/ci-cd.yml"],
+    "ai-qa": ["jest.config.json", "tests/setup.ts", "tests/App.test.tsx", "cypress/e2e/todo-app.cy.ts"],
+}
+
+_WORDS = (
+    "agent", "api", "build", "cache", "component", "deploy", "design", "endpoint", "feature",
+    "module", "pipeline", "query", "release", "request", "schema", "service", "state", "test",
+    "user", "workflow",
+)
+
+LATENCY_DISTRIBUTIONS = ("constant", "uniform", "exponential", "lognormal")
+
+class SimulatedBackend(AgentBackend):
+    """
+    決定的な擬似バックエンド
+    乱数は (seed, プロジェクト, 役割, タスク名, 試行回数) から導出するため、
+    タスクIDのタイムスタンプやスレッドの実行順に関係なく同じ結果になる
+    """
+    name = "simulated"
+
+    def __init__(self, seed: int = 0, latency: str = "lognormal", latency_mean: float = 0.5,
+                 latency_sigma: float = 0.5, failure_rate: float = 0.0, rate_limit_rate: float = 0.0,
+                 output_size: Tuple[int, int] = (500, 4000), time_scale: float = 1.0,
+                 sleep: Callable[[float], None] = time.sleep):
+        if latency not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution '{latency}' (choose from {', '.join(LATENCY_DISTRIBUTIONS)})")
+        self.seed = seed
+        self.latency = latency
+        self.latency_mean = latency_mean
+        self.latency_sigma = latency_sigma
+        self.failure_rate = failure_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.output_size = output_size
+        self.time_scale = time_scale
+        self.sleep = sleep
+
+        self._lock = threading.Lock()
+        self._attempts: Dict[str, int] = {}
+        self.calls = 0
+        self.failures = 0
+        self.simulated_seconds = 0.0
+
+    def _rng(self, request: AgentRequest) -> random.Random:
+        key = f"{request.project}:{request.role}:{request.title}"
+        with self._lock:
+            attempt = self._attempts.get(key, 0)
+            self._attempts[key] = attempt + 1
+            self.calls += 1
+        digest = hashlib.sha256(f"{self.seed}:{key}:{attempt}".encode("utf-8")).digest()
+        return random.Random(int.from_bytes(digest[:8], "big"))
+
+    def sample_latency(self, rng: random.Random) -> float:
+        """設定された分布から遅延（秒）をサンプリング"""
+        mean = self.latency_mean
+        if self.latency == "constant":
+            return mean
+        if self.latency == "uniform":
+            return rng.uniform(max(mean - self.latency_sigma, 0.0), mean + self.latency_sigma)
+        if self.latency == "exponential":
+            return rng.expovariate(1.0 / mean) if mean > 0 else 0.0
+        # lognormal: 平均が latency_mean になるよう mu を調整
+        sigma = self.latency_sigma
+        mu = math.log(mean) - sigma * sigma / 2 if mean > 0 else 0.0
+        return rng.lognormvariate(mu, sigma) if mean > 0 else 0.0
+
+    def _content(self, rng: random.Random, request: AgentRequest, path: str) -> str:
+        size = rng.randint(*self.output_size)
+        header = f"// {path}\n// {request.title} ({request.role})\n"
+        words = []
+        total = len(header)
+        while total < size:
+            word = rng.choice(_WORDS)
+            words.append(word)
+            total += len(word) + 1
+        return header + " ".join(words) + "\n"
+
+    def complete(self, request: AgentRequest) -> AgentResponse:
+        rng = self._rng(request)
+        latency = self.sample_latency(rng)
+        with self._lock:
+            self.simulated_seconds += latency
+        if latency > 0 and self.time_scale > 0:
+            self.sleep(latency * self.time_scale)
+
+        roll = rng.random()
+        if roll < self.rate_limit_rate:
+            with self._lock:
+                self.failures += 1
+            raise RateLimitError("Simulated rate limit", retry_after=latency * self.time_scale)
+        if roll < self.rate_limit_rate + self.failure_rate:
+            with self._lock:
+                self.failures += 1
+            raise BackendError(f"Simulated failure for {request.task_id}")
+
+        paths = ROLE_ARTIFACTS.get(request.role, [f"docs/agents/{request.role}.md"])
+        files = {path: self._content(rng, request, path) for path in paths}
+        output_chars = sum(len(content) for content in files.values())
+        return AgentResponse(
+            text=f"{request.title}: generated {len(files)} files",
+            files=files,
+            input_tokens=(len(request.system_prompt) + len(request.prompt) + 3) // 4,
+            output_tokens=(output_chars + 3) // 4,
+            metadata={"simulated_latency": latency}
+        )
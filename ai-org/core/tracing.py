@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+AI Organization Tracing
+タスク実行の各フェーズを計測するスパン（Chrome trace 形式とフラットなサマリーで出力。無効時はほぼオーバーヘッドなし）
+"""
+
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+@dataclass
+class Span:
+    name: str
+    start: float
+    duration: float
+    thread_id: int
+    thread_name: str
+    args: Dict[str, Any] = field(default_factory=dict)
+
+class _NoopSpan:
+    """無効時に返す共有の空スパン"""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set(self, **args):
+        pass
+
+_NOOP_SPAN = _NoopSpan()
+
+class _ActiveSpan:
+    __slots__ = ("tracer", "name", "args", "start")
+
+    def __init__(self, tracer: "Tracer", name: str, args: Dict[str, Any]):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = self.tracer.clock()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = self.tracer.clock()
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        self.tracer._record(self.name, self.start, end - self.start, self.args)
+        return False
+
+    def set(self, **args):
+        """実行中に判明した属性を追加"""
+        self.args.update(args)
+
+class Tracer:
+    """
+    スパンの記録
+    with tracer.span("write_artifacts", project=..., role=..., task_id=...): のように使う
+    """
+    def __init__(self, enabled: bool = False, max_spans: int = 1_000_000,
+                 clock: Callable[[], float] = time.perf_counter):
+        self.enabled = enabled
+        self.max_spans = max_spans
+        self.clock = clock
+        self.origin = clock()
+        self.dropped = 0
+        self._lock = threading.Lock()
+        self._spans: List[Span] = []
+
+    def span(self, name: str, **args):
+        """スパンを開始（無効時は何もしない共有オブジェクトを返す）"""
+        if not self.enabled:
+            return _NOOP_SPAN
+        return _ActiveSpan(self, name, args)
+
+    def _record(self, name: str, start: float, duration: float, args: Dict[str, Any]):
+        thread = threading.current_thread()
+        span = Span(name, start - self.origin, duration, thread.ident or 0, thread.name, args)
+        with self._lock:
+            if len(self._spans) >= self.max_spans:
+                self.dropped += 1
+                return
+            self._spans.append(span)
+
+    def spans(self) -> List[Span]:
+        with self._lock:
+            return list(self._spans)
+
+    def clear(self):
+        with self._lock:
+            self._spans.clear()
+            self.dropped = 0
+        self.origin = self.clock()
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """Chrome trace event 形式（chrome://tracing / Perfetto で表示可能）"""
+        pid = os.getpid()
+        events = []
+        threads: Dict[int, str] = {}
+        for span in self.spans():
+            threads[span.thread_id] = span.thread_name
+            events.append({
+                "name": span.name,
+                "cat": span.args.get("role", "system"),
+                "ph": "X",
+                "ts": span.start * 1e6,
+                "dur": span.duration * 1e6,
+                "pid": pid,
+                "tid": span.thread_id,
+                "args": span.args
+            })
+        # スレッド名（ワーカーID）をトラック名として表示
+        for thread_id, thread_name in threads.items():
+            events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": thread_id,
+                           "args": {"name": thread_name}})
+        return {"traceEvents": events, "displayTimeUnit": "ms", "otherData": {"dropped_spans": self.dropped}}
+
+    def export_chrome_trace(self, path: str):
+        """Chrome trace JSON をファイルに書き出し"""
+        with open(path, 'w') as f:
+            json.dump(self.to_chrome_trace(), f)
+
+    def summary(self, group_by: Optional[str] = None) -> Dict[str, Dict[str, float]]:
+        """スパン名（group_by 指定時は "名前 [属性値]"）ごとの件数・合計・平均・最大（秒）"""
+        summary: Dict[str, Dict[str, float]] = {}
+        for span in self.spans():
+            key = span.name if group_by is None else f"{span.name} [{span.args.get(group_by, '-')}]"
+            entry = summary.setdefault(key, {"count": 0, "total": 0.0, "max": 0.0})
+            entry["count"] += 1
+            entry["total"] += span.duration
+            entry["max"] = max(entry["max"], span.duration)
+        for entry in summary.values():
+            entry["mean"] = entry["total"] / entry["count"]
+        return dict(sorted(summary.items(), key=lambda item: item[1]["total"], reverse=True))
+
+    def print_summary(self, group_by: Optional[str] = None):
+        """サマリーを表形式で表示"""
+        summary = self.summary(group_by)
+        print("\n" + "="*60)
+        print(f"🔍 TRACE SUMMARY ({sum(int(e['count']) for e in summary.values())} spans)")
+        print("="*60)
+        for name, entry in summary.items():
+            print(f"  {name:<32} {int(entry['count']):>7}  total {entry['total'] * 1000:>10.1f}ms  "
+                  f"mean {entry['mean'] * 1000:>8.2f}ms  max {entry['max'] * 1000:>8.2f}ms")
+        if self.dropped:
+            print(f"  ⚠️  {self.dropped} spans dropped (max_spans={self.max_spans})")
+        print("="*60 + "\n")
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+AI Organization Worker Pools
+役割ごとのワーカープールでタスクを並列実行し、手の空いたワーカーは他の役割のキューから仕事を奪う
+"""
+
+import heapq
+import itertools
+import json
+import logging
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_ORGANIZATION_FILE = Path(__file__).resolve().parent.parent / "config" / "organization.json"
+
+logger = logging.getLogger("ai_org.workers")
+
+@dataclass
+class WorkerContext:
+    """ワーカー単位の実行コンテキスト（グローバルな current_role の代わり）"""
+    role: str
+    instance: int
+    current_role: Optional[str] = None
+    tasks_completed: int = 0
+    tasks_stolen: int = 0
+
+    @property
+    def worker_id(self) -> str:
+        return f"{self.role}#{self.instance}"
+
+def load_pool_config(organization_file: Optional[str] = None) -> Tuple[int, Dict[str, int]]:
+    """organization.json の worker_pools 設定を読み込み (default_instances, {role: instances})"""
+    path = Path(organization_file) if organization_file else DEFAULT_ORGANIZATION_FILE
+    try:
+        with open(path, 'r') as f:
+            config = json.load(f).get("worker_pools", {})
+    except FileNotFoundError:
+        config = {}
+    return int(config.get("default_instances", 1)), {
+        role: int(count) for role, count in config.get("instances", {}).items()
+    }
+
+class WorkerPool:
+    """
+    依存関係を考慮したワークスティーリング型スケジューラ
+    ready になったタスクは担当役割のキューに入り、その役割のワーカーが優先度順に処理する
+    """
+    def __init__(self, execute: Callable[[object, WorkerContext], bool],
+                 role_of: Callable[[object], str],
+                 instances: Optional[Dict[str, int]] = None,
+                 default_instances: int = 1,
+                 steal: bool = True,
+                 on_blocked: Optional[Callable[[object, str], None]] = None,
+                 priority_of: Optional[Callable[[object], object]] = None):
+        self.execute = execute
+        self.role_of = role_of
+        self.instances = dict(instances or {})
+        self.default_instances = default_instances
+        self.steal = steal
+        self.on_blocked = on_blocked
+        self.priority_of = priority_of or (lambda task: getattr(task, "priority", 0))
+
+        self._cond = threading.Condition()
+        self._queues: Dict[str, List] = {}
+        self._seq = itertools.count()
+        self._outstanding = 0
+        self.workers: List[WorkerContext] = []
+
+    def queue_depths(self) -> Dict[str, int]:
+        """役割ごとの待ちタスク数"""
+        with self._cond:
+            return {role: len(queue) for role, queue in self._queues.items()}
+
+    def _push(self, task):
+        queue = self._queues.setdefault(self.role_of(task), [])
+        heapq.heappush(queue, (self.priority_of(task), next(self._seq), task))
+
+    def _next_task(self, worker: WorkerContext):
+        """自分の役割のキュー、空なら最も混んでいるキューから取得（ロック保持中に呼ぶ）"""
+        queue = self._queues.get(worker.role)
+        if queue:
+            return heapq.heappop(queue)[2], False
+        if self.steal:
+            victim = max(self._queues.values(), key=len, default=None)
+            if victim:
+                return heapq.heappop(victim)[2], True
+        return None, False
+
+    def run(self, tasks: Iterable, failed: Iterable[str] = ()) -> Dict:
+        """タスク群を実行して完了まで待つ（failed は既に失敗している依存先ID）"""
+        tasks = list(tasks)
+        by_id = {task.id: task for task in tasks}
+        failed_ids = set(failed)
+        waiting: Dict[str, int] = {}
+        dependents: Dict[str, List] = {}
+
+        for task in tasks:
+            deps = [d for d in (task.dependencies or []) if d in by_id]
+            waiting[task.id] = len(deps)
+            for dep in deps:
+                dependents.setdefault(dep, []).append(task)
+
+        stats = {"completed": 0, "failed": 0, "blocked": 0, "stolen": 0}
+
+        blocked = []
+        with self._cond:
+            self._queues = {}
+            self._outstanding = len(waiting)
+            # 失敗済みの依存先を持つタスクとその下流はブロック
+            for task in tasks:
+                failed_deps = [d for d in (task.dependencies or []) if d in failed_ids]
+                if failed_deps:
+                    blocked.extend(self._block_downstream(task, failed_deps[0], dependents, waiting, stats))
+            for task in tasks:
+                if waiting.get(task.id) == 0:
+                    self._push(task)
+        self._notify_blocked(blocked)
+
+        roles = sorted({self.role_of(task) for task in tasks})
+        self.workers = [
+            WorkerContext(role=role, instance=i + 1)
+            for role in roles
+            for i in range(max(self.instances.get(role, self.default_instances), 1))
+        ]
+        threads = [
+            threading.Thread(target=self._worker_loop, args=(worker, dependents, waiting, stats),
+                             name=worker.worker_id, daemon=True)
+            for worker in self.workers
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stats["stolen"] = sum(w.tasks_stolen for w in self.workers)
+        stats["workers"] = len(self.workers)
+        return stats
+
+    def _block_downstream(self, task, failed_dep: str, dependents, waiting, stats) -> List[Tuple[object, str]]:
+        """
+        失敗したタスクの下流を実行対象から外す（ロック保持中に呼ぶ）
+        外した (タスク, 原因) を返すので、on_blocked はロックを放してから _notify_blocked で呼ぶ
+        """
+        blocked = []
+        stack = [(task, failed_dep)]
+        while stack:
+            current, cause = stack.pop()
+            if waiting.pop(current.id, None) is None:
+                continue
+            self._outstanding -= 1
+            stats["blocked"] += 1
+            blocked.append((current, cause))
+            for child in dependents.get(current.id, []):
+                stack.append((child, current.id))
+        return blocked
+
+    def _notify_blocked(self, blocked: List[Tuple[object, str]]):
+        """on_blocked を呼ぶ（失敗しても他のタスクの通知とスケジューリングは続ける）"""
+        if not self.on_blocked:
+            return
+        for task, cause in blocked:
+            try:
+                self.on_blocked(task, cause)
+            except Exception:
+                logger.exception(f"❌ Failed to record blocked task {task.id}")
+
+    def _worker_loop(self, worker: WorkerContext, dependents, waiting, stats):
+        while True:
+            with self._cond:
+                while True:
+                    task, stolen = self._next_task(worker)
+                    if task is not None or self._outstanding <= 0:
+                        break
+                    self._cond.wait()
+                if task is None:
+                    self._cond.notify_all()
+                    return
+                if stolen:
+                    worker.tasks_stolen += 1
+
+            succeeded = False
+            blocked = []
+            try:
+                succeeded = bool(self.execute(task, worker))
+            finally:
+                with self._cond:
+                    waiting.pop(task.id, None)
+                    self._outstanding -= 1
+                    if succeeded:
+                        worker.tasks_completed += 1
+                        stats["completed"] += 1
+                        for child in dependents.get(task.id, []):
+                            if child.id in waiting:
+                                waiting[child.id] -= 1
+                                if waiting[child.id] == 0:
+                                    self._push(child)
+                    else:
+                        stats["failed"] += 1
+                        for child in dependents.get(task.id, []):
+                            if child.id in waiting:
+                                blocked.extend(self._block_downstream(child, task.id, dependents, waiting, stats))
+                    self._cond.notify_all()
+                self._notify_blocked(blocked)
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+AI Organization Workflow Registry
+プロジェクトタイプ別のワークフロー定義を読み込み、検証して実行プランにコンパイルする
+"""
+
+import json
+import os
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_WORKFLOWS_FILE = Path(__file__).resolve().parent.parent / "config" / "workflows.json"
+
+class WorkflowError(ValueError):
+    """ワークフロー定義が不正、または未定義のプロジェクトタイプ"""
+
+@dataclass(frozen=True)
+class PlanStep:
+    key: str
+    role: str
+    title: str
+    description: str
+    priority: int
+    dependency_indices: Tuple[int, ...]
+
+@dataclass(frozen=True)
+class ExecutionPlan:
+    """コンパイル済みのワークフロー（プロジェクト作成時はインスタンス化するだけ）"""
+    project_type: str
+    description: str
+    steps: Tuple[PlanStep, ...]
+    team_assignments: Tuple[Tuple[str, str], ...]
+
+    def instantiate_ids(self, prefix: str) -> List[str]:
+        """各ステップのタスクIDを生成"""
+        return [f"{prefix}_{step.key}" for step in self.steps]
+
+    def with_roles(self, roles: Iterable[str]) -> "ExecutionPlan":
+        """指定した役割のステップだけのプラン（外したステップの依存先は引き継ぐ）"""
+        roles = frozenset(roles)
+        unknown = roles - {step.role for step in self.steps}
+        if unknown:
+            raise WorkflowError(f"workflow '{self.project_type}' has no tasks for roles: {', '.join(sorted(unknown))}")
+        if not roles:
+            raise WorkflowError(f"workflow '{self.project_type}': at least one role is required")
+
+        # 元のインデックス -> 残すステップの依存先（元のインデックス）
+        kept: Dict[int, Tuple[int, ...]] = {}
+        # 元のインデックス -> 依存する側から見た実際の依存先（外したステップはその依存先に置き換える）
+        resolved: Dict[int, Tuple[int, ...]] = {}
+        for i, step in enumerate(self.steps):
+            deps: List[int] = []
+            for dep in step.dependency_indices:
+                deps.extend(target for target in resolved[dep] if target not in deps)
+            if step.role in roles:
+                kept[i] = tuple(deps)
+            resolved[i] = (i,) if step.role in roles else tuple(deps)
+
+        index = {old: new for new, old in enumerate(kept)}
+        steps = tuple(
+            replace(self.steps[old], dependency_indices=tuple(index[dep] for dep in deps))
+            for old, deps in kept.items()
+        )
+        return replace(
+            self,
+            steps=steps,
+            team_assignments=tuple((role, name) for role, name in self.team_assignments if role in roles)
+        )
+
+# (path, mtime_ns, size, known_roles) -> {project_type: ExecutionPlan}
+_PLAN_CACHE: Dict[Tuple, Dict[str, ExecutionPlan]] = {}
+
+class WorkflowRegistry:
+    """ワークフロー定義ファイルとコンパイル済みプランのキャッシュ"""
+    def __init__(self, workflows_file: Optional[str] = None, known_roles: Optional[Iterable[str]] = None):
+        self.workflows_file = Path(workflows_file) if workflows_file else DEFAULT_WORKFLOWS_FILE
+        self.known_roles = frozenset(known_roles) if known_roles is not None else None
+        self._plans: Optional[Dict[str, ExecutionPlan]] = None
+        self._signature: Optional[Tuple] = None
+
+    def _current_signature(self) -> Tuple:
+        stat = os.stat(self.workflows_file)
+        return (str(self.workflows_file), stat.st_mtime_ns, stat.st_size, self.known_roles)
+
+    def plans(self) -> Dict[str, ExecutionPlan]:
+        """全プロジェクトタイプのプランを取得（定義ファイル変更時のみ再コンパイル）"""
+        signature = self._current_signature()
+        if self._plans is not None and signature == self._signature:
+            return self._plans
+
+        plans = _PLAN_CACHE.get(signature)
+        if plans is None:
+            with open(self.workflows_file, 'r') as f:
+                definitions = json.load(f)
+            plans = compile_workflows(definitions, self.known_roles)
+            _PLAN_CACHE[signature] = plans
+
+        self._plans = plans
+        self._signature = signature
+        return plans
+
+    def get_plan(self, project_type: str) -> ExecutionPlan:
+        """プロジェクトタイプのプランを取得"""
+        plans = self.plans()
+        try:
+            return plans[project_type]
+        except KeyError:
+            available = ", ".join(sorted(plans))
+            raise WorkflowError(f"Unknown project type '{project_type}' (available: {available})") from None
+
+    def project_types(self) -> List[str]:
+        """定義済みプロジェクトタイプ一覧"""
+        return sorted(self.plans())
+
+def compile_workflows(definitions: Dict, known_roles: Optional[Iterable[str]] = None) -> Dict[str, ExecutionPlan]:
+    """ワークフロー定義全体を検証してプランにコンパイル"""
+    workflows = definitions.get("workflows") if isinstance(definitions, dict) else None
+    if not isinstance(workflows, dict) or not workflows:
+        raise WorkflowError("Workflow definitions must contain a non-empty 'workflows' object")
+
+    roles = frozenset(known_roles) if known_roles is not None else None
+    return {
+        project_type: compile_workflow(project_type, definition, roles)
+        for project_type, definition in workflows.items()
+    }
+
+def compile_workflow(project_type: str, definition: Dict, known_roles: Optional[frozenset] = None) -> ExecutionPlan:
+    """単一のワークフロー定義を検証し、依存関係を解決した実行プランを生成"""
+    where = f"workflow '{project_type}'"
+    tasks = definition.get("tasks") if isinstance(definition, dict) else None
+    if not isinstance(tasks, list) or not tasks:
+        raise WorkflowError(f"{where}: 'tasks' must be a non-empty list")
+
+    # ステップの検証
+    raw_steps = []
+    keys = set()
+    for i, spec in enumerate(tasks):
+        if not isinstance(spec, dict):
+            raise WorkflowError(f"{where}: task #{i} must be an object")
+        for field in ("role", "title", "description"):
+            if not isinstance(spec.get(field), str) or not spec[field]:
+                raise WorkflowError(f"{where}: task #{i} is missing '{field}'")
+        role = spec["role"]
+        if known_roles is not None and role not in known_roles:
+            raise WorkflowError(f"{where}: task #{i} has unknown role '{role}'")
+        key = spec.get("id", role)
+        if key in keys:
+            raise WorkflowError(f"{where}: duplicate task id '{key}'")
+        keys.add(key)
+        priority = spec.get("priority")
+        if not isinstance(priority, int) or isinstance(priority, bool):
+            raise WorkflowError(f"{where}: task '{key}' must have an integer 'priority'")
+        depends_on = spec.get("depends_on", [])
+        if not isinstance(depends_on, list):
+            raise WorkflowError(f"{where}: task '{key}' 'depends_on' must be a list")
+        raw_steps.append((key, spec, depends_on))
+
+    for key, spec, depends_on in raw_steps:
+        for dep in depends_on:
+            if dep not in keys:
+                raise WorkflowError(f"{where}: task '{key}' depends on unknown task '{dep}'")
+
+    # 優先度順に並べた上でトポロジカルソート（優先度は依存関係と矛盾してはならない）
+    by_key = {key: (spec, depends_on) for key, spec, depends_on in raw_steps}
+    order = [key for key, _, _ in sorted(raw_steps, key=lambda s: s[1]["priority"])]
+    for key in order:
+        spec, depends_on = by_key[key]
+        for dep in depends_on:
+            if by_key[dep][0]["priority"] >= spec["priority"]:
+                raise WorkflowError(
+                    f"{where}: task '{key}' (priority {spec['priority']}) must have a higher priority "
+                    f"value than its dependency '{dep}' (priority {by_key[dep][0]['priority']})"
+                )
+
+    index = {key: i for i, key in enumerate(order)}
+    steps = tuple(
+        PlanStep(
+            key=key,
+            role=by_key[key][0]["role"],
+            title=by_key[key][0]["title"],
+            description=by_key[key][0]["description"],
+            priority=by_key[key][0]["priority"],
+            dependency_indices=tuple(index[dep] for dep in by_key[key][1])
+        )
+        for key in order
+    )
+
+    team = definition.get("team")
+    if team is None:
+        team = {}
+        for step in steps:
+            team.setdefault(step.role, step.title)
+    elif not isinstance(team, dict) or not all(isinstance(v, str) for v in team.values()):
+        raise WorkflowError(f"{where}: 'team' must map roles to assignment names")
+
+    return ExecutionPlan(
+        project_type=project_type,
+        description=definition.get("description", ""),
+        steps=steps,
+        team_assignments=tuple(team.items())
+    )
@@ -5,44 +5,145 @@ AI Organization Project Generator
 """
 
 import os
+import sys
 import json
+import time
+import argparse
 from datetime import datetime
+from typing import Dict, Iterable, List, Tuple
+
+_AI_ORG_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if _AI_ORG_DIR not in sys.path:
+    sys.path.insert(0, _AI_ORG_DIR)
+
+from core.workflow import WorkflowRegistry
+from core.profiling import add_profile_arguments, run_profiled
+
+# スケルトン内で後から差し込む値のプレースホルダ
+_NAME_PLACEHOLDER = "\x00name\x00"
+_CREATED_PLACEHOLDER = "\x00created\x00"
 
 class ProjectGenerator:
-    def __init__(self, workspace_dir: str = "."):
+    def __init__(self, workspace_dir: str = ".", workflows_file: str = None):
         self.workspace_dir = workspace_dir
         self.projects_dir = f"{workspace_dir}/workspace/projects"
+        # AICollaborativeSystem と共通のワークフロー定義
+        self.workflows = WorkflowRegistry(workflows_file)
+    
+        # プロジェクトタイプ -> シリアライズ済みスケルトン (name前, name〜created間, created後)
+        self._skeletons: Dict[Tuple[str, Tuple], Tuple[str, str, str]] = {}
+    
+    def _get_skeleton(self, project_type: str) -> Tuple[str, str, str]:
+        """プロジェクトタイプごとの project.json スケルトンを取得（初回のみシリアライズ）"""
+        plan = self.workflows.get_plan(project_type)
+        cache_key = (project_type, plan.team_assignments)
+        skeleton = self._skeletons.get(cache_key)
+        if skeleton is None:
+            text = json.dumps({
+                "name": _NAME_PLACEHOLDER,
+                "type": project_type,
+                "created": _CREATED_PLACEHOLDER,
+                "status": "planning",
+                "team_assignments": dict(plan.team_assignments)
+            }, indent=2)
+            head, rest = text.split(json.dumps(_NAME_PLACEHOLDER), 1)
+            middle, tail = rest.split(json.dumps(_CREATED_PLACEHOLDER), 1)
+            skeleton = (head, middle, tail)
+            self._skeletons[cache_key] = skeleton
+        return skeleton
+    
+    def _render_config(self, project_name: str, project_type: str, created: str) -> str:
+        """スケルトンに名前と作成日時を差し込んで project.json の内容を生成"""
+        head, middle, tail = self._get_skeleton(project_type)
+        return f"{head}{json.dumps(project_name)}{middle}{json.dumps(created)}{tail}"
     
     def create_project(self, project_name: str, project_type: str = "web-app"):
         """新規プロジェクトを作成"""
+        content = self._render_config(project_name, project_type, datetime.now().isoformat())
+        
         project_dir = f"{self.projects_dir}/{project_name}"
         os.makedirs(project_dir, exist_ok=True)
         
-        # プロジェクト設定
-        project_config = {
-            "name": project_name,
-            "type": project_type,
-            "created": datetime.now().isoformat(),
-            "status": "planning",
-            "team_assignments": {
-                "ai-ceo": "Product Vision",
-                "ai-cto": "Technical Architecture", 
-                "ai-frontend": "UI/UX Development",
-                "ai-backend": "API Development",
-                "ai-devops": "Infrastructure",
-                "ai-qa": "Testing & Quality"
-            }
-        }
-        
         with open(f"{project_dir}/project.json", 'w') as f:
-            json.dump(project_config, f, indent=2)
+            f.write(content)
         
         print(f"🎉 Project '{project_name}' created successfully!")
         return project_dir
+    
+    def create_projects(self, projects: Iterable[Tuple[str, str]], verbose: bool = True) -> Dict:
+        """複数プロジェクトを一括作成（出力は最後に集約して1回だけ表示）"""
+        started = time.perf_counter()
+        created_at = datetime.now().isoformat()
+        os.makedirs(self.projects_dir, exist_ok=True)
+        
+        created: List[str] = []
+        by_type: Dict[str, int] = {}
+        failed: Dict[str, str] = {}
+        for project_name, project_type in projects:
+            try:
+                content = self._render_config(project_name, project_type, created_at)
+                project_dir = f"{self.projects_dir}/{project_name}"
+                try:
+                    os.mkdir(project_dir)
+                except FileExistsError:
+                    pass
+                with open(f"{project_dir}/project.json", 'w') as f:
+                    f.write(content)
+            except (OSError, ValueError) as e:
+                failed[project_name] = str(e)
+                continue
+            created.append(project_dir)
+            by_type[project_type] = by_type.get(project_type, 0) + 1
+        
+        elapsed = time.perf_counter() - started
+        summary = {
+            "created": len(created),
+            "failed": failed,
+            "by_type": by_type,
+            "elapsed_seconds": elapsed,
+            "project_dirs": created
+        }
+        
+        if verbose:
+            rate = len(created) / elapsed if elapsed > 0 else 0
+            print(f"🎉 Created {len(created)} projects in {elapsed:.2f}s ({rate:.0f} projects/s)")
+            for project_type, count in sorted(by_type.items()):
+                print(f"  - {project_type}: {count}")
+            if failed:
+                print(f"❌ Failed: {len(failed)}")
+                for project_name, error in list(failed.items())[:10]:
+                    print(f"  - {project_name}: {error}")
+        
+        return summary
 
-if __name__ == "__main__":
-    generator = ProjectGenerator()
+def _read_batch_file(path: str) -> List[Tuple[str, str]]:
+    """バッチファイル（1行に "name" または "name,type"）を読み込み"""
+    projects = []
+    with open(path, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            name, _, project_type = line.partition(',')
+            projects.append((name.strip(), project_type.strip() or "web-app"))
+    return projects
+
+def _demo(generator: ProjectGenerator):
     generator.create_project("ai-powered-ecommerce", "web-app")
     generator.create_project("real-time-chat-platform", "web-app") 
     generator.create_project("ai-code-reviewer", "cli-tool")
     print("🌟 Sample projects generated!")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="AI Organization Project Generator")
+    parser.add_argument("--batch", metavar="FILE", help='一括作成するプロジェクト一覧（1行に "name,type"）')
+    parser.add_argument("--workspace", default=".", help="ワークスペースディレクトリ")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    
+    generator = ProjectGenerator(args.workspace)
+    if args.batch:
+        projects = _read_batch_file(args.batch)
+        run_profiled(args, lambda: generator.create_projects(projects))
+    else:
+        run_profiled(args, lambda: _demo(generator))
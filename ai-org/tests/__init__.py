@@ -0,0 +1,3 @@
+"""
+AI Organization tests（ai-org で python -m pytest）
+"""
@@ -0,0 +1,79 @@
+"""AdmissionController の同時実行枠・タイムアウト・優先度"""
+
+import threading
+import time
+
+import pytest
+
+from core.admission import AdmissionController, AdmissionTimeout
+
+def _start(target, *args) -> threading.Thread:
+    thread = threading.Thread(target=target, args=args, daemon=True)
+    thread.start()
+    return thread
+
+def _wait_for_waiters(controller: AdmissionController, count: int):
+    deadline = time.monotonic() + 2
+    while len(controller._waiters) < count:
+        assert time.monotonic() < deadline, "waiters did not queue up"
+        time.sleep(0.005)
+
+def test_acquire_times_out_when_no_slot_is_free():
+    controller = AdmissionController(max_concurrency=1)
+    ticket = controller.acquire("ai-ceo")
+    with pytest.raises(AdmissionTimeout):
+        controller.acquire("ai-cto", timeout=0.05)
+    assert controller.stats()["waiting"] == 0
+    controller.release(ticket)
+    controller.release(controller.acquire("ai-cto", timeout=0.05))
+
+def test_role_concurrency_limits_only_that_role():
+    controller = AdmissionController(max_concurrency=4, role_concurrency={"ai-qa": 1})
+    ticket = controller.acquire("ai-qa")
+    with pytest.raises(AdmissionTimeout):
+        controller.acquire("ai-qa", timeout=0.05)
+    controller.release(controller.acquire("ai-cto", timeout=0.05))
+    controller.release(ticket)
+
+def test_released_slot_goes_to_the_highest_priority_waiter():
+    controller = AdmissionController(max_concurrency=1)
+    ticket = controller.acquire("ai-ceo")
+    order = []
+
+    def wait(role, priority):
+        admitted = controller.acquire(role, priority=priority)
+        order.append(role)
+        controller.release(admitted)
+
+    low = _start(wait, "low", 5)
+    _wait_for_waiters(controller, 1)
+    high = _start(wait, "high", 0)
+    _wait_for_waiters(controller, 2)
+    controller.release(ticket)
+    low.join(2)
+    high.join(2)
+    assert order == ["high", "low"]
+
+def test_timed_out_waiter_hands_over_to_lower_priority_waiter():
+    # バースト分のトークンを使い切り、次のトークンは 0.1 秒後
+    controller = AdmissionController(requests_per_minute=600)
+    for _ in range(10):
+        controller.release(controller.acquire("ai-ceo"))
+    results = {}
+
+    def impatient():
+        try:
+            controller.acquire("x", priority=0, timeout=0.02)
+        except AdmissionTimeout:
+            results["x"] = "timeout"
+
+    def patient():
+        controller.release(controller.acquire("y", priority=5))
+        results["y"] = "admitted"
+
+    first = _start(impatient)
+    _wait_for_waiters(controller, 1)
+    second = _start(patient)
+    first.join(2)
+    second.join(2)
+    assert results == {"x": "timeout", "y": "admitted"}
@@ -0,0 +1,137 @@
+"""Coordinator のリース期限切れと再配布（時計は差し替えて進める）"""
+
+import threading
+
+import pytest
+
+from core.distributed import Coordinator, _Connection
+from core.scripts import load_script
+
+LEASE_TTL = 100.0
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+class RunResult:
+    """別スレッドで実行した Coordinator.run() の結果"""
+    def __init__(self):
+        self.stats = {}
+        self.done = threading.Event()
+
+    def wait(self):
+        assert self.done.wait(5), "Coordinator.run() did not return"
+        return self.stats
+
+@pytest.fixture
+def result():
+    return RunResult()
+
+@pytest.fixture
+def coordinator(tmp_path, clock, result):
+    acs = load_script("ai_collaborative_system")
+    system = acs.AICollaborativeSystem(str(tmp_path), use_response_cache=False)
+    system.create_project("shop", "web-app")
+    # 監視スレッドの間隔（lease_ttl / 4）はテスト中に来ないので、期限切れは reap() で起こす
+    coordinator = Coordinator(system, port=0, lease_ttl=LEASE_TTL, max_deliveries=2, clock=clock).start()
+
+    def run():
+        result.stats = coordinator.run(["shop"], show_progress=False)
+        result.done.set()
+
+    runner = threading.Thread(target=run, daemon=True)
+    runner.start()
+    yield coordinator
+    coordinator.close()
+    runner.join(5)
+
+def _worker(coordinator, name: str) -> _Connection:
+    connection = _Connection()
+    assert coordinator.handle({"op": "hello", "worker": name}, connection)["op"] == "welcome"
+    return connection
+
+def _lease(coordinator, connection):
+    reply = coordinator.handle({"op": "lease", "wait": 5}, connection)
+    assert reply["op"] == "task"
+    return reply
+
+def _complete_all(coordinator, connection):
+    """残りのタスクを全て完了させる（run() が終わると shutdown が返る）"""
+    while True:
+        reply = coordinator.handle({"op": "lease", "wait": 5}, connection)
+        if reply["op"] == "shutdown":
+            return
+        assert reply["op"] == "task"
+        assert coordinator.handle({"op": "complete", "lease": reply["lease"]}, connection)["op"] == "ok"
+
+def _status(coordinator, task_id: str) -> str:
+    return coordinator.system._tasks_by_id[task_id].status.value
+
+def test_expired_lease_is_redelivered_and_late_completion_is_rejected(coordinator, clock, result):
+    first, second = _worker(coordinator, "w1"), _worker(coordinator, "w2")
+    lease = _lease(coordinator, first)
+    task_id = lease["task"]["id"]
+    assert _status(coordinator, task_id) == "in_progress"
+
+    clock.advance(LEASE_TTL - 1)
+    assert coordinator.reap() == 0
+    clock.advance(1)
+    assert coordinator.reap() == 1
+    assert _status(coordinator, task_id) == "pending"
+
+    redelivered = _lease(coordinator, second)
+    assert redelivered["task"]["id"] == task_id
+    assert redelivered["lease"] != lease["lease"]
+    # 期限切れ後に届いた完了報告は受け付けない
+    assert coordinator.handle({"op": "complete", "lease": lease["lease"]}, first) == {"op": "expired"}
+    assert coordinator.handle({"op": "complete", "lease": redelivered["lease"]}, second)["op"] == "ok"
+    assert _status(coordinator, task_id) == "completed"
+
+    _complete_all(coordinator, second)
+    stats = result.wait()
+    assert (stats["completed"], stats["failed"]) == (6, 0)
+
+def test_heartbeat_extends_the_lease(coordinator, clock, result):
+    worker = _worker(coordinator, "w1")
+    lease = _lease(coordinator, worker)
+    clock.advance(LEASE_TTL * 0.6)
+    assert coordinator.handle({"op": "heartbeat", "lease": lease["lease"]}, worker) == {"op": "ok"}
+    clock.advance(LEASE_TTL * 0.6)
+    assert coordinator.reap() == 0
+    assert coordinator.handle({"op": "complete", "lease": lease["lease"]}, worker)["op"] == "ok"
+    _complete_all(coordinator, worker)
+    assert result.wait()["completed"] == 6
+
+def test_task_fails_after_max_deliveries_and_blocks_downstream(coordinator, clock, result):
+    worker = _worker(coordinator, "w1")
+    task_id = _lease(coordinator, worker)["task"]["id"]
+    for _ in range(2):
+        clock.advance(LEASE_TTL)
+        assert coordinator.reap() == 1
+        if _status(coordinator, task_id) == "pending":
+            assert _lease(coordinator, worker)["task"]["id"] == task_id
+    assert _status(coordinator, task_id) == "failed"
+    # 最初のタスクに全タスクが依存している
+    assert coordinator.handle({"op": "lease", "wait": 5}, worker) == {"op": "shutdown"}
+    stats = result.wait()
+    assert (stats["completed"], stats["failed"], stats["blocked"]) == (0, 1, 5)
+
+def test_dropped_connection_releases_its_leases_immediately(coordinator, result):
+    first, second = _worker(coordinator, "w1"), _worker(coordinator, "w2")
+    task_id = _lease(coordinator, first)["task"]["id"]
+    coordinator._release(first, "connection closed")
+    lease = _lease(coordinator, second)
+    assert lease["task"]["id"] == task_id
+    assert coordinator.handle({"op": "complete", "lease": lease["lease"]}, second)["op"] == "ok"
+    _complete_all(coordinator, second)
+    assert result.wait()["completed"] == 6
@@ -0,0 +1,97 @@
+"""EventStream の seq・ログの再生・購読"""
+
+import asyncio
+from multiprocessing import Process
+
+from core.events import TASK_COMPLETED, TASK_CREATED, TASK_STARTED, EventStream, events_file, last_seq, replay
+
+def _seqs(path: str):
+    return [event.seq for event in replay(path)]
+
+def test_two_streams_on_one_log_continue_the_same_sequence(tmp_path):
+    path = events_file(str(tmp_path))
+    first, second = EventStream(path), EventStream(path)
+    first.emit(TASK_CREATED, "shop", "t1")
+    second.emit(TASK_CREATED, "shop", "t2")
+    first.emit(TASK_STARTED, "shop", "t1")
+    second.emit(TASK_STARTED, "shop", "t2")
+    assert _seqs(path) == [1, 2, 3, 4]
+    assert (first.seq, second.seq) == (3, 4)
+    first.close()
+    second.close()
+
+def test_new_stream_resumes_after_the_last_logged_event(tmp_path):
+    path = events_file(str(tmp_path))
+    stream = EventStream(path)
+    for i in range(3):
+        stream.emit(TASK_CREATED, "shop", f"t{i}")
+    stream.close()
+    assert last_seq(path) == 3
+    assert EventStream(path).emit(TASK_COMPLETED, "shop", "t0").seq == 4
+
+def _emit_many(path: str, worker: int):
+    stream = EventStream(path)
+    for i in range(200):
+        stream.emit(TASK_STARTED, "shop", f"w{worker}-{i}")
+    stream.close()
+
+def test_processes_sharing_a_log_never_reuse_a_seq(tmp_path):
+    path = events_file(str(tmp_path))
+    processes = [Process(target=_emit_many, args=(path, i)) for i in range(4)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(30)
+    assert _seqs(path) == list(range(1, 801))
+
+def test_replay_since_and_type_filter(tmp_path):
+    path = events_file(str(tmp_path))
+    stream = EventStream(path)
+    stream.emit(TASK_CREATED, "shop", "t1")
+    stream.emit(TASK_STARTED, "shop", "t1")
+    stream.emit(TASK_COMPLETED, "shop", "t1", files=2)
+    assert [event.seq for event in stream.replay(since=1)] == [2, 3]
+    [completed] = stream.replay(types=[TASK_COMPLETED])
+    assert completed.data == {"files": 2}
+    stream.close()
+
+def test_subscribe_since_replays_then_follows_live_events(tmp_path):
+    stream = EventStream(events_file(str(tmp_path)))
+    stream.emit(TASK_CREATED, "shop", "t1")
+    stream.emit(TASK_STARTED, "shop", "t1")
+    with stream.subscribe(since=1) as subscription:
+        stream.emit(TASK_COMPLETED, "shop", "t1")
+        assert [subscription.get(1).seq for _ in range(2)] == [2, 3]
+        assert subscription.get(0.01) is None
+    stream.close()
+
+def test_slow_subscriber_drops_oldest_events():
+    stream = EventStream()
+    subscription = stream.subscribe(max_pending=2)
+    for i in range(5):
+        stream.emit(TASK_STARTED, "shop", f"t{i}")
+    assert subscription.dropped == 3
+    assert [subscription.get(0).task_id for _ in range(2)] == ["t3", "t4"]
+    stream.close()
+
+def test_async_iteration():
+    stream = EventStream()
+
+    async def consume():
+        received = []
+        async for event in stream.subscribe(types=[TASK_COMPLETED]):
+            received.append(event.task_id)
+            if len(received) == 2:
+                break
+        return received
+
+    async def main():
+        consumer = asyncio.ensure_future(consume())
+        await asyncio.sleep(0)
+        for i in range(3):
+            stream.emit(TASK_STARTED, "shop", f"t{i}")
+            stream.emit(TASK_COMPLETED, "shop", f"t{i}")
+        return await asyncio.wait_for(consumer, 2)
+
+    assert asyncio.run(main()) == ["t0", "t1"]
+    stream.close()
@@ -0,0 +1,57 @@
+"""DurationHistory の保存と見積もり"""
+
+from multiprocessing import Process
+
+import pytest
+
+from core.history import DurationHistory, critical_paths, history_file
+
+def test_estimate_falls_back_to_role_then_default(tmp_path):
+    history = DurationHistory(history_file(str(tmp_path)), default=2.0)
+    history.record("ai-qa", "Testing", 10.0)
+    assert history.estimate("ai-qa", "Testing") == 10.0
+    assert history.estimate("ai-qa", "Load Testing") == 10.0
+    assert history.estimate("ai-cto", "Architecture") == 2.0
+
+def test_saves_from_two_writers_are_merged(tmp_path):
+    path = history_file(str(tmp_path))
+    coordinator, cli = DurationHistory(path), DurationHistory(path)
+    coordinator.record("ai-backend", "API", 4.0)
+    cli.record("ai-frontend", "UI", 6.0)
+    coordinator.save()
+    cli.save()
+    merged = DurationHistory(path)
+    assert merged.estimate("ai-backend", "API") == 4.0
+    assert merged.estimate("ai-frontend", "UI") == 6.0
+    # 保存時に他の書き手の記録も取り込む
+    assert cli.estimate("ai-backend", "API") == 4.0
+
+def test_counts_of_the_same_key_accumulate(tmp_path):
+    path = history_file(str(tmp_path))
+    first, second = DurationHistory(path, alpha=0.5), DurationHistory(path, alpha=0.5)
+    first.record("ai-qa", "Testing", 2.0)
+    first.save()
+    second.record("ai-qa", "Testing", 4.0)
+    second.save()
+    assert DurationHistory(path)._entries["ai-qa/Testing"] == [pytest.approx(3.0), 2]
+
+def _record_many(path: str, role: str):
+    history = DurationHistory(path)
+    for i in range(20):
+        history.record(role, "Task", float(i))
+        history.save()
+
+def test_concurrent_processes_do_not_lose_entries(tmp_path):
+    path = history_file(str(tmp_path))
+    processes = [Process(target=_record_many, args=(path, f"ai-role-{i}")) for i in range(4)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(30)
+    entries = DurationHistory(path)._entries
+    assert all(entries[f"ai-role-{i}/Task"][1] == 20 for i in range(4))
+
+def test_critical_paths():
+    lengths = critical_paths({"a": [], "b": ["a"], "c": ["a"], "d": ["b", "c"]},
+                             {"a": 1.0, "b": 5.0, "c": 2.0, "d": 1.0})
+    assert lengths == {"a": 7.0, "b": 6.0, "c": 3.0, "d": 1.0}
@@ -0,0 +1,31 @@
+"""ログレベルの環境変数"""
+
+import logging
+
+import pytest
+
+from core import logconfig
+
+@pytest.mark.parametrize("name, level", [
+    ("INFO", logging.INFO), ("debug", logging.DEBUG), (" warning ", logging.WARNING), ("15", 15),
+    ("verbose", None), ("", None),
+])
+def test_parse_level(name, level):
+    assert logconfig.parse_level(name) == level
+
+def test_unknown_level_falls_back_to_info(monkeypatch):
+    root = logging.getLogger()
+    handlers, previous_level = list(root.handlers), root.level
+    monkeypatch.setenv("AI_ORG_LOG_LEVEL", "verbose")
+    for handler in handlers:
+        root.removeHandler(handler)
+    try:
+        assert logconfig.ensure_logging()
+        assert root.level == logging.INFO
+    finally:
+        logconfig.shutdown_logging()
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        for handler in handlers:
+            root.addHandler(handler)
+        root.setLevel(previous_level)
@@ -0,0 +1,100 @@
+"""メールボックスの容量（拒否・待機・受信確認）"""
+
+import os
+import threading
+
+import pytest
+
+from core.mailbox import MailboxFullError, MailboxQuota
+from core.scripts import load_script
+
+message_bus = load_script("message_bus")
+
+def _bus(workspace, **quotas) -> "message_bus.AIMessageBus":
+    return message_bus.AIMessageBus(str(workspace), verbose=False, quotas=quotas)
+
+def _mailbox_files(workspace, agent: str):
+    return [name for name in os.listdir(workspace / "communication" / "messages")
+            if name.rsplit("_", 1)[0] == agent]
+
+def test_full_mailbox_rejects(tmp_path):
+    bus = _bus(tmp_path, **{"ai-cto": MailboxQuota(max_messages=2, on_full="reject")})
+    bus.send_message("ai-ceo", "ai-cto", "request", {"n": 1})
+    bus.send_message("ai-ceo", "ai-cto", "request", {"n": 2})
+    with pytest.raises(MailboxFullError):
+        bus.send_message("ai-ceo", "ai-cto", "request", {"n": 3})
+    # 他の宛先には影響しない
+    bus.send_message("ai-ceo", "ai-qa", "request", {"n": 3})
+    assert len(_mailbox_files(tmp_path, "ai-cto")) == 2
+
+def test_message_larger_than_mailbox_is_rejected_even_when_blocking(tmp_path):
+    bus = _bus(tmp_path, **{"ai-cto": MailboxQuota(max_bytes=64)})
+    with pytest.raises(MailboxFullError):
+        bus.send_message("ai-ceo", "ai-cto", "request", {"text": "x" * 100})
+
+def test_quota_is_shared_between_buses_on_one_workspace(tmp_path):
+    quota = {"ai-cto": MailboxQuota(max_messages=5, on_full="reject")}
+    buses = [_bus(tmp_path, **quota), _bus(tmp_path, **quota)]
+    rejected = 0
+    for i in range(6):
+        for bus in buses:
+            try:
+                bus.send_message("ai-ceo", "ai-cto", "request", {"n": i})
+            except MailboxFullError:
+                rejected += 1
+    assert len(_mailbox_files(tmp_path, "ai-cto")) == 5
+    assert rejected == 7
+
+def test_blocked_sender_times_out(tmp_path):
+    bus = _bus(tmp_path, **{"ai-cto": MailboxQuota(max_messages=1, timeout=0.1)})
+    bus.send_message("ai-ceo", "ai-cto", "request", {})
+    with pytest.raises(MailboxFullError, match="timed out"):
+        bus.send_message("ai-ceo", "ai-cto", "request", {})
+
+def test_ack_from_another_bus_unblocks_sender(tmp_path):
+    quota = {"ai-cto": MailboxQuota(max_messages=1, timeout=5.0)}
+    sender, receiver = _bus(tmp_path, **quota), _bus(tmp_path, **quota)
+    sender.send_message("ai-ceo", "ai-cto", "request", {"n": 1})
+    sent = threading.Event()
+
+    def send_second():
+        sender.send_message("ai-ceo", "ai-cto", "request", {"n": 2})
+        sent.set()
+
+    thread = threading.Thread(target=send_second, daemon=True)
+    thread.start()
+    assert not sent.wait(0.2)
+    [message] = receiver.get_messages("ai-cto")
+    assert receiver.ack_message("ai-cto", message["id"])
+    assert sent.wait(2)
+    thread.join(2)
+    assert [m["content"] for m in receiver.get_messages("ai-cto")] == [{"n": 2}]
+
+def test_ack_is_idempotent(tmp_path):
+    bus = _bus(tmp_path)
+    message_id = bus.send_message("ai-ceo", "ai-cto", "request", {})
+    assert bus.ack_message("ai-cto", message_id)
+    assert not bus.ack_message("ai-cto", message_id)
+    assert bus.get_messages("ai-cto") == []
+
+def test_inbox_does_not_include_agents_sharing_a_prefix(tmp_path):
+    bus = _bus(tmp_path)
+    bus.send_message("ai-ceo", "ai_x", "request", {"to": "ai_x"})
+    bus.send_message("ai-ceo", "ai_x_y", "request", {"to": "ai_x_y"})
+    assert [m["content"] for m in bus.get_messages("ai_x")] == [{"to": "ai_x"}]
+    assert [m["content"] for m in bus.get_messages("ai_x_y")] == [{"to": "ai_x_y"}]
+
+def test_inbox_skips_messages_acked_while_reading(tmp_path, monkeypatch):
+    bus = _bus(tmp_path)
+    first = bus.send_message("ai-ceo", "ai-cto", "request", {"n": 1})
+    bus.send_message("ai-ceo", "ai-cto", "request", {"n": 2})
+    real_open = open
+
+    def open_after_ack(path, *args, **kwargs):
+        # 読む直前に別プロセスが1件目を受信確認した状況
+        if str(path).endswith(f"_{first}.json"):
+            bus.ack_message("ai-cto", first)
+        return real_open(path, *args, **kwargs)
+
+    monkeypatch.setattr("builtins.open", open_after_ack)
+    assert [m["content"] for m in bus.get_messages("ai-cto")] == [{"n": 2}]
@@ -0,0 +1,42 @@
+"""ペルソナ定義用の簡易YAMLパーサ"""
+
+import pytest
+
+from core.personas import parse_simple_yaml
+
+def test_scalars_and_lists():
+    data = parse_simple_yaml(
+        "name: AI CTO  # 表示名\n"
+        "# コメント行\n"
+        "role: 'Chief Technology Officer'\n"
+        "expertise:\n"
+        "  - Architecture\n"
+        "  - \"Cloud\"  # 引用符付き\n"
+        "tags: [a, 'b', \"c\"]\n"
+        "empty: []\n"
+    )
+    assert data == {
+        "name": "AI CTO",
+        "role": "Chief Technology Officer",
+        "expertise": ["Architecture", "Cloud"],
+        "tags": ["a", "b", "c"],
+        "empty": [],
+    }
+
+@pytest.mark.parametrize("line, value", [
+    ('motto: "Use C # style"', "Use C # style"),
+    ("motto: 'issue #12'  # trailing comment", "issue #12"),
+    ('motto: "say \\"#1\\" loudly" # comment', 'say \\"#1\\" loudly'),
+    ("motto: Bob's app # comment", "Bob's app"),
+    ("motto: C#", "C#"),
+])
+def test_hash_inside_values_is_not_a_comment(line, value):
+    assert parse_simple_yaml(line)["motto"] == value
+
+def test_hash_inside_quoted_list_items():
+    data = parse_simple_yaml('items:\n  - "fix #12"  # done\n  - plain # note\ninline: ["a #1", b]\n')
+    assert data == {"items": ["fix #12", "plain"], "inline": ["a #1", "b"]}
+
+def test_unsupported_line_is_rejected():
+    with pytest.raises(ValueError):
+        parse_simple_yaml("just text")
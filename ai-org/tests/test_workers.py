@@ -0,0 +1,105 @@
+"""WorkerPool の依存関係・失敗時のブロック・ワークスティーリング"""
+
+import threading
+from types import SimpleNamespace
+
+from core.workers import WorkerPool
+
+def _task(task_id, role, *dependencies, priority=0):
+    return SimpleNamespace(id=task_id, role=role, dependencies=list(dependencies), priority=priority)
+
+def _run_in_thread(pool, tasks, **kwargs):
+    """run() が戻らない場合もテストが止まらないよう別スレッドで実行"""
+    result = {}
+    thread = threading.Thread(target=lambda: result.update(pool.run(tasks, **kwargs)), daemon=True)
+    thread.start()
+    thread.join(5)
+    assert not thread.is_alive(), "WorkerPool.run() did not return"
+    return result
+
+def test_dependencies_run_in_order():
+    order = []
+    lock = threading.Lock()
+
+    def execute(task, worker):
+        with lock:
+            order.append(task.id)
+        return True
+
+    tasks = [_task("c", "qa", "a", "b"), _task("b", "dev", "a"), _task("a", "ceo")]
+    pool = WorkerPool(execute, lambda task: task.role, default_instances=2)
+    stats = _run_in_thread(pool, tasks)
+    assert order == ["a", "b", "c"]
+    assert stats["completed"] == 3
+
+def test_failure_blocks_downstream_tasks_only():
+    executed, blocked = [], []
+    tasks = [
+        _task("design", "cto"),
+        _task("backend", "dev", "design"),
+        _task("qa", "qa", "backend"),
+        _task("docs", "writer"),
+    ]
+
+    def execute(task, worker):
+        executed.append(task.id)
+        return task.id != "backend"
+
+    pool = WorkerPool(execute, lambda task: task.role,
+                      on_blocked=lambda task, cause: blocked.append((task.id, cause)))
+    stats = _run_in_thread(pool, tasks)
+    assert sorted(executed) == ["backend", "design", "docs"]
+    assert blocked == [("qa", "backend")]
+    assert (stats["completed"], stats["failed"], stats["blocked"]) == (2, 1, 1)
+
+def test_previously_failed_dependency_blocks_before_start():
+    blocked = []
+    pool = WorkerPool(lambda task, worker: True, lambda task: task.role,
+                      on_blocked=lambda task, cause: blocked.append((task.id, cause)))
+    stats = _run_in_thread(pool, [_task("qa", "qa", "old-backend"), _task("deploy", "ops", "qa")],
+                           failed=["old-backend"])
+    assert sorted(blocked) == [("deploy", "qa"), ("qa", "old-backend")]
+    assert stats["blocked"] == 2
+
+def test_on_blocked_error_does_not_hang_the_pool():
+    def on_blocked(task, cause):
+        raise OSError("disk full")
+
+    tasks = [_task("a", "dev"), _task("b", "dev", "a"), _task("c", "qa", "b"), _task("d", "qa")]
+    pool = WorkerPool(lambda task, worker: task.id != "a", lambda task: task.role,
+                      default_instances=2, on_blocked=on_blocked)
+    stats = _run_in_thread(pool, tasks)
+    assert (stats["completed"], stats["failed"], stats["blocked"]) == (1, 1, 2)
+
+def test_idle_workers_steal_from_other_roles():
+    release = threading.Event()
+
+    def execute(task, worker):
+        if task.id == "slow":
+            release.wait(2)
+        return True
+
+    tasks = [_task("slow", "dev"), _task("quick-1", "dev"), _task("quick-2", "dev"), _task("spec", "qa")]
+    pool = WorkerPool(execute, lambda task: task.role)
+    # dev のワーカーが slow で止まっている間に qa のワーカーが dev のキューを処理する
+    timer = threading.Timer(0.3, release.set)
+    timer.start()
+    stats = _run_in_thread(pool, tasks)
+    timer.cancel()
+    assert stats["completed"] == 4
+    assert stats["stolen"] >= 1
+
+def test_no_stealing_keeps_tasks_on_their_role():
+    workers = {}
+    lock = threading.Lock()
+
+    def execute(task, worker):
+        with lock:
+            workers[task.id] = worker.role
+        return True
+
+    tasks = [_task(f"dev-{i}", "dev") for i in range(5)] + [_task("spec", "qa")]
+    pool = WorkerPool(execute, lambda task: task.role, steal=False)
+    stats = _run_in_thread(pool, tasks)
+    assert all(role == task_id.split("-")[0] for task_id, role in workers.items() if task_id != "spec")
+    assert stats["stolen"] == 0